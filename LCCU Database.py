@@ -1,17 +1,56 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import argparse
+import atexit
+import heapq
+import json
+import logging
+import multiprocessing
 import sqlite3
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 import sys
 import os
 import random
 import tkinter.font as tkFont
 from typing import Sequence
 
-from config import get_database_path
+import archive
+import autocomplete
+import backup
+import changelog
+import datetime_codec
+import duplicates
+import integrity_scan
+import maintenance
+import overlaps
+import repository
+import schema
+import search
+import service
+from background import BackgroundWorker
+from config import (
+    database_uri,
+    get_archive_directory,
+    get_backup_directory,
+    get_database_path,
+    get_read_only_mode,
+    get_service_token,
+    get_service_url,
+    is_backup_host,
+)
+from connection_probe import ProbeResult, probe_database_path
+from lookups import LookupCache
+from search import day_range_to_epoch, iso_to_epoch
+from service_client import ServiceClient
+from stall_monitor import StallMonitor
+from tk_profiler import DEFAULT_REPORT, CallbackProfiler
+from validation import validate_sin
 from views.bewerken import BewerkenTab
 from views.bijstand_popup import BijstandPopup
 from views.ingave import IngaveTab
+from views.save_queue import SaveQueue
+from views.statusbar import StatusBar
 from views.zoeken import ZoekenTab
 
 
@@ -27,10 +66,40 @@ def resource_path(relative_path):
 # --- DATABASE SETUP ---
 
 
+def backup_prefix() -> str:
+    return os.path.splitext(os.path.basename(get_database_path()))[0]
+
+
+def session_database_path() -> str:
+    """Return the file this session works on.
+
+    In snapshot mode that is the newest local back-up instead of the database
+    on the share.
+    """
+    if get_read_only_mode() != "snapshot":
+        return get_database_path()
+    snapshots = backup.list_backups(get_backup_directory(), backup_prefix())
+    if not snapshots:
+        raise sqlite3.OperationalError(
+            f"Geen lokale back-up gevonden in '{get_backup_directory()}'."
+        )
+    return str(snapshots[-1])
+
+
 def connect_db():
-    db_path = get_database_path()
+    read_only = get_read_only_mode()
+    db_path = session_database_path()
     try:
-        return sqlite3.connect(db_path)
+        if read_only is None:
+            return sqlite3.connect(db_path)
+        # mode=ro never creates or writes the file; a snapshot does not
+        # change, so immutable=1 also skips all locking.
+        params = {"mode": "ro"}
+        if read_only == "snapshot":
+            params["immutable"] = "1"
+        conn = sqlite3.connect(database_uri(db_path, **params), uri=True)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
     except sqlite3.Error as exc:
         raise sqlite3.OperationalError(
             "Kan geen verbinding maken met de database op "
@@ -38,19 +107,45 @@ def connect_db():
         ) from exc
 
 
+def probe_session_database() -> ProbeResult:
+    try:
+        path = session_database_path()
+    except sqlite3.Error as exc:
+        return ProbeResult(get_backup_directory(), False, str(exc))
+    return probe_database_path(path)
+
+
+def get_service_client() -> ServiceClient | None:
+    """Return the client of the database service, or ``None`` for direct access."""
+    url = get_service_url()
+    return ServiceClient(url, token=get_service_token()) if url else None
+
+
+def run_data_operation(name: str, **arguments):
+    """Run a ``repository`` operation on the database or on the service."""
+    client = get_service_client()
+    if client is not None:
+        return client.call(name, **arguments)
+    conn = connect_db()
+    try:
+        with conn:
+            return repository.OPERATIONS[name].func(conn, **arguments)
+    finally:
+        conn.close()
+
+
 def _normalize_datetime_value(value: str | None) -> str | None:
-    if value is None:
-        return None
-    value = value.strip()
-    if not value:
-        return None
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%d-%m-%Y %H:%M", "%d-%m-%Y %H:%M:%S"):
-        try:
-            dt = datetime.strptime(value, fmt)
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            continue
-    return value
+    return datetime_codec.normalize_to_iso(value)
+
+
+def normalize_select_sql(table: str, column: str) -> str:
+    # Genormaliseerde waarden zijn 19 tekens lang en hebben een epochwaarde;
+    # enkel de overige rijen moeten worden bekeken (gedekt door een partiële
+    # index).
+    return f"""
+        SELECT id, {column} FROM {table}
+        WHERE {schema.unnormalized_timestamp_condition(column)}
+    """
 
 
 def normalize_datetime_fields():
@@ -58,23 +153,17 @@ def normalize_datetime_fields():
     try:
         conn = connect_db()
         cursor = conn.cursor()
-        columns = [
-            "datum_in_behandeling",
-            "start_bijstand",
-            "einde_bijstand",
-        ]
-        for column in columns:
-            cursor.execute(
-                f"SELECT id, {column} FROM objecten WHERE {column} IS NOT NULL AND TRIM({column}) != ''"
-            )
-            rows = cursor.fetchall()
-            for object_id, value in rows:
-                normalized = _normalize_datetime_value(value)
-                if normalized and normalized != value:
-                    cursor.execute(
-                        f"UPDATE objecten SET {column} = ? WHERE id = ?",
-                        (normalized, object_id),
-                    )
+        for table, columns in schema.TIMESTAMP_COLUMNS.items():
+            for column in columns:
+                cursor.execute(normalize_select_sql(table, column))
+                rows = cursor.fetchall()
+                for row_id, value in rows:
+                    normalized = _normalize_datetime_value(value)
+                    if normalized and normalized != value:
+                        cursor.execute(
+                            f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                            (normalized, row_id),
+                        )
         conn.commit()
     except sqlite3.Error as e:
         print(f"Kon datums niet normaliseren: {e}")
@@ -83,79 +172,189 @@ def normalize_datetime_fields():
             conn.close()
 
 
-def _validate_sin(value: str) -> str:
-    sin = value.strip()
-    if sin.upper() == "BIJSTAND":
-        return "BIJSTAND"
-    if len(sin) != 8 or not (sin[:4].isalpha() and sin[4:].isdigit()):
-        raise ValueError("SIN moet exact 4 letters en 4 cijfers bevatten!")
-    return sin[:4].upper() + sin[4:]
+def _create_objecten_table(conn: sqlite3.Connection) -> None:
+    # Heeft enkel effect op een nieuwe, lege database.
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS objecten (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sin TEXT NOT NULL,
+            type TEXT,
+            subcategorie TEXT,
+            merk TEXT,
+            os TEXT,
+            dienst TEXT,
+            datum_ingave TEXT,
+            unique_id INTEGER,
+            soort_bijstand TEXT,
+            lccu_lid TEXT,
+            datum_in_behandeling TEXT,
+            aantal_medewerkers INTEGER,
+            start_bijstand TEXT,
+            einde_bijstand TEXT
+        );
+        """
+    )
+
+
+def _create_medewerkers_bijstand_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS medewerkers_bijstand (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            object_id INTEGER,
+            medewerker TEXT,
+            start_bijstand TEXT,
+            einde_bijstand TEXT,
+            FOREIGN KEY(object_id) REFERENCES objecten(id)
+        );
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_medewerkers_bijstand_object_id
+        ON medewerkers_bijstand (object_id)
+        """
+    )
+
+
+# Schema steps in order, with what they create for the error message.
+SCHEMA_STEPS = (
+    ("de tabel", _create_objecten_table),
+    ("de medewerkers_bijstand tabel", _create_medewerkers_bijstand_table),
+    ("de tijdstempelkolommen", schema.ensure_timestamp_columns),
+    ("de keuzelijsten", schema.ensure_lookup_tables),
+    ("de fingerprintkolom", schema.ensure_fingerprint_column),
+    ("de zoekindexen", schema.ensure_search_indexes),
+    ("de overlapindex", schema.ensure_overlap_index),
+    ("de changelog", schema.ensure_changelog),
+)
+
+
+def _run_schema_step(description: str, step) -> None:
+    conn = connect_db()
+    try:
+        with conn:
+            step(conn)
+    except sqlite3.Error as exc:
+        raise sqlite3.OperationalError(
+            f"Fout bij het aanmaken van {description}: {exc}"
+        ) from exc
+    finally:
+        conn.close()
 
 
-def create_table():
+def _create_with_dialog(description: str, step) -> None:
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS objecten (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sin TEXT NOT NULL,
-                type TEXT,
-                subcategorie TEXT,
-                merk TEXT,
-                os TEXT,
-                dienst TEXT,
-                datum_ingave TEXT,
-                unique_id INTEGER,
-                soort_bijstand TEXT,
-                lccu_lid TEXT,
-                datum_in_behandeling TEXT,
-                aantal_medewerkers INTEGER,
-                start_bijstand TEXT,
-                einde_bijstand TEXT
-            );
-            """
-        )
-        conn.commit()
-        conn.close()
-    except sqlite3.Error as e:
-        messagebox.showerror(
-            "Databasefout", f"Fout bij het aanmaken van de tabel: {e}"
-        )
+        _run_schema_step(description, step)
+    except sqlite3.Error as exc:
+        messagebox.showerror("Databasefout", str(exc))
+
+
+def create_table():
+    _create_with_dialog(*SCHEMA_STEPS[0])
 
 
 def create_medewerkers_bijstand_table():
-    try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS medewerkers_bijstand (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                object_id INTEGER,
-                medewerker TEXT,
-                start_bijstand TEXT,
-                einde_bijstand TEXT,
-                FOREIGN KEY(object_id) REFERENCES objecten(id)
-            );
-            """
-        )
-        conn.commit()
-        conn.close()
-    except sqlite3.Error as e:
-        messagebox.showerror(
-            "Databasefout",
-            f"Fout bij het aanmaken van de medewerkers_bijstand tabel: {e}",
-        )
+    _create_with_dialog(*SCHEMA_STEPS[1])
+
+
+def ensure_database() -> None:
+    """Create or upgrade the schema, raising ``sqlite3.Error`` on failure.
+
+    Shows no dialogs, so it can run on a worker thread.
+    """
+    for description, step in SCHEMA_STEPS:
+        _run_schema_step(description, step)
+    normalize_datetime_fields()
 
 
 def check_or_create_database():
-    create_table()
-    create_medewerkers_bijstand_table()
+    """Create or upgrade the schema; failures are shown in a dialog."""
+    for description, step in SCHEMA_STEPS:
+        _create_with_dialog(description, step)
     normalize_datetime_fields()
 
 
+def insert_object(
+    *,
+    sin: str,
+    object_type: str,
+    subcategorie: str,
+    merk: str,
+    os_value: str,
+    dienst: str,
+    datum_ingave: str | None = None,
+    unique_id: int | None = None,
+) -> int:
+    """Insert an object from the Ingave tab and return its ID."""
+    return run_data_operation(
+        "insert_object",
+        sin=sin,
+        object_type=object_type,
+        subcategorie=subcategorie,
+        merk=merk,
+        os_value=os_value,
+        dienst=dienst,
+        datum_ingave=datum_ingave or current_iso_timestamp(),
+        unique_id=unique_id,
+    )
+
+
+def insert_objects(records: list[dict]) -> list[int]:
+    """Insert a batch from the Ingave tab in one transaction; return the IDs."""
+    timestamp = current_iso_timestamp()
+    return run_data_operation(
+        "insert_objects",
+        records=[
+            {**record, "datum_ingave": record.get("datum_ingave") or timestamp}
+            for record in records
+        ],
+    )
+
+
+def find_saved_objects(records: list[dict]) -> list[int] | None:
+    """Return the IDs of *records* if an earlier save already stored them."""
+    return run_data_operation("find_saved_objects", records=records)
+
+
+def find_duplicate_objects(
+    *,
+    sin: str,
+    object_type: str,
+    subcategorie: str,
+    merk: str,
+    os_value: str,
+) -> list[tuple[int, str | None]]:
+    """Return ``(id, datum_ingave)`` of devices already stored with this data."""
+    return run_data_operation(
+        "find_duplicate_objects",
+        sin=sin,
+        object_type=object_type,
+        subcategorie=subcategorie,
+        merk=merk,
+        os_value=os_value,
+    )
+
+
+def find_overlapping_assignments(
+    *,
+    start_bijstand: str | None,
+    einde_bijstand: str | None,
+    medewerkers: Sequence[str] | None = None,
+    object_id: int | None = None,
+) -> list[tuple[int, str, str, str]]:
+    """Return ``(object_id, medewerker, start, einde)`` of conflicting assignments."""
+    return run_data_operation(
+        "find_overlapping_assignments",
+        start_bijstand=start_bijstand,
+        einde_bijstand=einde_bijstand,
+        medewerkers=list(medewerkers) if medewerkers is not None else None,
+        object_id=object_id,
+    )
+
+
 def insert_bijstand_record(
     *,
     soort_bijstand: str,
@@ -173,105 +372,139 @@ def insert_bijstand_record(
     it accessible for testing so we can verify database behaviour without a
     graphical environment.
     """
+    return run_data_operation(
+        "insert_bijstand_record",
+        soort_bijstand=soort_bijstand,
+        dienst=dienst,
+        medewerkers=list(medewerkers),
+        start_bijstand=start_bijstand,
+        einde_bijstand=einde_bijstand,
+        sin=sin,
+        datum_ingave=datum_ingave or current_iso_timestamp(),
+        unique_id=unique_id,
+    )
 
-    if datum_ingave is None:
-        datum_ingave = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    if unique_id is None:
-        unique_id = random.randint(1000, 9999)
 
-    with connect_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO objecten (
-                sin,
-                type,
-                subcategorie,
-                merk,
-                os,
-                dienst,
-                datum_ingave,
-                unique_id,
-                soort_bijstand,
-                aantal_medewerkers,
-                start_bijstand,
-                einde_bijstand
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                sin,
-                "Bijstand",
-                "",
-                "",
-                "",
-                dienst,
-                datum_ingave,
-                unique_id,
-                soort_bijstand,
-                len(medewerkers),
-                start_bijstand,
-                einde_bijstand,
-            ),
+def update_object(object_id: int, **fields) -> None:
+    """Update a record from the Bewerken tab; see ``repository.update_object``."""
+    run_data_operation("update_object", object_id=object_id, **fields)
+
+
+def get_soort_bijstand(object_id: int) -> str | None:
+    return run_data_operation("get_soort_bijstand", object_id=object_id)
+
+
+def get_result_row(object_id: int) -> tuple | None:
+    """Return record *object_id* as a row of the search results."""
+    return run_data_operation("get_result_row", object_id=object_id)
+
+
+def load_suggestion_rows() -> dict[str, list[tuple[str, int]]]:
+    return run_data_operation("suggestion_rows")
+
+
+def load_lookup_rows() -> dict[str, list[tuple[str, str | None]]]:
+    return run_data_operation("lookup_rows")
+
+
+def archive_closed_records(
+    cutoff: str, batch_size: int = archive.DEFAULT_BATCH_SIZE
+) -> dict[int, int]:
+    """Move records closed before *cutoff* (``YYYY-MM-DD``) to the archives."""
+    conn = connect_db()
+    try:
+        return archive.archive_closed_records(
+            conn, get_archive_directory(), cutoff, batch_size=batch_size
         )
-        object_id = cursor.lastrowid
-        for medewerker in medewerkers:
-            cursor.execute(
-                """
-                INSERT INTO medewerkers_bijstand (
-                    object_id,
-                    medewerker,
-                    start_bijstand,
-                    einde_bijstand
-                )
-                VALUES (?, ?, ?, ?)
-                """,
-                (object_id, medewerker, start_bijstand, einde_bijstand),
+    finally:
+        conn.close()
+
+
+def attached_archive_groups(conn: sqlite3.Connection, datum_vanaf: str | None):
+    return archive.attached_archive_groups(
+        conn, get_archive_directory(), datum_vanaf
+    )
+
+
+def search_objects(
+    *,
+    sin: str = "",
+    datum_vanaf: str | None = None,
+    datum_tot: str | None = None,
+    include_datum_ingave: bool = False,
+    include_archief: bool = False,
+    filters: dict[str, str] | None = None,
+    sort: str = "id",
+    descending: bool = False,
+    after: search.Cursor | None = None,
+    limit: int = search.DEFAULT_PAGE_SIZE,
+) -> tuple[list[tuple], search.Cursor | None]:
+    """Return one sorted page of search results and the cursor for the next."""
+    return run_data_operation(
+        "search_objects",
+        sin=sin,
+        datum_vanaf=datum_vanaf,
+        datum_tot=datum_tot,
+        include_datum_ingave=include_datum_ingave,
+        include_archief=include_archief,
+        filters=filters,
+        sort=sort,
+        descending=descending,
+        after=after,
+        limit=limit,
+    )
+
+
+def run_database_maintenance(**options) -> dict:
+    """Run a maintenance pass on its own connection; see ``maintenance``.
+
+    Old changelog entries are removed first, so the pass also reclaims their
+    pages.  The archives are brought up to the current schema as well.
+    """
+    conn = connect_db()
+    try:
+        with conn:
+            removed = changelog.compact(conn)
+        report = maintenance.run_maintenance(conn, **options)
+        report["changelog_removed"] = removed
+        report["archives"] = archive.upgrade_archives(conn, get_archive_directory())
+        return report
+    finally:
+        conn.close()
+
+
+def create_database_backup(keep: int = backup.DEFAULT_KEEP) -> str:
+    """Write a verified snapshot of the database to the local backup folder."""
+    conn = connect_db()
+    try:
+        return str(
+            backup.create_backup(
+                conn,
+                get_backup_directory(),
+                prefix=backup_prefix(),
+                keep=keep,
             )
-    return object_id
+        )
+    finally:
+        conn.close()
 
 
 # --- HOOFD VARIABELEN ---
-diensten = [
-    "DOT",
-    "FGP",
-    "GOK",
-    "GOUDI",
-    "INTEL",
-    "InternToezicht",
-    "ISRA",
-    "LR/DGV",
-    "LR/DGWLD",
-    "LR/DRUGS",
-    "LR/ECOFIN",
-    "LR/EIG",
-    "LR/GWLD",
-    "LR/IFG",
-    "LR/JCRIM",
-    "LR/JEUGD",
-    "LR/LM",
-    "LR/PERS",
-    "LR/PERS/DGV",
-    "LR/RESID",
-    "LR/RIF",
-    "LR/VERDW",
-    "LR/ZEDEN",
-    "ORIDA",
-    "PTA",
-    "VERKEER",
-    "WIJK Centrum",
-    "WIJK City",
-    "WIJK Noord",
-    "WIJK Oost",
-    "WIJK West",
-    "WIJK Zuid",
-    "WOT Centrum",
-    "WOT City",
-    "WOT Noord",
-    "WOT Oost",
-    "WOT West",
-    "WOT Zuid",
-]
+# Wachttijd (ms) tussen twee verbindingspogingen wanneer de database onbereikbaar is.
+CONNECTION_RETRY_MS = 30_000
+
+# Onderhoud tijdens inactiviteit: hoe vaak er gecontroleerd wordt, hoe lang de
+# gebruiker inactief moet zijn en de minimale tijd tussen twee onderhoudsbeurten.
+MAINTENANCE_CHECK_MS = 5 * 60 * 1000
+MAINTENANCE_IDLE_SECONDS = 10 * 60
+MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Minimale tijd tussen twee automatische back-ups.  Die worden enkel gemaakt op
+# de werkpost uit LCCU_BACKUP_HOST, wanneer de gebruiker inactief is.
+BACKUP_INTERVAL_SECONDS = 4 * 60 * 60
+
+# Een blokkering van de Tk-lus die langer duurt dan dit wordt gelogd, met stack.
+STALL_THRESHOLD_MS = 500
 
 medewerkers = [
     "Annik Van Herck",
@@ -313,13 +546,7 @@ def current_iso_timestamp() -> str:
 
 
 def format_iso_to_dutch(date_str: str | None) -> str:
-    if not date_str:
-        return ""
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-        return dt.strftime("%d-%m-%Y %H:%M")
-    except Exception:
-        return date_str or ""
+    return datetime_codec.iso_to_dutch(date_str)
 
 
 def format_datetime_for_display(value: str | None) -> str:
@@ -335,6 +562,11 @@ def format_date(date_str: str) -> str | None:
         return None
 
 
+# Only the longest texts of a column are measured: with a proportional font a
+# shorter text is practically never wider than the longest few.
+MEASURED_TEXTS_PER_COLUMN = 20
+
+
 def auto_adjust_column_width(
     tree: ttk.Treeview, tree_frame: tk.Frame, tree_scroll_x: ttk.Scrollbar
 ) -> None:
@@ -342,14 +574,14 @@ def auto_adjust_column_width(
     default_font = tkFont.nametofont("TkDefaultFont")
     total_width = 0
     columns = tree["columns"]
+    rows = [tree.item(row, "values") for row in tree.get_children()]
     for col_index, col in enumerate(columns):
-        header_width = default_font.measure(col) + 10
-        max_width = header_width
-        for row in tree.get_children():
-            vals = tree.item(row, "values")
-            if col_index < len(vals):
-                cell_width = default_font.measure(str(vals[col_index])) + 10
-                max_width = max(max_width, cell_width)
+        texts = heapq.nlargest(
+            MEASURED_TEXTS_PER_COLUMN,
+            (str(vals[col_index]) for vals in rows if col_index < len(vals)),
+            key=len,
+        )
+        max_width = max(default_font.measure(text) for text in [col, *texts]) + 10
         tree.column(col, width=max_width, stretch=False)
         total_width += max_width
     tree_frame.update_idletasks()
@@ -381,6 +613,19 @@ class GUIState:
         self.datum_vanaf_var = tk.StringVar(master=self.root)
         self.datum_tot_var = tk.StringVar(master=self.root)
         self.include_datum_ingave_var = tk.BooleanVar(master=self.root, value=True)
+        self.include_archief_var = tk.BooleanVar(master=self.root, value=False)
+        self.filter_vars = {
+            column: tk.StringVar(master=self.root)
+            for column in (
+                "type",
+                "subcategorie",
+                "merk",
+                "os",
+                "dienst",
+                "lccu_lid",
+                "soort_bijstand",
+            )
+        }
 
         # Variabelen Bewerken
         self.sin_edit_var = tk.StringVar(master=self.root)
@@ -418,46 +663,283 @@ class MainWindow:
         except Exception:
             pass
 
+        # Search-only session: no write tabs, no schema changes, no upkeep.
+        self.read_only = get_read_only_mode() is not None
+        if self.read_only:
+            self.root.title("LCCU Database versie 1.1.1 (alleen lezen)")
+
+        self.status_bar = StatusBar(master=self.root)
+        self.save_queue: SaveQueue | None = None
         self.state.notebook.pack(expand=True, fill="both")
 
-        self.bijstand_popup = BijstandPopup(
-            state=self.state,
-            medewerkers=medewerkers,
-            diensten=diensten,
-            parse_dutch_datetime=parse_dutch_datetime,
-            datetime_to_iso=datetime_to_iso,
-            current_timestamp=current_iso_timestamp,
-            insert_bijstand_record=insert_bijstand_record,
-        )
+        self.lookups = LookupCache()
+        self.suggestions = autocomplete.SuggestionCache()
+        self.bijstand_popup: BijstandPopup | None = None
+        self.ingave_tab: IngaveTab | None = None
+        self._check_worker: BackgroundWorker | None = None
+        if not self.read_only:
+            # Duplicate and overlap lookups before a save.
+            self._check_worker = BackgroundWorker(self.root, name="db-checks")
+            self.save_queue = SaveQueue(
+                root=self.root,
+                status_bar=self.status_bar,
+                worker=BackgroundWorker(self.root, name="db-writer"),
+            )
+            self.bijstand_popup = BijstandPopup(
+                state=self.state,
+                medewerkers=medewerkers,
+                lookups=self.lookups,
+                suggestions=self.suggestions,
+                parse_dutch_datetime=parse_dutch_datetime,
+                datetime_to_iso=datetime_to_iso,
+                current_timestamp=current_iso_timestamp,
+                insert_bijstand_record=insert_bijstand_record,
+                find_overlapping_assignments=find_overlapping_assignments,
+                find_saved_objects=find_saved_objects,
+                save_queue=self.save_queue,
+                check_worker=self._check_worker,
+            )
 
-        self.ingave_tab = IngaveTab(
-            state=self.state,
-            diensten=diensten,
-            validate_sin=_validate_sin,
-            connect_db=connect_db,
-            current_timestamp=current_iso_timestamp,
-            popup=self.bijstand_popup,
-        )
+            self.ingave_tab = IngaveTab(
+                state=self.state,
+                lookups=self.lookups,
+                suggestions=self.suggestions,
+                validate_sin=validate_sin,
+                insert_object=insert_object,
+                insert_objects=insert_objects,
+                find_saved_objects=find_saved_objects,
+                find_duplicate_objects=find_duplicate_objects,
+                fingerprint=duplicates.fingerprint,
+                current_timestamp=current_iso_timestamp,
+                popup=self.bijstand_popup,
+                save_queue=self.save_queue,
+                check_worker=self._check_worker,
+            )
 
         self.zoeken_tab = ZoekenTab(
             state=self.state,
-            connect_db=connect_db,
+            lookups=self.lookups,
+            search_objects=search_objects,
+            get_result_row=get_result_row,
             format_date=format_date,
             format_datetime_for_display=format_datetime_for_display,
             auto_adjust_column_width=auto_adjust_column_width,
         )
 
-        self.bewerken_tab = BewerkenTab(
-            state=self.state,
-            connect_db=connect_db,
-            validate_sin=_validate_sin,
-            parse_dutch_datetime=parse_dutch_datetime,
-            parse_dutch_to_iso=parse_dutch_to_iso,
-            datetime_to_iso=datetime_to_iso,
-            format_datetime_for_display=format_datetime_for_display,
-            search_callback=self.zoeken_tab.zoek_objecten,
-            result_tree=self.zoeken_tab.result_tree,
+        self.bewerken_tab: BewerkenTab | None = None
+        if not self.read_only:
+            self.bewerken_tab = BewerkenTab(
+                state=self.state,
+                lookups=self.lookups,
+                suggestions=self.suggestions,
+                update_object=update_object,
+                get_soort_bijstand=get_soort_bijstand,
+                find_overlapping_assignments=find_overlapping_assignments,
+                validate_sin=validate_sin,
+                parse_dutch_datetime=parse_dutch_datetime,
+                parse_dutch_to_iso=parse_dutch_to_iso,
+                datetime_to_iso=datetime_to_iso,
+                format_datetime_for_display=format_datetime_for_display,
+                refresh_row=self.zoeken_tab.refresh_row,
+                result_tree=self.zoeken_tab.result_tree,
+                check_worker=self._check_worker,
+            )
+
+        self._probe_worker = BackgroundWorker(self.root, name="db-probe")
+        self._probe_running = False
+        self._retry_after_id: str | None = None
+        self.database_ready = False
+        self._redirected_from_tab: str | None = None
+        self._set_write_tabs_enabled(False)
+        self.root.after_idle(self.check_connection)
+
+        self._maintenance_worker = BackgroundWorker(self.root, name="maintenance")
+        self._last_activity = time.monotonic()
+        self._last_maintenance: float | None = None
+        self._last_backup: float | None = None
+        for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>"):
+            self.root.bind_all(sequence, self._record_activity, add="+")
+        self.root.after(MAINTENANCE_CHECK_MS, self._maintenance_tick)
+        self.root.after(MAINTENANCE_CHECK_MS, self._backup_tick)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.stall_monitor = StallMonitor(
+            self.root, threshold_ms=STALL_THRESHOLD_MS
+        )
+        self.stall_monitor.start()
+
+    def _set_write_tabs_enabled(self, enabled: bool) -> None:
+        write_frames = [
+            tab.frame for tab in (self.ingave_tab, self.bewerken_tab) if tab is not None
+        ]
+        state = "normal" if enabled else "disabled"
+        for frame in write_frames:
+            self.state.notebook.tab(frame, state=state)
+        selected = self.state.notebook.select()
+        if not enabled and selected in {str(frame) for frame in write_frames}:
+            self.state.notebook.select(self.zoeken_tab.frame)
+            self._redirected_from_tab = selected
+        elif enabled and self._redirected_from_tab is not None:
+            self.state.notebook.select(self._redirected_from_tab)
+            self._redirected_from_tab = None
+
+    def check_connection(self) -> None:
+        """Probe the database location without blocking the Tk thread."""
+        if self._probe_running:
+            return
+        if self._retry_after_id is not None:
+            self.root.after_cancel(self._retry_after_id)
+            self._retry_after_id = None
+        self._probe_running = True
+        client = get_service_client()
+        self.status_bar.hide_retry()
+        self.status_bar.set_message("Verbinding met de database controleren...")
+        self._probe_worker.submit(
+            client.probe if client is not None else probe_session_database,
+            on_success=self._on_probe_result,
+        )
+
+    def _on_probe_result(self, result: ProbeResult) -> None:
+        if not result.reachable:
+            self._probe_running = False
+            self._on_database_unavailable(result.reason)
+            return
+
+        # Schema setup and the lookup tables are many round trips to the
+        # share, so they run on the probe worker as well.
+        load_lookups = not self.lookups.loaded
+        self.status_bar.set_message("Database voorbereiden...")
+        self._probe_worker.submit(
+            lambda: self._prepare_database(load_lookups),
+            on_success=self._on_database_prepared,
+            on_error=self._on_prepare_failed,
+        )
+
+    def _prepare_database(self, load_lookups: bool) -> dict | None:
+        """Set up the schema and read the lookup rows; runs on the probe worker."""
+        # With a database service, the service sets up the schema; a
+        # read-only session uses the schema as it finds it.
+        if get_service_url() is None and not self.read_only:
+            ensure_database()
+        if not load_lookups:
+            return None
+        try:
+            return load_lookup_rows()
+        except sqlite3.Error as exc:
+            print(f"Kon keuzelijsten niet laden: {exc}")
+            return None
+
+    def _on_database_prepared(self, lookup_rows: dict | None) -> None:
+        self._probe_running = False
+        if lookup_rows is not None:
+            self.lookups.set_rows(lookup_rows)
+            for tab in (self.ingave_tab, self.zoeken_tab, self.bewerken_tab):
+                if tab is not None:
+                    tab.refresh_lookups()
+        if not self.suggestions.loaded:
+            # The counts read an index of the whole table.
+            self._probe_worker.submit(
+                load_suggestion_rows,
+                on_success=self.suggestions.set_rows,
+                on_error=lambda exc: print(f"Kon suggesties niet laden: {exc}"),
+            )
+        self.database_ready = True
+        self._set_write_tabs_enabled(True)
+        self.status_bar.set_message(
+            "Verbonden met de database (alleen lezen)."
+            if self.read_only
+            else "Verbonden met de database."
+        )
+
+    def _on_prepare_failed(self, exc: BaseException) -> None:
+        print(f"Databasefout bij voorbereiden: {exc}")
+        self._probe_running = False
+        self._on_database_unavailable(str(exc))
+
+    def _on_database_unavailable(self, reason: str) -> None:
+        self.database_ready = False
+        self._set_write_tabs_enabled(False)
+        self.status_bar.set_message(
+            f"Database niet bereikbaar: {reason} "
+            f"Nieuwe poging binnen {CONNECTION_RETRY_MS // 1000} seconden."
         )
+        self.status_bar.show_retry(self.check_connection)
+        self._retry_after_id = self.root.after(
+            CONNECTION_RETRY_MS, self.check_connection
+        )
+
+    def _record_activity(self, _event=None) -> None:
+        self._last_activity = time.monotonic()
+
+    def _maintenance_tick(self) -> None:
+        self.root.after(MAINTENANCE_CHECK_MS, self._maintenance_tick)
+        now = time.monotonic()
+        # The machine that runs the database service maintains the file.
+        if not self.database_ready or get_service_url() is not None or self.read_only:
+            return
+        if now - self._last_activity < MAINTENANCE_IDLE_SECONDS:
+            return
+        if (
+            self._last_maintenance is not None
+            and now - self._last_maintenance < MAINTENANCE_INTERVAL_SECONDS
+        ):
+            return
+        self._last_maintenance = now
+        self._maintenance_worker.submit(
+            run_database_maintenance,
+            on_success=self._on_maintenance_done,
+            on_error=self._on_maintenance_failed,
+        )
+
+    def _on_maintenance_done(self, report: dict) -> None:
+        self.status_bar.set_message(
+            f"Onderhoud uitgevoerd ({report['duration']:.1f} s, "
+            f"{report['after']['freelist_count']} vrije pagina's)."
+        )
+
+    def _on_maintenance_failed(self, exc: BaseException) -> None:
+        logging.getLogger(__name__).warning("Onderhoud mislukt: %s", exc)
+
+    def _backup_tick(self) -> None:
+        self.root.after(MAINTENANCE_CHECK_MS, self._backup_tick)
+        now = time.monotonic()
+        # One designated workstation copies the database, and only while its
+        # user is idle, so its own writes do not restart the copy.
+        if not self.database_ready or get_service_url() is not None or self.read_only:
+            return
+        if not is_backup_host():
+            return
+        if now - self._last_activity < MAINTENANCE_IDLE_SECONDS:
+            return
+        if (
+            self._last_backup is not None
+            and now - self._last_backup < BACKUP_INTERVAL_SECONDS
+        ):
+            return
+        self._last_backup = now
+        self._maintenance_worker.submit(
+            create_database_backup,
+            on_success=lambda path: self.status_bar.set_message(
+                f"Back-up gemaakt: {path}"
+            ),
+            on_error=self._on_backup_failed,
+        )
+
+    def _on_backup_failed(self, exc: BaseException) -> None:
+        logging.getLogger(__name__).warning("Back-up mislukt: %s", exc)
+        self.status_bar.set_message(f"Back-up mislukt: {exc}")
+
+    def close(self) -> None:
+        pending = len(self.save_queue.pending) if self.save_queue else 0
+        failed = len(self.save_queue.failed) if self.save_queue else 0
+        if (pending or failed) and not messagebox.askyesno(
+            "Opslaan bezig",
+            f"Er worden nog {pending} record(s) opgeslagen en {failed} "
+            "record(s) konden niet worden opgeslagen. Toch afsluiten?",
+        ):
+            return
+        self.stall_monitor.stop()
+        self.root.destroy()
 
     def run(self) -> None:
         self.root.mainloop()
@@ -467,11 +949,314 @@ LCCUDatabaseApp = MainWindow
 
 
 
-def main():
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="LCCU Database")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "Meet de duur van alle Tk-callbacks en schrijf bij het afsluiten een "
+            "rapport. Ook via LCCU_PROFILE=1 of LCCU_PROFILE=<pad>."
+        ),
+    )
+    parser.add_argument(
+        "--profile-rapport",
+        default=None,
+        help=f"Pad van het profielrapport (standaard {DEFAULT_REPORT}).",
+    )
+    parser.add_argument(
+        "--alleen-lezen",
+        action="store_true",
+        help=(
+            "Open de database alleen-lezen, enkel met het tabblad Zoeken. "
+            "Ook via LCCU_READ_ONLY=1."
+        ),
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help=(
+            "Zoek in de nieuwste lokale back-up in plaats van de database op de "
+            "netwerkschijf (alleen lezen). Ook via LCCU_READ_ONLY=snapshot."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="Verplaats afgesloten records naar de jaararchieven.",
+    )
+    archive_parser.add_argument(
+        "--voor",
+        help=(
+            "Records die voor deze datum (dd-mm-jjjj) zijn afgesloten worden "
+            "gearchiveerd. Standaard: een jaar geleden."
+        ),
+    )
+    archive_parser.add_argument(
+        "--batch",
+        type=int,
+        default=archive.DEFAULT_BATCH_SIZE,
+        help="Aantal records per transactie.",
+    )
+
+    maintenance_parser = subparsers.add_parser(
+        "maintenance",
+        help="Voer ANALYZE, incrementele VACUUM en een integriteitscontrole uit.",
+    )
+    maintenance_parser.add_argument(
+        "--pages",
+        type=int,
+        default=maintenance.DEFAULT_VACUUM_PAGES,
+        help="Maximaal aantal vrije pagina's dat wordt vrijgegeven.",
+    )
+    maintenance_parser.add_argument(
+        "--skip-integrity",
+        action="store_true",
+        help="Sla PRAGMA integrity_check over.",
+    )
+
+    backup_parser = subparsers.add_parser(
+        "backup",
+        help="Maak een gecontroleerde back-up in de lokale back-upmap.",
+    )
+    backup_parser.add_argument(
+        "--keep",
+        type=int,
+        default=backup.DEFAULT_KEEP,
+        help="Aantal back-ups dat bewaard blijft.",
+    )
+
+    scan_parser = subparsers.add_parser(
+        "integrity-scan",
+        help="Controleer de gegevens parallel en schrijf een JSON-rapport.",
+    )
+    scan_parser.add_argument(
+        "--output",
+        default=None,
+        help="Pad van het rapport. Standaard: integriteit_<tijdstip>.json",
+    )
+    scan_parser.add_argument(
+        "--chunk",
+        type=int,
+        default=integrity_scan.DEFAULT_CHUNK_SIZE,
+        help="Aantal ids per deeltaak.",
+    )
+    scan_parser.add_argument(
+        "--workers", type=int, default=None, help="Aantal processen."
+    )
+
+    duplicates_parser = subparsers.add_parser(
+        "duplicates",
+        help="Toon toestellen die meermaals onder hetzelfde SIN zijn ingevoerd.",
+    )
+    duplicates_parser.add_argument(
+        "--output", default=None, help="Schrijf het rapport als JSON naar dit pad."
+    )
+
+    overlaps_parser = subparsers.add_parser(
+        "overlaps",
+        help="Toon medewerkers die op overlappende bijstanden ingepland staan.",
+    )
+    overlaps_parser.add_argument(
+        "--output", default=None, help="Schrijf het rapport als JSON naar dit pad."
+    )
+
+    changes_parser = subparsers.add_parser(
+        "changes",
+        help="Toon de wijzigingen na een volgnummer, als JSON-regels.",
+    )
+    changes_parser.add_argument(
+        "--since",
+        type=int,
+        default=0,
+        help="Laatst verwerkte volgnummer; enkel latere wijzigingen worden getoond.",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Start de databaseservice waarmee werkposten de database delen.",
+    )
+    serve_parser.add_argument(
+        "--host", default=service.DEFAULT_HOST, help="Adres waarop geluisterd wordt."
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=service.DEFAULT_PORT, help="Poort van de service."
+    )
+    return parser
+
+
+def run_duplicates_command(args: argparse.Namespace) -> int:
     check_or_create_database()
+    conn = connect_db()
+    try:
+        groups = list(duplicates.duplicate_groups(conn))
+    finally:
+        conn.close()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(groups, fh, ensure_ascii=False, indent=2)
+    for group in groups:
+        ids = ", ".join(str(object_id) for object_id in group["ids"])
+        print(f"{group['fingerprint']}: {group['count']}x (ids {ids})")
+    print(f"{len(groups)} groepen met dubbele toestellen gevonden.")
+    return 0
+
+
+def run_overlaps_command(args: argparse.Namespace) -> int:
+    check_or_create_database()
+    conn = connect_db()
+    try:
+        conflicts = list(overlaps.overlap_report(conn))
+    finally:
+        conn.close()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(conflicts, fh, ensure_ascii=False, indent=2)
+    for conflict in conflicts:
+        first, second = conflict["object_ids"]
+        print(
+            f"{conflict['medewerker']}: bijstand {first} en {second} overlappen "
+            f"({' - '.join(conflict['perioden'][1])})"
+        )
+    print(f"{len(conflicts)} overlappende toewijzingen gevonden.")
+    return 0
+
+
+def run_changes_command(args: argparse.Namespace) -> int:
+    check_or_create_database()
+    conn = connect_db()
+    try:
+        for change in changelog.iter_changes(conn, args.since):
+            print(json.dumps(change, ensure_ascii=False))
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+def run_serve_command(args: argparse.Namespace) -> int:
+    check_or_create_database()
+    try:
+        service.serve(
+            get_database_path(),
+            host=args.host,
+            port=args.port,
+            token=get_service_token(),
+        )
+    except ValueError as exc:
+        print(exc)
+        return 2
+    return 0
+
+
+def run_integrity_scan_command(args: argparse.Namespace) -> int:
+    output = args.output or datetime.now().strftime("integriteit_%Y%m%d_%H%M%S.json")
+    try:
+        report = integrity_scan.run_integrity_scan(
+            get_database_path(), chunk_size=args.chunk, workers=args.workers
+        )
+    except sqlite3.Error as exc:
+        print(f"Integriteitscontrole mislukt: {exc}")
+        return 2
+    integrity_scan.write_report(report, output)
+    print(
+        f"{report['rows_scanned']} records gecontroleerd in "
+        f"{report['duration_seconds']} s; rapport: {output}"
+    )
+    for check, count in sorted(report["counts"].items()):
+        print(f"  {check}: {count}")
+    return 1 if report["issues"] else 0
+
+
+def run_backup_command(args: argparse.Namespace) -> int:
+    try:
+        path = create_database_backup(keep=args.keep)
+    except (sqlite3.Error, OSError) as exc:
+        print(f"Back-up mislukt: {exc}")
+        return 1
+    print(f"Back-up gemaakt: {path}")
+    return 0
+
+
+def run_maintenance_command(args: argparse.Namespace) -> int:
+    check_or_create_database()
+    report = run_database_maintenance(
+        vacuum_pages=args.pages,
+        convert=True,
+        analyze=True,
+        check_integrity=not args.skip_integrity,
+    )
+    if report.get("integrity", ["ok"]) != ["ok"]:
+        return 1
+    return 0
+
+
+def run_archive_command(args: argparse.Namespace) -> int:
+    if args.voor:
+        cutoff = format_date(args.voor)
+        if cutoff is None:
+            print("Ongeldige datum voor --voor. Gebruik: dd-mm-jjjj")
+            return 2
+    else:
+        cutoff = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+    check_or_create_database()
+    moved = archive_closed_records(cutoff, batch_size=args.batch)
+    if not moved:
+        print(f"Geen afgesloten records van voor {cutoff} gevonden.")
+    for year, count in sorted(moved.items()):
+        print(
+            f"{count} records gearchiveerd naar "
+            f"{archive.archive_path(get_archive_directory(), year)}"
+        )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    if args.command == "archive":
+        return run_archive_command(args)
+    if args.command == "maintenance":
+        return run_maintenance_command(args)
+    if args.command == "backup":
+        return run_backup_command(args)
+    if args.command == "integrity-scan":
+        return run_integrity_scan_command(args)
+    if args.command == "duplicates":
+        return run_duplicates_command(args)
+    if args.command == "overlaps":
+        return run_overlaps_command(args)
+    if args.command == "changes":
+        return run_changes_command(args)
+    if args.command == "serve":
+        return run_serve_command(args)
+
+    if args.snapshot:
+        os.environ["LCCU_READ_ONLY"] = "snapshot"
+    elif args.alleen_lezen:
+        os.environ["LCCU_READ_ONLY"] = "1"
+
+    profile_env = os.environ.get("LCCU_PROFILE", "").strip()
+    if args.profile or profile_env:
+        profile_report = args.profile_rapport or (
+            profile_env if profile_env not in ("", "1") else DEFAULT_REPORT
+        )
+        profiler = CallbackProfiler()
+        # Installed before any widget exists, so every callback is wrapped.
+        profiler.install()
+        atexit.register(profiler.write_report, profile_report)
+
     app = LCCUDatabaseApp()
     app.run()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()
+    sys.exit(main())
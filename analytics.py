@@ -0,0 +1,301 @@
+"""NumPy arrays of the intake and bijstand history, for analyses.
+
+The loaders read only the columns an analysis needs, in keyset chunks on the
+primary key, straight into NumPy arrays: timestamps as the epoch seconds of the
+generated ``*_epoch`` columns (``NaN`` when missing) and text columns as
+integer codes with a label list.  Dienst and type are read as their lookup
+foreign keys, which serve as the codes directly; medewerkers have no lookup
+table and get codes while loading.  The analysis functions then work on whole
+arrays instead of looping over rows in Python.
+
+NumPy is an optional dependency; the rest of the application does not import
+this module.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installation
+    np = None
+
+from schema import epoch_column
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "NumPy is vereist voor de analyses; installeer het met 'pip install numpy'."
+        )
+
+
+@dataclass
+class Categories:
+    """Integer codes of a text column; ``labels[code]`` is the original text."""
+
+    codes: "np.ndarray"
+    labels: list[Optional[str]]
+
+
+@dataclass
+class ObjectArrays:
+    id: "np.ndarray"
+    datum_ingave: "np.ndarray"
+    start_bijstand: "np.ndarray"
+    einde_bijstand: "np.ndarray"
+    dienst: Categories
+    type: Categories
+
+
+@dataclass
+class AssignmentArrays:
+    object_id: "np.ndarray"
+    start_bijstand: "np.ndarray"
+    einde_bijstand: "np.ndarray"
+    medewerker: Categories
+
+
+def _lookup_labels(conn: sqlite3.Connection, table: str) -> list[Optional[str]]:
+    """Return the names of *table* indexed by id; code 0 (no id) is ``None``."""
+    rows = conn.execute(f"SELECT id, naam FROM {table}").fetchall()
+    labels: list[Optional[str]] = [None] * (max((row[0] for row in rows), default=0) + 1)
+    for lookup_id, naam in rows:
+        labels[lookup_id] = naam
+    return labels
+
+
+class _Encoder:
+    """Assigns codes to text values in order of appearance, across chunks."""
+
+    def __init__(self) -> None:
+        self._codes: dict[Optional[str], int] = {}
+        self.labels: list[Optional[str]] = []
+
+    def encode(self, values: Iterable[Optional[str]]) -> "np.ndarray":
+        codes = self._codes
+        for value in values:
+            if value not in codes:
+                codes[value] = len(self.labels)
+                self.labels.append(value)
+        return np.fromiter(
+            (codes[value] for value in values), dtype=np.int32
+        )
+
+
+def _epochs(values: Sequence[Optional[int]]) -> "np.ndarray":
+    # float64 so missing timestamps can be NaN.
+    return np.array(values, dtype=np.float64)
+
+
+def _chunks(
+    conn: sqlite3.Connection,
+    table: str,
+    key: str,
+    columns: Sequence[str],
+    chunk_size: int,
+):
+    """Yield the columns of *table* as tuples of sequences, chunk by chunk."""
+    select = ", ".join((key,) + tuple(columns))
+    sql = f"""
+        SELECT {select} FROM {table}
+        WHERE {key} > ?
+        ORDER BY {key}
+        LIMIT ?
+    """
+    last = -1
+    while True:
+        rows = conn.execute(sql, (last, chunk_size)).fetchall()
+        if not rows:
+            return
+        last = rows[-1][0]
+        # One sequence per column instead of one tuple per row.
+        yield tuple(zip(*rows))
+        if len(rows) < chunk_size:
+            return
+
+
+def load_objects(
+    conn: sqlite3.Connection, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> ObjectArrays:
+    """Load intake time, bijstand period, dienst and type of every object."""
+    _require_numpy()
+    parts: dict[str, list] = {
+        name: [] for name in ("id", "datum", "start", "einde", "dienst", "type")
+    }
+    columns = (
+        epoch_column("datum_ingave"),
+        epoch_column("start_bijstand"),
+        epoch_column("einde_bijstand"),
+        "COALESCE(dienst_id, 0)",
+        "COALESCE(type_id, 0)",
+    )
+    for ids, datum, start, einde, diensten, types in _chunks(
+        conn, "objecten", "id", columns, chunk_size
+    ):
+        parts["id"].append(np.array(ids, dtype=np.int64))
+        parts["datum"].append(_epochs(datum))
+        parts["start"].append(_epochs(start))
+        parts["einde"].append(_epochs(einde))
+        parts["dienst"].append(np.array(diensten, dtype=np.int32))
+        parts["type"].append(np.array(types, dtype=np.int32))
+
+    def joined(name: str, dtype) -> "np.ndarray":
+        return np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype)
+
+    return ObjectArrays(
+        id=joined("id", np.int64),
+        datum_ingave=joined("datum", np.float64),
+        start_bijstand=joined("start", np.float64),
+        einde_bijstand=joined("einde", np.float64),
+        # Read after the rows, so every id they refer to has its label.
+        dienst=Categories(joined("dienst", np.int32), _lookup_labels(conn, "diensten")),
+        type=Categories(joined("type", np.int32), _lookup_labels(conn, "types")),
+    )
+
+
+def load_assignments(
+    conn: sqlite3.Connection, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AssignmentArrays:
+    """Load the period of every medewerker assignment."""
+    _require_numpy()
+    medewerker = _Encoder()
+    parts: dict[str, list] = {name: [] for name in ("object", "start", "einde", "naam")}
+    columns = (
+        "object_id",
+        epoch_column("start_bijstand"),
+        epoch_column("einde_bijstand"),
+        "medewerker",
+    )
+    for _ids, object_ids, start, einde, namen in _chunks(
+        conn, "medewerkers_bijstand", "id", columns, chunk_size
+    ):
+        parts["object"].append(
+            np.array([-1 if value is None else value for value in object_ids], dtype=np.int64)
+        )
+        parts["start"].append(_epochs(start))
+        parts["einde"].append(_epochs(einde))
+        parts["naam"].append(medewerker.encode(namen))
+
+    def joined(name: str, dtype) -> "np.ndarray":
+        return np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype)
+
+    return AssignmentArrays(
+        object_id=joined("object", np.int64),
+        start_bijstand=joined("start", np.float64),
+        einde_bijstand=joined("einde", np.float64),
+        medewerker=Categories(joined("naam", np.int32), medewerker.labels),
+    )
+
+
+def durations_hours(start: "np.ndarray", einde: "np.ndarray") -> "np.ndarray":
+    """Durations of the complete, non-negative periods, in hours."""
+    durations = (einde - start) / HOUR
+    return durations[np.isfinite(durations) & (durations >= 0)]
+
+
+def duration_histogram(
+    start: "np.ndarray", einde: "np.ndarray", bins=24
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Return ``(counts, bin_edges)`` of the period durations in hours."""
+    return np.histogram(durations_hours(start, einde), bins=bins)
+
+
+def intake_rates(
+    datum_ingave: "np.ndarray",
+    dienst: Categories,
+    *,
+    period: int = WEEK,
+    origin: Optional[int] = None,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Count intakes per dienst per *period* seconds.
+
+    Returns ``(period_starts, counts)``; ``counts[dienst_code, period_index]``
+    is the number of objects of that dienst entered in that period.  Periods
+    start at *origin*, by default the Monday before the first intake (epoch
+    day 0 was a Thursday).
+    """
+    known = np.isfinite(datum_ingave)
+    times = datum_ingave[known].astype(np.int64)
+    codes = dienst.codes[known]
+    if times.size == 0:
+        return np.empty(0, np.int64), np.zeros((len(dienst.labels), 0), np.int64)
+    if origin is None:
+        monday = 4 * DAY
+        origin = int(times.min()) - (int(times.min()) - monday) % WEEK
+    index = (times - origin) // period
+    periods = int(index.max()) + 1
+    counts = np.bincount(
+        codes.astype(np.int64) * periods + index,
+        minlength=len(dienst.labels) * periods,
+    ).reshape(len(dienst.labels), periods)
+    return origin + period * np.arange(periods, dtype=np.int64), counts
+
+
+def busy_seconds_before(
+    start: "np.ndarray", einde: "np.ndarray", edges: "np.ndarray"
+) -> "np.ndarray":
+    """Total time covered by the periods before each edge, in seconds.
+
+    For an edge ``t`` this is the sum of ``clip(t - start, 0, einde - start)``,
+    computed from sorted starts and ends with prefix sums instead of per
+    period.
+    """
+    complete = np.isfinite(start) & np.isfinite(einde) & (einde >= start)
+    starts = np.sort(start[complete])
+    ends = np.sort(einde[complete])
+    start_sums = np.concatenate(([0.0], np.cumsum(starts)))
+    end_sums = np.concatenate(([0.0], np.cumsum(ends)))
+    edges = np.asarray(edges, dtype=np.float64)
+    started = np.searchsorted(starts, edges, side="left")
+    ended = np.searchsorted(ends, edges, side="left")
+    return (started * edges - start_sums[started]) - (ended * edges - end_sums[ended])
+
+
+def rolling_weekly_workload(
+    start: "np.ndarray",
+    einde: "np.ndarray",
+    *,
+    first_day: Optional[int] = None,
+    days: Optional[int] = None,
+    window_days: int = 7,
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Hours of bijstand in the *window_days* up to and including each day.
+
+    Returns ``(day_starts, hours)``.  Pass the medewerker assignments to get
+    person-hours, or the objects to get hours per bijstand.
+    """
+    complete = np.isfinite(start) & np.isfinite(einde) & (einde >= start)
+    if not complete.any():
+        return np.empty(0, np.int64), np.empty(0, np.float64)
+    if first_day is None:
+        first_day = int(start[complete].min()) // DAY * DAY
+    if days is None:
+        days = int(einde[complete].max() - first_day) // DAY + 1
+    edges = first_day + DAY * np.arange(-window_days + 1, days + 1, dtype=np.int64)
+    busy = busy_seconds_before(start, einde, edges)
+    hours = (busy[window_days:] - busy[:-window_days]) / HOUR
+    return edges[window_days:] - DAY, hours
+
+
+__all__ = [
+    "AssignmentArrays",
+    "Categories",
+    "DEFAULT_CHUNK_SIZE",
+    "ObjectArrays",
+    "busy_seconds_before",
+    "duration_histogram",
+    "durations_hours",
+    "intake_rates",
+    "load_assignments",
+    "load_objects",
+    "rolling_weekly_workload",
+]
@@ -0,0 +1,260 @@
+"""Per-year archive databases for closed records.
+
+Closed records (a filled ``einde_bijstand`` or ``datum_in_behandeling``) that
+were closed before a cutoff date are moved, together with their
+``medewerkers_bijstand`` rows, into ``objecten_<jaar>.db`` files.  The year is
+the year in which the record was closed, so every date of an archived record
+lies on or before the end of that year.  Searches that include the archive only
+need to attach the archives from the start of the requested range onwards.
+"""
+from __future__ import annotations
+
+import contextlib
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterator, Optional
+
+import schema as schema_changes
+
+ARCHIVE_FILENAME = "objecten_{year}.db"
+DEFAULT_BATCH_SIZE = 500
+
+# SQLite allows ten attached databases by default; one slot stays free for
+# whatever else the connection needs.
+MAX_ATTACHED_ARCHIVES = 9
+
+ARCHIVED_TABLES: tuple[str, ...] = ("objecten", "medewerkers_bijstand")
+
+_ARCHIVE_NAME_RE = re.compile(r"^objecten_(\d{4})\.db$")
+
+_CLOSING_DATE_SQL = (
+    "COALESCE(NULLIF(TRIM(einde_bijstand), ''), "
+    "NULLIF(TRIM(datum_in_behandeling), ''))"
+)
+
+
+def archive_path(archive_dir: str | Path, year: int) -> Path:
+    return Path(archive_dir) / ARCHIVE_FILENAME.format(year=year)
+
+
+def list_archive_years(archive_dir: str | Path) -> list[int]:
+    """Return the years for which an archive file exists, oldest first."""
+    directory = Path(archive_dir)
+    if not directory.is_dir():
+        return []
+    years = []
+    for entry in directory.iterdir():
+        match = _ARCHIVE_NAME_RE.match(entry.name)
+        if match:
+            years.append(int(match.group(1)))
+    return sorted(years)
+
+
+def _column_names(
+    conn: sqlite3.Connection, table: str, schema: str = "main"
+) -> list[str]:
+    # table_info leaves out generated columns, which cannot be inserted into.
+    rows = conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()
+    return [row[1] for row in rows]
+
+
+def _ensure_archive_schema(conn: sqlite3.Connection, path: Path) -> None:
+    """Create or upgrade the archived tables in *path* to the live tables."""
+    placeholders = ", ".join("?" for _ in ARCHIVED_TABLES)
+    statements = conn.execute(
+        f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL
+          AND type IN ('table', 'index')
+        ORDER BY type = 'table' DESC
+        """,
+        ARCHIVED_TABLES,
+    ).fetchall()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    archive_conn = sqlite3.connect(path)
+    try:
+        existing = {
+            row[0]
+            for row in archive_conn.execute("SELECT name FROM sqlite_master")
+        }
+        with archive_conn:
+            for name, sql in statements:
+                if name not in existing:
+                    archive_conn.execute(sql)
+            # Columns added to the live tables after the archive was created.
+            for table in ARCHIVED_TABLES:
+                archived = set(_column_names(archive_conn, table))
+                for row in conn.execute(f"PRAGMA table_info({table})"):
+                    if row[1] not in archived:
+                        archive_conn.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {row[1]} {row[2]}"
+                        )
+            schema_changes.ensure_timestamp_columns(archive_conn)
+            schema_changes.ensure_search_indexes(archive_conn)
+    finally:
+        archive_conn.close()
+
+
+def upgrade_archives(conn: sqlite3.Connection, archive_dir: str | Path) -> list[int]:
+    """Bring every archive up to the schema of the live tables on *conn*.
+
+    Archiving does this for the archives it writes to; maintenance calls this
+    for the others, so searches never have to change an archive.  Returns the
+    years of the archives.
+    """
+    years = list_archive_years(archive_dir)
+    for year in years:
+        _ensure_archive_schema(conn, archive_path(archive_dir, year))
+    return years
+
+
+def _closed_years(conn: sqlite3.Connection, cutoff: str) -> list[str]:
+    rows = conn.execute(
+        f"""
+        SELECT DISTINCT substr({_CLOSING_DATE_SQL}, 1, 4)
+        FROM objecten
+        WHERE {_CLOSING_DATE_SQL} < ?
+          AND {_CLOSING_DATE_SQL} GLOB '[0-9][0-9][0-9][0-9]-*'
+        """,
+        (cutoff,),
+    ).fetchall()
+    return sorted(row[0] for row in rows)
+
+
+def _move_batch(
+    conn: sqlite3.Connection,
+    ids: list[int],
+    objecten_columns: str,
+    medewerkers_columns: str,
+) -> None:
+    placeholders = ", ".join("?" for _ in ids)
+    with conn:
+        conn.execute(
+            f"""
+            INSERT INTO archief.objecten ({objecten_columns})
+            SELECT {objecten_columns} FROM main.objecten WHERE id IN ({placeholders})
+            """,
+            ids,
+        )
+        conn.execute(
+            f"""
+            INSERT INTO archief.medewerkers_bijstand ({medewerkers_columns})
+            SELECT {medewerkers_columns} FROM main.medewerkers_bijstand
+            WHERE object_id IN ({placeholders})
+            """,
+            ids,
+        )
+        conn.execute(
+            f"DELETE FROM main.medewerkers_bijstand WHERE object_id IN ({placeholders})",
+            ids,
+        )
+        conn.execute(
+            f"DELETE FROM main.objecten WHERE id IN ({placeholders})", ids
+        )
+
+
+def archive_closed_records(
+    conn: sqlite3.Connection,
+    archive_dir: str | Path,
+    cutoff: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[int, int]:
+    """Move records closed before *cutoff* (``YYYY-MM-DD``) to the archives.
+
+    Every batch is moved in its own transaction, so an interrupted run leaves
+    each record either in the live database or in its archive.  Returns the
+    number of archived records per year.
+    """
+    objecten_columns = ", ".join(_column_names(conn, "objecten"))
+    medewerkers_columns = ", ".join(_column_names(conn, "medewerkers_bijstand"))
+    moved: dict[int, int] = {}
+
+    for year in _closed_years(conn, cutoff):
+        path = archive_path(archive_dir, int(year))
+        _ensure_archive_schema(conn, path)
+        conn.execute("ATTACH DATABASE ? AS archief", (str(path),))
+        try:
+            while True:
+                ids = [
+                    row[0]
+                    for row in conn.execute(
+                        f"""
+                        SELECT id FROM main.objecten
+                        WHERE {_CLOSING_DATE_SQL} < ?
+                          AND substr({_CLOSING_DATE_SQL}, 1, 4) = ?
+                        ORDER BY id
+                        LIMIT ?
+                        """,
+                        (cutoff, year, batch_size),
+                    )
+                ]
+                if not ids:
+                    break
+                _move_batch(conn, ids, objecten_columns, medewerkers_columns)
+                moved[int(year)] = moved.get(int(year), 0) + len(ids)
+        finally:
+            conn.execute("DETACH DATABASE archief")
+    return moved
+
+
+def archive_years_for_range(
+    archive_dir: str | Path, datum_vanaf: Optional[str]
+) -> list[int]:
+    """Return the archive years a search from *datum_vanaf* has to include."""
+    years = list_archive_years(archive_dir)
+    if datum_vanaf:
+        first_year = int(datum_vanaf[:4])
+        years = [year for year in years if year >= first_year]
+    return years
+
+
+@contextlib.contextmanager
+def attached_archive_groups(
+    conn: sqlite3.Connection,
+    archive_dir: str | Path,
+    datum_vanaf: Optional[str] = None,
+) -> Iterator[Iterator[list[str]]]:
+    """Attach the relevant archives, at most ``MAX_ATTACHED_ARCHIVES`` at a time.
+
+    Yields an iterator of schema-name groups.  The archives of a group stay
+    attached until the next group is requested.  Searching only reads them;
+    :func:`upgrade_archives` keeps their schema current.
+    """
+    attached: list[str] = []
+
+    def detach_all() -> None:
+        while attached:
+            conn.execute(f"DETACH DATABASE {attached.pop()}")
+
+    def groups() -> Iterator[list[str]]:
+        years = archive_years_for_range(archive_dir, datum_vanaf)
+        for start in range(0, len(years), MAX_ATTACHED_ARCHIVES):
+            detach_all()
+            for year in years[start : start + MAX_ATTACHED_ARCHIVES]:
+                schema = f"archief_{year}"
+                conn.execute(
+                    f"ATTACH DATABASE ? AS {schema}",
+                    (str(archive_path(archive_dir, year)),),
+                )
+                attached.append(schema)
+            yield list(attached)
+
+    try:
+        yield groups()
+    finally:
+        detach_all()
+
+
+__all__ = [
+    "ARCHIVED_TABLES",
+    "DEFAULT_BATCH_SIZE",
+    "MAX_ATTACHED_ARCHIVES",
+    "archive_closed_records",
+    "archive_path",
+    "archive_years_for_range",
+    "attached_archive_groups",
+    "list_archive_years",
+    "upgrade_archives",
+]
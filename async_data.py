@@ -0,0 +1,126 @@
+"""Asyncio facade over the data-layer operations in ``repository``.
+
+Scripts (imports, reports) can await the same operations as the desktop client
+and overlap many of them without managing threads::
+
+    async with AsyncDatabase() as db:
+        object_id = await db.insert_object(sin="ABCD1234", ...)
+        async for row in db.iter_search(filters={"dienst": "DOT"}):
+            ...
+
+The blocking ``sqlite3`` calls run on a dedicated thread pool in which every
+worker keeps its own connection.  At most ``max_concurrency`` operations are
+handed to the pool at once; further callers wait for a free slot instead of
+piling up in the executor queue.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional
+
+import search
+from config import get_database_path
+from repository import OPERATIONS
+
+DEFAULT_WORKERS = 4
+
+# Seconds a worker waits for another connection's write lock.
+DEFAULT_BUSY_TIMEOUT = 30.0
+
+
+class AsyncDatabase:
+    """Runs ``repository.OPERATIONS`` on a pool of per-thread connections."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_concurrency: Optional[int] = None,
+        busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+    ) -> None:
+        self.db_path = db_path or get_database_path()
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="async-db"
+        )
+        self._slots = asyncio.Semaphore(max_concurrency or workers)
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only used by this worker; close() runs after the workers stopped.
+            conn = sqlite3.connect(
+                self.db_path, timeout=self._busy_timeout, check_same_thread=False
+            )
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _run(self, name: str, arguments: dict[str, Any]) -> Any:
+        conn = self._connection()
+        with conn:
+            return OPERATIONS[name].func(conn, **arguments)
+
+    async def run(self, name: str, **arguments: Any) -> Any:
+        """Run the ``repository`` operation *name* and return its result."""
+        if name not in OPERATIONS:
+            raise KeyError(name)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._run, name, arguments
+            )
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown, True)
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    async def search_objects(
+        self, **options: Any
+    ) -> tuple[list[tuple], Optional[search.Cursor]]:
+        """One page of search results; see ``repository.search_objects``."""
+        return await self.run("search_objects", **options)
+
+    async def iter_search(
+        self, *, page_size: int = search.DEFAULT_PAGE_SIZE, **options: Any
+    ) -> AsyncIterator[tuple]:
+        """Yield every matching row, fetching one keyset page at a time."""
+        after = None
+        while True:
+            rows, after = await self.search_objects(
+                limit=page_size, after=after, **options
+            )
+            for row in rows:
+                yield row
+            if after is None:
+                return
+
+    async def insert_object(self, **fields: Any) -> int:
+        return await self.run("insert_object", **fields)
+
+    async def insert_bijstand_record(self, **fields: Any) -> int:
+        return await self.run("insert_bijstand_record", **fields)
+
+    async def update_object(self, object_id: int, **fields: Any) -> None:
+        await self.run("update_object", object_id=object_id, **fields)
+
+
+__all__ = ["AsyncDatabase", "DEFAULT_BUSY_TIMEOUT", "DEFAULT_WORKERS"]
@@ -0,0 +1,116 @@
+"""In-memory prefix indexes for the autocomplete of free-text fields.
+
+The values already used for ``merk``, ``dienst`` and ``medewerker`` are read
+once per session, with how often each is used.  Every keystroke is then a
+bisect into a sorted list instead of a query; saved values are added to the
+index as they come.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import sqlite3
+from typing import Iterable
+
+# Field -> query for its distinct values and usage counts.  The GROUP BY
+# columns are indexed, so SQLite reads the index instead of the table.
+SUGGESTION_QUERIES: dict[str, str] = {
+    "merk": "SELECT merk, COUNT(*) FROM objecten GROUP BY merk",
+    "dienst": "SELECT dienst, COUNT(*) FROM objecten GROUP BY dienst",
+    "medewerker": (
+        "SELECT medewerker, COUNT(*) FROM medewerkers_bijstand GROUP BY medewerker"
+    ),
+}
+
+DEFAULT_LIMIT = 10
+
+
+def _key(value: str) -> str:
+    return value.casefold()
+
+
+def read_suggestion_rows(conn: sqlite3.Connection) -> dict[str, list[tuple[str, int]]]:
+    """Return ``(value, count)`` of the values in use, per field."""
+    return {
+        field: [(value, count) for value, count in conn.execute(sql) if value]
+        for field, sql in SUGGESTION_QUERIES.items()
+    }
+
+
+class PrefixIndex:
+    """Values sorted case-insensitively, with a usage count each."""
+
+    def __init__(self, rows: Iterable[tuple[str, int]] = ()) -> None:
+        self._counts: dict[str, int] = {}
+        for value, count in rows:
+            value = " ".join(value.split())
+            if value:
+                self._counts[value] = self._counts.get(value, 0) + count
+        self._entries = sorted((_key(value), value) for value in self._counts)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, value: str, count: int = 1) -> None:
+        """Count *count* more uses of *value*, adding it when it is new."""
+        value = " ".join(value.split())
+        if not value:
+            return
+        if value not in self._counts:
+            bisect.insort(self._entries, (_key(value), value))
+            self._counts[value] = 0
+        self._counts[value] += count
+
+    def merge(self, other: "PrefixIndex") -> None:
+        """Add the values and counts of *other* to this index."""
+        for value, count in other._counts.items():
+            self.add(value, count)
+
+    def suggest(self, prefix: str, limit: int = DEFAULT_LIMIT) -> list[str]:
+        """Return the most used values that start with *prefix*."""
+        key = _key(prefix.lstrip())
+        start = bisect.bisect_left(self._entries, (key,))
+        # Every key with the prefix sorts before prefix + the highest character.
+        end = bisect.bisect_left(self._entries, (key + "\U0010ffff",), start)
+        matches = self._entries[start:end]
+        best = heapq.nsmallest(
+            limit, matches, key=lambda entry: (-self._counts[entry[1]], entry[0])
+        )
+        return [value for _sort_key, value in best]
+
+
+class SuggestionCache:
+    """The prefix indexes of one session; empty until :meth:`set_rows`."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, PrefixIndex] = {
+            field: PrefixIndex() for field in SUGGESTION_QUERIES
+        }
+        self.loaded = False
+
+    def set_rows(self, rows: dict[str, list[tuple[str, int]]]) -> None:
+        """Build the indexes from *rows*, as returned by ``read_suggestion_rows``.
+
+        Values saved before the rows arrived are kept.
+        """
+        for field, values in rows.items():
+            index = PrefixIndex(values)
+            index.merge(self._indexes[field])
+            self._indexes[field] = index
+        self.loaded = True
+
+    def add(self, field: str, value: str | None) -> None:
+        if value:
+            self._indexes[field].add(value)
+
+    def suggest(self, field: str, prefix: str, limit: int = DEFAULT_LIMIT) -> list[str]:
+        return self._indexes[field].suggest(prefix, limit)
+
+
+__all__ = [
+    "DEFAULT_LIMIT",
+    "PrefixIndex",
+    "SUGGESTION_QUERIES",
+    "SuggestionCache",
+    "read_suggestion_rows",
+]
@@ -0,0 +1,84 @@
+"""Run blocking work off the Tk thread.
+
+Tk widgets may only be touched from the thread that runs the main loop.  A
+:class:`BackgroundWorker` executes submitted functions on its own thread, in
+submission order, and hands the results back to the Tk thread by polling a
+queue with ``after``.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+# How often (in milliseconds) the Tk thread checks for finished jobs.
+_POLL_INTERVAL_MS = 50
+
+
+class BackgroundWorker:
+    """Single worker thread whose callbacks run on the Tk thread."""
+
+    def __init__(self, root: tk.Misc, name: str = "background-worker") -> None:
+        self._root = root
+        self._jobs: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._poll_id: Optional[str] = self._root.after(
+            _POLL_INTERVAL_MS, self._poll
+        )
+
+    def submit(
+        self,
+        func: Callable[[], Any],
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> None:
+        """Queue *func*; the callbacks are invoked on the Tk thread."""
+        self._jobs.put((func, on_success, on_error))
+
+    def pending(self) -> int:
+        """Return the number of jobs that have not been started yet."""
+        return self._jobs.qsize()
+
+    def stop(self) -> None:
+        """Stop polling and let the worker thread finish its current job."""
+        if self._poll_id is not None:
+            try:
+                self._root.after_cancel(self._poll_id)
+            except tk.TclError:
+                pass
+            self._poll_id = None
+        self._jobs.put(None)
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            func, on_success, on_error = job
+            try:
+                result = func()
+            except BaseException as exc:  # reported on the Tk thread
+                self._results.put((on_error, exc))
+            else:
+                self._results.put((on_success, result))
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if callback is not None:
+                callback(value)
+            elif isinstance(value, BaseException):
+                print(f"Fout in achtergrondtaak: {value}")
+        try:
+            self._poll_id = self._root.after(_POLL_INTERVAL_MS, self._poll)
+        except tk.TclError:
+            self._poll_id = None
+
+
+__all__ = ["BackgroundWorker"]
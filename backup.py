@@ -0,0 +1,127 @@
+"""Online snapshots of the database with the SQLite backup API.
+
+Copying the database file while other workstations write to it can produce a
+torn copy.  ``Connection.backup`` copies a consistent image instead; it works in
+small page steps and pauses between them, so writers only ever wait for one
+step.  A write by another connection makes the copy start over; after
+``max_restarts`` of those the rest is copied in one step, which keeps writers
+waiting for that one copy but does finish.  Each snapshot is checked with ``PRAGMA quick_check`` before it replaces
+anything, and only the newest snapshots are kept.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_STEP = 64
+DEFAULT_STEP_SLEEP = 0.05
+DEFAULT_KEEP = 14
+DEFAULT_MAX_RESTARTS = 3
+
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+
+class _CopyRestarted(Exception):
+    """Stops a stepped copy that other writers keep restarting."""
+
+
+def list_backups(backup_dir: str | Path, prefix: str = "objecten") -> list[Path]:
+    """Return the snapshots in *backup_dir*, oldest first."""
+    directory = Path(backup_dir)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"{prefix}_*[0-9].db"))
+
+
+def rotate_backups(
+    backup_dir: str | Path, keep: int = DEFAULT_KEEP, prefix: str = "objecten"
+) -> list[Path]:
+    """Delete all but the newest *keep* snapshots and return the removed paths."""
+    snapshots = list_backups(backup_dir, prefix)
+    removed = snapshots[: max(len(snapshots) - keep, 0)]
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+def create_backup(
+    source: sqlite3.Connection,
+    backup_dir: str | Path,
+    *,
+    prefix: str = "objecten",
+    pages: int = DEFAULT_PAGES_PER_STEP,
+    step_sleep: float = DEFAULT_STEP_SLEEP,
+    keep: int = DEFAULT_KEEP,
+    max_restarts: int = DEFAULT_MAX_RESTARTS,
+) -> Path:
+    """Write a verified, timestamped snapshot of *source* to *backup_dir*."""
+    directory = Path(backup_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime(_TIMESTAMP_FORMAT)
+    target = directory / f"{prefix}_{timestamp}.db"
+    partial = directory / f"{prefix}_{timestamp}.db.part"
+
+    started = time.perf_counter()
+    destination = sqlite3.connect(partial)
+    restarts = 0
+    last_remaining: int | None = None
+
+    def progress(_status: int, remaining: int, _total: int) -> None:
+        nonlocal restarts, last_remaining
+        # The remaining page count only goes up again when the copy restarted.
+        if last_remaining is not None and remaining >= last_remaining:
+            restarts += 1
+            if restarts > max_restarts:
+                raise _CopyRestarted
+        last_remaining = remaining
+        # Python only sleeps between steps when the source is busy; this
+        # makes every step yield to writers.
+        time.sleep(step_sleep)
+
+    try:
+        try:
+            source.backup(destination, pages=pages, progress=progress)
+        except _CopyRestarted:
+            logger.warning(
+                "Back-up %s werd %d keer herstart door schrijfopdrachten; "
+                "de rest wordt in één stap gekopieerd",
+                target.name,
+                restarts,
+            )
+            source.backup(destination, pages=-1)
+        check = [row[0] for row in destination.execute("PRAGMA quick_check")]
+    finally:
+        destination.close()
+
+    if check != ["ok"]:
+        partial.unlink()
+        raise sqlite3.DatabaseError(
+            f"Back-up {target.name} faalde de integriteitscontrole: {check}"
+        )
+
+    os.replace(partial, target)
+    removed = rotate_backups(directory, keep, prefix)
+    logger.info(
+        "Back-up %s gemaakt in %.2f s (%d oude back-ups verwijderd)",
+        target,
+        time.perf_counter() - started,
+        len(removed),
+    )
+    return target
+
+
+__all__ = [
+    "DEFAULT_KEEP",
+    "DEFAULT_MAX_RESTARTS",
+    "DEFAULT_PAGES_PER_STEP",
+    "DEFAULT_STEP_SLEEP",
+    "create_backup",
+    "list_backups",
+    "rotate_backups",
+]
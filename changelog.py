@@ -0,0 +1,113 @@
+"""Reading and compacting the change log of ``objecten`` and ``medewerkers_bijstand``.
+
+Triggers (``schema.ensure_changelog``) add one entry per inserted, updated or
+deleted row, with an increasing sequence number.  A consumer remembers the
+last ``seq`` it processed and asks for the changes after it; only the rows
+named in the entries need to be read again.
+
+Compaction removes the oldest entries.  A consumer that is further behind
+than the oldest remaining entry gets a ``ValueError`` and must re-read the
+tables in full.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Compaction keeps the entries of this many days, and never more than
+# DEFAULT_MAX_ENTRIES entries.
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def latest_seq(conn: sqlite3.Connection) -> int:
+    """Return the sequence number of the newest entry ever written (0 if none)."""
+    row = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'changelog'"
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _check_since(conn: sqlite3.Connection, since: int) -> None:
+    oldest = conn.execute("SELECT MIN(seq) FROM changelog").fetchone()[0]
+    # Without entries, everything up to the newest number was compacted.
+    first_available = oldest if oldest is not None else latest_seq(conn) + 1
+    if since < first_available - 1:
+        raise ValueError(
+            f"Wijzigingen tot en met {first_available - 1} zijn al opgeruimd; "
+            "lees de tabellen volledig opnieuw in."
+        )
+
+
+def iter_changes(
+    conn: sqlite3.Connection,
+    since: int = 0,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Yield the entries after *since*, oldest first, one batch at a time."""
+    _check_since(conn, since)
+    while True:
+        rows = conn.execute(
+            """
+            SELECT seq, table_name, operation, row_id, changed_columns, changed_at
+            FROM changelog WHERE seq > ? ORDER BY seq LIMIT ?
+            """,
+            (since, batch_size),
+        ).fetchall()
+        for seq, table, operation, row_id, columns, changed_at in rows:
+            yield {
+                "seq": seq,
+                "table": table,
+                "operation": operation,
+                "row_id": row_id,
+                "columns": columns.split(",") if columns else [],
+                "changed_at": changed_at,
+            }
+        if len(rows) < batch_size:
+            return
+        since = rows[-1][0]
+
+
+def compact(
+    conn: sqlite3.Connection,
+    *,
+    retention_days: int = DEFAULT_RETENTION_DAYS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    now: Optional[datetime] = None,
+) -> int:
+    """Remove entries older than *retention_days* or beyond *max_entries*.
+
+    Returns the number of removed entries.  Both limits translate to a ``seq``
+    bound, so the delete is a range on the primary key.
+    """
+    cutoff = ((now or datetime.now()) - timedelta(days=retention_days)).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    # Entries are written in time order: the first recent entry is the bound.
+    first_recent = conn.execute(
+        "SELECT seq FROM changelog WHERE changed_at >= ? ORDER BY seq LIMIT 1",
+        (cutoff,),
+    ).fetchone()
+    bound = first_recent[0] if first_recent else latest_seq(conn) + 1
+    bound = max(bound, latest_seq(conn) + 1 - max_entries)
+    removed = conn.execute("DELETE FROM changelog WHERE seq < ?", (bound,)).rowcount
+    if removed:
+        logger.info("%d oude wijzigingen uit de changelog verwijderd.", removed)
+    return removed
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_RETENTION_DAYS",
+    "compact",
+    "iter_changes",
+    "latest_seq",
+]
@@ -8,10 +8,13 @@ provided.
 from __future__ import annotations
 
 import configparser
+import functools
 import json
 import os
+import socket
 from pathlib import Path
 from typing import Iterable, Optional
+from urllib.parse import quote
 
 # The historical network location of the production database.  This is the
 # default value that is used when no overriding configuration is provided.
@@ -20,6 +23,24 @@ DEFAULT_DB_PATH = r"\\\\file01.storage\\smB-usr-lrnas\\lr-lccu\\Bruno\\objecten.
 # Environment variable that can override the database path.
 _ENV_VAR_NAME = "LCCU_DB_PATH"
 
+# Environment variable that can override the archive directory.
+_ARCHIVE_ENV_VAR_NAME = "LCCU_ARCHIVE_DIR"
+
+# Environment variable that can override the local backup directory.
+_BACKUP_ENV_VAR_NAME = "LCCU_BACKUP_DIR"
+
+# Environment variable naming the workstation that makes the scheduled backups.
+_BACKUP_HOST_ENV_VAR_NAME = "LCCU_BACKUP_HOST"
+
+# Environment variables that point the desktop client at a database service
+# instead of the database file, and the shared token of that service.
+_SERVICE_URL_ENV_VAR_NAME = "LCCU_SERVICE_URL"
+_SERVICE_TOKEN_ENV_VAR_NAME = "LCCU_SERVICE_TOKEN"
+
+# Environment variable for search-only workstations: "1" opens the database
+# read-only, "snapshot" opens the newest local backup instead.
+_READ_ONLY_ENV_VAR_NAME = "LCCU_READ_ONLY"
+
 # Candidate configuration files that may contain a database path override.
 _INI_FILENAMES: tuple[str, ...] = ("config.ini", "settings.ini")
 _JSON_FILENAMES: tuple[str, ...] = ("config.json", "settings.json")
@@ -92,12 +113,13 @@ def _load_from_json_file(file_path: Path) -> Optional[str]:
     return None
 
 
-def get_database_path() -> str:
-    """Determine the database path to use for SQLite connections."""
-    env_value = _load_from_env()
-    if env_value:
-        return env_value
+@functools.lru_cache(maxsize=None)
+def _load_from_config_files() -> Optional[str]:
+    """Return the first database path found in the configuration files.
 
+    The result is cached: on a network share every ``exists()`` check costs a
+    round-trip, and the files do not change while the application runs.
+    """
     for directory in _candidate_directories():
         for filename in _INI_FILENAMES:
             ini_path = directory / filename
@@ -111,8 +133,113 @@ def get_database_path() -> str:
                 value = _load_from_json_file(json_path)
                 if value:
                     return value
+    return None
+
+
+def clear_database_path_cache() -> None:
+    """Forget the cached configuration file lookup."""
+    _load_from_config_files.cache_clear()
+
+
+def get_database_path() -> str:
+    """Determine the database path to use for SQLite connections."""
+    env_value = _load_from_env()
+    if env_value:
+        return env_value
+
+    file_value = _load_from_config_files()
+    if file_value:
+        return file_value
 
     return DEFAULT_DB_PATH
 
 
-__all__ = ["DEFAULT_DB_PATH", "get_database_path"]
+def get_archive_directory() -> str:
+    """Return the directory that holds the per-year archive databases.
+
+    Defaults to an ``archief`` folder next to the database file.
+    """
+    value = os.environ.get(_ARCHIVE_ENV_VAR_NAME, "").strip()
+    if value:
+        return os.path.expanduser(value)
+    return os.path.join(os.path.dirname(get_database_path()), "archief")
+
+
+def get_backup_directory() -> str:
+    """Return the local directory for database snapshots.
+
+    Snapshots are kept on the workstation rather than on the file share, so a
+    problem with the share does not take the backups with it.
+    """
+    value = os.environ.get(_BACKUP_ENV_VAR_NAME, "").strip()
+    if value:
+        return os.path.expanduser(value)
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if local_app_data:
+        return os.path.join(local_app_data, "LCCU", "backups")
+    return os.path.join(os.path.expanduser("~"), ".lccu", "backups")
+
+
+def is_backup_host() -> bool:
+    """Return whether this workstation makes the scheduled backups.
+
+    Only the machine named in ``LCCU_BACKUP_HOST`` does, so the database on
+    the share is copied once per interval instead of by every client.
+    """
+    value = os.environ.get(_BACKUP_HOST_ENV_VAR_NAME, "").strip().lower()
+    return bool(value) and (
+        value.split(".")[0] == socket.gethostname().split(".")[0].lower()
+    )
+
+
+def get_service_url() -> Optional[str]:
+    """Return the URL of the database service, or ``None`` for direct access."""
+    value = os.environ.get(_SERVICE_URL_ENV_VAR_NAME, "").strip()
+    return value.rstrip("/") or None
+
+
+def get_service_token() -> Optional[str]:
+    """Return the token that clients and the service share, if any."""
+    return os.environ.get(_SERVICE_TOKEN_ENV_VAR_NAME, "").strip() or None
+
+
+def get_read_only_mode() -> Optional[str]:
+    """Return ``"ro"``, ``"snapshot"`` or ``None`` for a normal session."""
+    value = os.environ.get(_READ_ONLY_ENV_VAR_NAME, "").strip().lower()
+    if not value or value in ("0", "nee", "no"):
+        return None
+    return "snapshot" if value == "snapshot" else "ro"
+
+
+def database_uri(path: str, **params: str) -> str:
+    """Return an SQLite ``file:`` URI for *path* with query *params*.
+
+    UNC paths keep their server part (``file:////server/share/...``) and
+    Windows drive letters become ``file:/C:/...``, which is how SQLite expects
+    them.  Use with ``sqlite3.connect(uri, uri=True)``.
+    """
+    if path.startswith(("\\\\", "//")):
+        # UNC path: an empty authority followed by //server/share.
+        posix_path = "////" + path.replace("\\", "/").lstrip("/")
+    else:
+        posix_path = Path(path).absolute().as_posix()
+        if not posix_path.startswith("/"):
+            posix_path = "/" + posix_path
+    uri = "file:" + quote(posix_path, safe="/:")
+    if params:
+        uri += "?" + "&".join(f"{key}={value}" for key, value in params.items())
+    return uri
+
+
+__all__ = [
+    "DEFAULT_DB_PATH",
+    "clear_database_path_cache",
+    "database_uri",
+    "get_archive_directory",
+    "get_backup_directory",
+    "get_database_path",
+    "get_read_only_mode",
+    "get_service_token",
+    "get_service_url",
+    "is_backup_host",
+]
@@ -0,0 +1,72 @@
+"""Reachability probe for the database location.
+
+Opening a SQLite file on an unreachable UNC share blocks inside the SMB client
+for tens of seconds.  The helpers in this module check the location in a
+separate thread and give up after a hard timeout, so the caller never waits
+longer than it is willing to.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional
+
+# Maximum number of seconds a single probe may take.
+DEFAULT_PROBE_TIMEOUT = 3.0
+
+
+class ProbeResult:
+    """Outcome of a single reachability probe."""
+
+    def __init__(self, path: str, reachable: bool, reason: str = "") -> None:
+        self.path = path
+        self.reachable = reachable
+        self.reason = reason
+
+    def __bool__(self) -> bool:
+        return self.reachable
+
+    def __repr__(self) -> str:
+        return f"ProbeResult(path={self.path!r}, reachable={self.reachable!r}, reason={self.reason!r})"
+
+
+def _stat_location(path: str) -> Optional[str]:
+    """Return ``None`` when *path* can be used, otherwise a reason."""
+    directory = os.path.dirname(path) or "."
+    if not os.path.isdir(directory):
+        return f"Map '{directory}' is niet bereikbaar."
+    if os.path.exists(path):
+        os.stat(path)
+    return None
+
+
+def probe_database_path(
+    path: str, timeout: float = DEFAULT_PROBE_TIMEOUT
+) -> ProbeResult:
+    """Check whether *path* can be reached within *timeout* seconds.
+
+    The file system calls run in a daemon thread.  When they do not return in
+    time the thread is abandoned and the location is reported unreachable.
+    """
+    outcome: dict[str, Optional[str]] = {}
+
+    def target() -> None:
+        try:
+            outcome["reason"] = _stat_location(path)
+        except OSError as exc:
+            outcome["reason"] = str(exc)
+
+    thread = threading.Thread(target=target, name="db-probe", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        return ProbeResult(
+            path, False, f"Geen antwoord binnen {timeout:g} seconden."
+        )
+    reason = outcome.get("reason")
+    if reason:
+        return ProbeResult(path, False, reason)
+    return ProbeResult(path, True)
+
+
+__all__ = ["DEFAULT_PROBE_TIMEOUT", "ProbeResult", "probe_database_path"]
@@ -0,0 +1,104 @@
+"""Fast conversion between the stored ISO timestamps and the Dutch layout.
+
+Almost every stored value has the fixed layout ``YYYY-MM-DD HH:MM:SS``; those
+are converted by slicing after one precompiled regex match and a range check,
+instead of a ``strptime``/``strftime`` round trip.  Anything else falls back
+to ``strptime``, so the results are the same as before (including for
+unpadded values such as ``2024-1-5 9:00:00``).  Results are memoised, since
+result sets repeat many values.
+"""
+from __future__ import annotations
+
+import functools
+import re
+from datetime import datetime
+from typing import Optional
+
+ISO_FORMAT = "%Y-%m-%d %H:%M:%S"
+DUTCH_FORMAT = "%d-%m-%Y %H:%M"
+
+# Formats accepted when normalising stored values, in order of preference.
+NORMALIZE_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%d-%m-%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+)
+
+CACHE_SIZE = 65_536
+
+_ISO_RE = re.compile(r"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d)(?::(\d\d))?", re.ASCII)
+_DUTCH_RE = re.compile(r"(\d\d)-(\d\d)-(\d{4}) (\d\d):(\d\d)(?::(\d\d))?", re.ASCII)
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _is_valid(year: str, month: str, day: str, hour: str, minute: str, second) -> bool:
+    y, m, d = int(year), int(month), int(day)
+    if not (1 <= y and 1 <= m <= 12 and 1 <= d):
+        return False
+    leap = m == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+    if d > _DAYS_IN_MONTH[m] + leap:
+        return False
+    return int(hour) < 24 and int(minute) < 60 and (second is None or int(second) < 60)
+
+
+def _strptime_convert(value: str, formats: tuple[str, ...], output: str) -> Optional[str]:
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).strftime(output)
+        except ValueError:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def iso_to_dutch(value: Optional[str]) -> str:
+    """Format a stored ``YYYY-MM-DD HH:MM:SS`` value as ``DD-MM-YYYY HH:MM``.
+
+    Empty values give ``""``; values in another layout are returned unchanged.
+    """
+    if not value:
+        return ""
+    match = _ISO_RE.fullmatch(value)
+    if match is not None and match.group(6) is not None:
+        if _is_valid(*match.groups()):
+            return f"{value[8:10]}-{value[5:7]}-{value[0:4]} {value[11:16]}"
+        return value
+    return _strptime_convert(value, (ISO_FORMAT,), DUTCH_FORMAT) or value
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def normalize_to_iso(value: Optional[str]) -> Optional[str]:
+    """Rewrite a stored timestamp in one of ``NORMALIZE_FORMATS`` to ISO.
+
+    Returns ``None`` for empty values and the stripped value when it is in
+    none of the formats.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    match = _ISO_RE.fullmatch(value)
+    if match is not None:
+        if not _is_valid(*match.groups()):
+            return value
+        return value if match.group(6) is not None else value + ":00"
+    match = _DUTCH_RE.fullmatch(value)
+    if match is not None:
+        day, month, year, hour, minute, second = match.groups()
+        if not _is_valid(year, month, day, hour, minute, second):
+            return value
+        return f"{year}-{month}-{day} {hour}:{minute}:{second or '00'}"
+    return _strptime_convert(value, NORMALIZE_FORMATS, ISO_FORMAT) or value
+
+
+__all__ = [
+    "CACHE_SIZE",
+    "DUTCH_FORMAT",
+    "ISO_FORMAT",
+    "NORMALIZE_FORMATS",
+    "iso_to_dutch",
+    "normalize_to_iso",
+]
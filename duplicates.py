@@ -0,0 +1,76 @@
+"""Duplicate device detection on the indexed ``fingerprint`` column."""
+from __future__ import annotations
+
+import sqlite3
+import string
+from typing import Iterator, Optional
+
+from schema import FINGERPRINT_COLUMNS, fingerprint_sql
+
+# Numbered placeholders, because the expression uses the SIN twice.
+_FINGERPRINT_PARAMS = fingerprint_sql(
+    *(f"?{index}" for index in range(1, len(FINGERPRINT_COLUMNS) + 1))
+)
+
+# SQLite's upper() and lower() only change ASCII letters.
+_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def fingerprint(
+    *, sin: str, object_type: str, subcategorie: str, merk: str, os_value: str
+) -> Optional[str]:
+    """Return the fingerprint ``fingerprint_sql`` gives these values, in Python.
+
+    Used to compare devices that are not stored yet, such as a staged batch.
+    """
+    sin = (sin or "").strip(" ").translate(_UPPER)
+    if sin == "BIJSTAND":
+        return None
+    others = [
+        (value or "").strip(" ").translate(_LOWER)
+        for value in (object_type, subcategorie, merk, os_value)
+    ]
+    return "|".join([sin, *others])
+
+
+def find_duplicates(
+    conn: sqlite3.Connection,
+    *,
+    sin: str,
+    object_type: str,
+    subcategorie: str,
+    merk: str,
+    os_value: str,
+) -> list[tuple[int, str | None]]:
+    """Return ``(id, datum_ingave)`` of stored devices with the same fingerprint."""
+    return conn.execute(
+        f"""
+        SELECT id, datum_ingave FROM objecten
+        WHERE fingerprint = {_FINGERPRINT_PARAMS}
+        ORDER BY id
+        """,
+        (sin, object_type, subcategorie, merk, os_value),
+    ).fetchall()
+
+
+def duplicate_groups(conn: sqlite3.Connection) -> Iterator[dict]:
+    """Yield every fingerprint that occurs more than once, in one index pass."""
+    rows = conn.execute(
+        """
+        SELECT fingerprint, COUNT(*), group_concat(id)
+        FROM objecten
+        WHERE fingerprint IS NOT NULL
+        GROUP BY fingerprint
+        HAVING COUNT(*) > 1
+        """
+    )
+    for fingerprint, count, ids in rows:
+        yield {
+            "fingerprint": fingerprint,
+            "count": count,
+            "ids": sorted(int(value) for value in ids.split(",")),
+        }
+
+
+__all__ = ["duplicate_groups", "find_duplicates", "fingerprint"]
@@ -0,0 +1,220 @@
+"""Parallel data integrity scan over ``objecten`` and ``medewerkers_bijstand``.
+
+The id range of ``objecten`` is split into chunks that worker processes check
+independently, each with its own read-only connection.  Every check is a range
+query on the primary key (or on the ``object_id`` index), so the work per
+chunk stays proportional to the chunk size, also on multi-million-row copies.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Optional
+
+from config import database_uri
+from schema import TIMESTAMP_COLUMNS, epoch_column
+from validation import validate_sin
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# A SIN in normalised form; only other values need the Python validation.
+_NORMALIZED_SIN_GLOB = "[A-Z][A-Z][A-Z][A-Z][0-9][0-9][0-9][0-9]"
+
+
+def _issue(check: str, table: str, row_id: Optional[int], **details: Any) -> dict:
+    return {"check": check, "table": table, "id": row_id, "details": details}
+
+
+def _check_sins(conn: sqlite3.Connection, start: int, end: int) -> Iterable[dict]:
+    rows = conn.execute(
+        f"""
+        SELECT id, sin FROM objecten
+        WHERE id BETWEEN ? AND ?
+          AND (sin IS NULL OR (sin NOT GLOB '{_NORMALIZED_SIN_GLOB}' AND sin != 'BIJSTAND'))
+        """,
+        (start, end),
+    )
+    for row_id, sin in rows:
+        try:
+            validate_sin(sin or "")
+        except ValueError as exc:
+            yield _issue("invalid_sin", "objecten", row_id, sin=sin, error=str(exc))
+
+
+def _check_periods(conn: sqlite3.Connection, start: int, end: int) -> Iterable[dict]:
+    for table, key in (("objecten", "id"), ("medewerkers_bijstand", "object_id")):
+        rows = conn.execute(
+            f"""
+            SELECT id, start_bijstand, einde_bijstand FROM {table}
+            WHERE {key} BETWEEN ? AND ?
+              AND einde_bijstand_epoch < start_bijstand_epoch
+            """,
+            (start, end),
+        )
+        for row_id, start_bijstand, einde_bijstand in rows:
+            yield _issue(
+                "einde_before_start",
+                table,
+                row_id,
+                start_bijstand=start_bijstand,
+                einde_bijstand=einde_bijstand,
+            )
+
+
+def _check_medewerker_counts(
+    conn: sqlite3.Connection, start: int, end: int
+) -> Iterable[dict]:
+    rows = conn.execute(
+        """
+        SELECT id, aantal_medewerkers, gevonden FROM (
+            SELECT
+                o.id,
+                o.aantal_medewerkers,
+                (SELECT COUNT(*) FROM medewerkers_bijstand m WHERE m.object_id = o.id)
+                    AS gevonden
+            FROM objecten o
+            WHERE o.id BETWEEN ? AND ?
+        )
+        WHERE COALESCE(aantal_medewerkers, 0) != gevonden
+        """,
+        (start, end),
+    )
+    for row_id, expected, found in rows:
+        yield _issue(
+            "medewerkers_count_mismatch",
+            "objecten",
+            row_id,
+            aantal_medewerkers=expected,
+            medewerkers_bijstand_rows=found,
+        )
+
+
+def _check_orphans(
+    conn: sqlite3.Connection, start: int, end: int, include_null: bool
+) -> Iterable[dict]:
+    null_condition = " OR m.object_id IS NULL" if include_null else ""
+    rows = conn.execute(
+        f"""
+        SELECT m.id, m.object_id FROM medewerkers_bijstand m
+        WHERE (m.object_id BETWEEN ? AND ?{null_condition})
+          AND NOT EXISTS (SELECT 1 FROM objecten o WHERE o.id = m.object_id)
+        """,
+        (start, end),
+    )
+    for row_id, object_id in rows:
+        yield _issue("orphan_child", "medewerkers_bijstand", row_id, object_id=object_id)
+
+
+def _check_dates(conn: sqlite3.Connection, start: int, end: int) -> Iterable[dict]:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        key = "id" if table == "objecten" else "object_id"
+        for column in columns:
+            rows = conn.execute(
+                f"""
+                SELECT id, {column} FROM {table}
+                WHERE {key} BETWEEN ? AND ?
+                  AND {column} IS NOT NULL AND TRIM({column}) != ''
+                  AND {epoch_column(column)} IS NULL
+                """,
+                (start, end),
+            )
+            for row_id, value in rows:
+                yield _issue(
+                    "unparseable_date", table, row_id, column=column, value=value
+                )
+
+
+def scan_range(
+    db_path: str, start: int, end: int, include_null: bool = False
+) -> tuple[int, list[dict]]:
+    """Check the ids ``start..end``; returns the number of rows and the issues."""
+    conn = sqlite3.connect(database_uri(db_path, mode="ro"), uri=True)
+    try:
+        scanned = conn.execute(
+            "SELECT COUNT(*) FROM objecten WHERE id BETWEEN ? AND ?", (start, end)
+        ).fetchone()[0]
+        issues: list[dict] = []
+        issues.extend(_check_sins(conn, start, end))
+        issues.extend(_check_periods(conn, start, end))
+        issues.extend(_check_medewerker_counts(conn, start, end))
+        issues.extend(_check_orphans(conn, start, end, include_null))
+        issues.extend(_check_dates(conn, start, end))
+        return scanned, issues
+    finally:
+        conn.close()
+
+
+def _id_ranges(db_path: str, chunk_size: int) -> list[tuple[int, int]]:
+    conn = sqlite3.connect(database_uri(db_path, mode="ro"), uri=True)
+    try:
+        low, high = conn.execute(
+            """
+            SELECT MIN(lo), MAX(hi) FROM (
+                SELECT MIN(id) AS lo, MAX(id) AS hi FROM objecten
+                UNION ALL
+                SELECT MIN(object_id), MAX(object_id) FROM medewerkers_bijstand
+            )
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+    if low is None:
+        return [(0, 0)]
+    return [
+        (start, min(start + chunk_size - 1, high))
+        for start in range(low, high + 1, chunk_size)
+    ]
+
+
+def run_integrity_scan(
+    db_path: str,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+) -> dict:
+    """Scan the database at *db_path* in parallel and return the report."""
+    started = time.perf_counter()
+    ranges = _id_ranges(db_path, chunk_size)
+    workers = workers or min(len(ranges), os.cpu_count() or 1)
+
+    issues: list[dict] = []
+    scanned = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(scan_range, db_path, start, end, index == 0)
+            for index, (start, end) in enumerate(ranges)
+        ]
+        for future in futures:
+            chunk_scanned, chunk_issues = future.result()
+            scanned += chunk_scanned
+            issues.extend(chunk_issues)
+
+    counts: dict[str, int] = {}
+    for issue in issues:
+        counts[issue["check"]] = counts.get(issue["check"], 0) + 1
+    return {
+        "database": db_path,
+        "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "chunks": len(ranges),
+        "workers": workers,
+        "rows_scanned": scanned,
+        "counts": counts,
+        "issues": issues,
+    }
+
+
+def write_report(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "run_integrity_scan",
+    "scan_range",
+    "write_report",
+]
@@ -0,0 +1,68 @@
+"""Session cache for the lookup tables behind the dropdowns."""
+from __future__ import annotations
+
+import sqlite3
+from typing import Optional
+
+from schema import LOOKUP_SEEDS, LOOKUP_TABLES
+
+
+def read_lookup_rows(
+    conn: sqlite3.Connection,
+) -> dict[str, list[tuple[str, Optional[str]]]]:
+    """Return the active ``(naam, type)`` values of every lookup table."""
+    rows: dict[str, list[tuple[str, Optional[str]]]] = {}
+    for table, _column, _fk, scoped in LOOKUP_TABLES:
+        type_select = (
+            "(SELECT naam FROM types WHERE types.id = l.type_id)"
+            if scoped
+            else "NULL"
+        )
+        rows[table] = conn.execute(
+            f"""
+            SELECT l.naam, {type_select} FROM {table} l
+            WHERE l.actief = 1
+            ORDER BY l.volgorde, l.naam
+            """
+        ).fetchall()
+    return rows
+
+
+class LookupCache:
+    """Holds the active lookup values, loaded once per session.
+
+    Until :meth:`load` succeeds the cache serves the built-in seed values, so
+    the forms are usable while the database is still being reached.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[str, list[tuple[str, Optional[str]]]] = {
+            table: list(rows) for table, rows in LOOKUP_SEEDS.items()
+        }
+        self.loaded = False
+
+    def load(self, conn: sqlite3.Connection) -> None:
+        self.set_rows(read_lookup_rows(conn))
+
+    def set_rows(self, rows: dict[str, list[tuple[str, Optional[str]]]]) -> None:
+        """Replace the cached values by *rows*, as returned by ``read_lookup_rows``."""
+        self._rows = {table: [tuple(row) for row in values] for table, values in rows.items()}
+        self.loaded = True
+
+    def values(self, table: str, object_type: Optional[str] = None) -> list[str]:
+        """Return the dropdown values of *table*, optionally for one type.
+
+        Values without a type (such as "Andere") are only offered for types
+        that have values of their own.
+        """
+        rows = self._rows.get(table, [])
+        if object_type is None:
+            return [naam for naam, _type in rows]
+        if not any(type_naam == object_type for _naam, type_naam in rows):
+            return []
+        return [
+            naam for naam, type_naam in rows if type_naam in (object_type, None)
+        ]
+
+
+__all__ = ["LookupCache", "read_lookup_rows"]
@@ -0,0 +1,110 @@
+"""Routine maintenance for the SQLite database file.
+
+The database switches to ``auto_vacuum=INCREMENTAL`` so free pages can be
+returned to the file system in small, bounded steps instead of one long
+``VACUUM``.  Planner statistics are kept current with ``PRAGMA optimize``
+(and a full ``ANALYZE`` when run from the command line).
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of free pages released per maintenance run.
+DEFAULT_VACUUM_PAGES = 1000
+
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+def file_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    """Return page count, free list size and page size of the database."""
+    return {
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+    }
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Switch the file to incremental auto-vacuum.
+
+    Changing the mode of an existing database requires a full ``VACUUM``,
+    which rewrites the file once.  Returns ``True`` when that happened.
+    """
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode == _AUTO_VACUUM_INCREMENTAL:
+        return False
+    logger.info("auto_vacuum wordt omgezet naar INCREMENTAL (volledige VACUUM).")
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+
+def integrity_check(conn: sqlite3.Connection, quick: bool = False) -> list[str]:
+    """Run ``PRAGMA integrity_check`` and return its messages (``["ok"]``)."""
+    pragma = "quick_check" if quick else "integrity_check"
+    return [row[0] for row in conn.execute(f"PRAGMA {pragma}").fetchall()]
+
+
+def run_maintenance(
+    conn: sqlite3.Connection,
+    *,
+    vacuum_pages: int = DEFAULT_VACUUM_PAGES,
+    convert: bool = False,
+    analyze: bool = False,
+    check_integrity: bool = False,
+) -> dict[str, Any]:
+    """Run one bounded maintenance pass and return a report.
+
+    ``convert`` allows the one-time switch to incremental auto-vacuum,
+    ``analyze`` runs a full ``ANALYZE`` and ``check_integrity`` a full
+    ``PRAGMA integrity_check``; all three read or rewrite the whole file and
+    are meant for the command line, not for the idle timer.
+    """
+    started = time.perf_counter()
+    before = file_stats(conn)
+    report: dict[str, Any] = {"before": before, "converted": False}
+
+    if convert:
+        report["converted"] = enable_incremental_vacuum(conn)
+
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == _AUTO_VACUUM_INCREMENTAL:
+        # The pragma frees one page per step and returns no rows, so
+        # ``execute`` would stop after the first page; executescript steps
+        # the statement to completion.
+        conn.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+
+    if analyze:
+        conn.execute("ANALYZE")
+    conn.execute("PRAGMA optimize")
+
+    if check_integrity:
+        report["integrity"] = integrity_check(conn)
+
+    report["after"] = file_stats(conn)
+    report["duration"] = time.perf_counter() - started
+
+    logger.info(
+        "Onderhoud: pagina's %d -> %d, vrije pagina's %d -> %d, duur %.2f s",
+        before["page_count"],
+        report["after"]["page_count"],
+        before["freelist_count"],
+        report["after"]["freelist_count"],
+        report["duration"],
+    )
+    if check_integrity and report["integrity"] != ["ok"]:
+        logger.warning("Integriteitscontrole faalde: %s", report["integrity"])
+    return report
+
+
+__all__ = [
+    "DEFAULT_VACUUM_PAGES",
+    "enable_incremental_vacuum",
+    "file_stats",
+    "integrity_check",
+    "run_maintenance",
+]
@@ -0,0 +1,102 @@
+"""Overlapping assignments of the same medewerker.
+
+A medewerker cannot be on two bijstanden at once.  The check at save time is a
+range query on ``idx_medewerkers_bijstand_medewerker_einde`` (medewerker, end
+time): it seeks to the assignments of that medewerker that end after the new
+start, which are only the recent and planned ones, and keeps those that start
+before the new end (the unary ``+`` keeps SQLite from walking the start index
+instead, which would read the whole history).  The full report sweeps every
+medewerker's assignments in start order.
+
+Periods are half-open: an assignment that ends at 12:00 does not overlap one
+that starts at 12:00.  An assignment without an end time is still running and
+overlaps everything after its start; assignments without a start time are
+skipped.  Open assignments sit at the front of the index (``NULL`` sorts
+first), so the check seeks them separately instead of scanning.
+"""
+from __future__ import annotations
+
+import heapq
+import sqlite3
+from typing import Iterator, Optional, Sequence
+
+from schema import epoch_column
+from search import iso_to_epoch
+
+_START = epoch_column("start_bijstand")
+_EINDE = epoch_column("einde_bijstand")
+
+# Stands in for the end of an assignment that has none.
+_OPEN_END = 2**63 - 1
+
+
+def find_overlaps(
+    conn: sqlite3.Connection,
+    *,
+    medewerkers: Sequence[str],
+    start_bijstand: Optional[str],
+    einde_bijstand: Optional[str],
+    exclude_object_id: Optional[int] = None,
+) -> list[tuple[int, str, str, str]]:
+    """Return ``(object_id, medewerker, start, einde)`` of overlapping assignments."""
+    names = sorted({name for name in medewerkers if name})
+    if not names or not start_bijstand:
+        return []
+    sql = f"""
+        SELECT object_id, medewerker, start_bijstand, einde_bijstand
+        FROM medewerkers_bijstand
+        WHERE medewerker IN ({", ".join("?" * len(names))})
+          AND ({_EINDE} > ? OR {_EINDE} IS NULL)
+          AND +{_START} < ?
+    """
+    params: list = [
+        *names,
+        iso_to_epoch(start_bijstand),
+        iso_to_epoch(einde_bijstand) if einde_bijstand else _OPEN_END,
+    ]
+    if exclude_object_id is not None:
+        sql += " AND object_id != ?"
+        params.append(int(exclude_object_id))
+    sql += f" ORDER BY {_START}, object_id"
+    return [tuple(row) for row in conn.execute(sql, params)]
+
+
+def overlap_report(conn: sqlite3.Connection) -> Iterator[dict]:
+    """Yield every pair of overlapping assignments of the same medewerker."""
+    rows = conn.execute(
+        f"""
+        SELECT medewerker, object_id, {_START}, {_EINDE}, start_bijstand, einde_bijstand
+        FROM medewerkers_bijstand
+        WHERE medewerker IS NOT NULL AND TRIM(medewerker) != ''
+          AND object_id IS NOT NULL
+          AND {_START} IS NOT NULL
+          AND ({_EINDE} > {_START} OR {_EINDE} IS NULL)
+        ORDER BY medewerker, {_START}
+        """
+    )
+    current = None
+    active: list[tuple] = []
+    for medewerker, object_id, start, einde, start_text, einde_text in rows:
+        if medewerker != current:
+            current, active = medewerker, []
+        # Assignments that ended by now cannot overlap this one or later ones.
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for other_einde, other_id, other_start_text, other_einde_text in active:
+            if other_id == object_id:
+                continue
+            yield {
+                "medewerker": medewerker,
+                "object_ids": [other_id, object_id],
+                "perioden": [
+                    [other_start_text, other_einde_text],
+                    [start_text, einde_text],
+                ],
+            }
+        heapq.heappush(
+            active,
+            (_OPEN_END if einde is None else einde, object_id, start_text, einde_text),
+        )
+
+
+__all__ = ["find_overlaps", "overlap_report"]
@@ -0,0 +1,460 @@
+"""Data-layer operations on an open connection.
+
+The functions here do not open, commit or close connections; the caller runs
+them inside ``with conn:``.  The desktop client calls them on its own
+connection, the database service (``service.py``) on the single connection it
+owns.  ``OPERATIONS`` lists the operations by name, together with whether
+they write.
+"""
+from __future__ import annotations
+
+import random
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import archive
+import autocomplete
+import duplicates
+import overlaps
+import schema
+import search
+from config import get_archive_directory
+from lookups import read_lookup_rows
+
+
+_LOOKUPS = {column: (table, fk) for table, column, fk, _scoped in schema.LOOKUP_TABLES}
+ADD_LOOKUP_VALUE_SQL = {
+    column: schema.add_lookup_value_sql(table, "?")
+    for column, (table, _fk) in _LOOKUPS.items()
+}
+
+
+def _column_values(columns: Sequence[str]) -> tuple[list[str], list[str]]:
+    """Return the target columns and the values from ``v`` to store in them.
+
+    Lookup columns are stored in their canonical spelling together with their
+    foreign key, so the lookup triggers need not rewrite the row.
+    """
+    targets: list[str] = []
+    values: list[str] = []
+    for column in columns:
+        if column in _LOOKUPS:
+            table, fk = _LOOKUPS[column]
+            text, key = schema.lookup_value_sql(table, f"v.{column}")
+            targets += [column, fk]
+            values += [text, key]
+        else:
+            targets.append(column)
+            values.append(f"v.{column}")
+    return targets, values
+
+
+def _insert_sql(columns: Sequence[str]) -> str:
+    """Return an ``INSERT INTO objecten`` with one ``?`` per column in *columns*."""
+    targets, values = _column_values(columns)
+    params = ", ".join(f"? AS {column}" for column in columns)
+    return (
+        f"INSERT INTO objecten ({', '.join(targets)}) "
+        f"SELECT {', '.join(values)} FROM (SELECT {params}) AS v"
+    )
+
+
+def _update_sql(columns: Sequence[str]) -> str:
+    """Return an ``UPDATE objecten`` with one ``?`` per column, then the id."""
+    targets, values = _column_values(columns)
+    params = ", ".join(f"? AS {column}" for column in columns)
+    assignments = ", ".join(
+        f"{target} = {value}" for target, value in zip(targets, values)
+    )
+    return (
+        f"UPDATE objecten SET {assignments} "
+        f"FROM (SELECT {params}) AS v WHERE objecten.id = ?"
+    )
+
+
+def _add_lookup_values(conn: sqlite3.Connection, **values: Optional[str]) -> None:
+    """Add new lookup values before the row that uses them is written.
+
+    The row can then be written with its foreign keys at once; otherwise the
+    lookup triggers would have to rewrite it.
+    """
+    for column, value in values.items():
+        if value:
+            conn.execute(ADD_LOOKUP_VALUE_SQL[column], (value,))
+
+
+INSERT_OBJECT_SQL = _insert_sql(
+    ("sin", "type", "subcategorie", "merk", "os", "dienst", "datum_ingave", "unique_id")
+)
+INSERT_BIJSTAND_SQL = _insert_sql(
+    (
+        "sin",
+        "type",
+        "subcategorie",
+        "merk",
+        "os",
+        "dienst",
+        "datum_ingave",
+        "unique_id",
+        "soort_bijstand",
+        "aantal_medewerkers",
+        "start_bijstand",
+        "einde_bijstand",
+    )
+)
+SELECT_MEDEWERKERS_SQL = "SELECT medewerker FROM medewerkers_bijstand WHERE object_id = ?"
+SELECT_SOORT_BIJSTAND_SQL = "SELECT soort_bijstand FROM objecten WHERE id = ?"
+SELECT_RESULT_ROW_SQL = (
+    f"SELECT {', '.join(search.RESULT_COLUMNS)} FROM objecten WHERE id = ?"
+)
+SELECT_SAVED_SQL = (
+    f"SELECT id FROM objecten WHERE {schema.epoch_column('datum_ingave')} = ?"
+    " AND datum_ingave = ? AND unique_id = ? ORDER BY id"
+)
+UPDATE_OBJECT_SQL = _update_sql(
+    (
+        "sin",
+        "type",
+        "subcategorie",
+        "merk",
+        "os",
+        "dienst",
+        "soort_bijstand",
+        "lccu_lid",
+        "datum_in_behandeling",
+        "start_bijstand",
+        "einde_bijstand",
+    )
+)
+DELETE_MEDEWERKERS_SQL = "DELETE FROM medewerkers_bijstand WHERE object_id = ?"
+INSERT_MEDEWERKER_SQL = """
+    INSERT INTO medewerkers_bijstand (
+        object_id,
+        medewerker,
+        start_bijstand,
+        einde_bijstand
+    )
+    VALUES (?, ?, ?, ?)
+"""
+UPDATE_AANTAL_MEDEWERKERS_SQL = "UPDATE objecten SET aantal_medewerkers = ? WHERE id = ?"
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def insert_object(
+    conn: sqlite3.Connection,
+    *,
+    sin: str,
+    object_type: str,
+    subcategorie: str,
+    merk: str,
+    os_value: str,
+    dienst: str,
+    datum_ingave: Optional[str] = None,
+    unique_id: Optional[int] = None,
+) -> int:
+    """Insert an object from the Ingave tab and return its ID."""
+    _add_lookup_values(
+        conn,
+        type=object_type,
+        subcategorie=subcategorie,
+        merk=merk,
+        os=os_value,
+        dienst=dienst,
+    )
+    cursor = conn.execute(
+        INSERT_OBJECT_SQL,
+        (
+            sin,
+            object_type,
+            subcategorie,
+            merk,
+            os_value,
+            dienst,
+            datum_ingave or _now(),
+            unique_id,
+        ),
+    )
+    return cursor.lastrowid
+
+
+def insert_objects(conn: sqlite3.Connection, *, records: Sequence[dict]) -> list[int]:
+    """Insert a batch of objects from the Ingave tab and return their IDs.
+
+    Each record has the keyword arguments of :func:`insert_object`.  The caller
+    runs this in one transaction, so the batch is stored whole or not at all.
+    """
+    return [insert_object(conn, **record) for record in records]
+
+
+def find_saved_objects(
+    conn: sqlite3.Connection, *, records: Sequence[dict]
+) -> Optional[list[int]]:
+    """Return the IDs of *records* if they are all stored already, else ``None``.
+
+    A record is recognised by its ``datum_ingave`` and ``unique_id``, which the
+    forms fill in before the first attempt to save it.  The save queue checks
+    this before it retries a write whose commit may have gone through.
+    """
+    rows: dict[tuple[str, int], list[int]] = {}
+    ids = []
+    for record in records:
+        key = (record.get("datum_ingave"), record.get("unique_id"))
+        if None in key:
+            return None
+        if key not in rows:
+            rows[key] = [
+                row[0]
+                for row in conn.execute(
+                    SELECT_SAVED_SQL, (search.iso_to_epoch(key[0]), *key)
+                )
+            ]
+        if not rows[key]:
+            return None
+        # Records of one batch that share a key were stored in their order.
+        ids.append(rows[key].pop(0))
+    return ids
+
+
+def insert_bijstand_record(
+    conn: sqlite3.Connection,
+    *,
+    soort_bijstand: str,
+    dienst: str,
+    medewerkers: Sequence[str],
+    start_bijstand: Optional[str],
+    einde_bijstand: Optional[str],
+    sin: str = "BIJSTAND",
+    datum_ingave: Optional[str] = None,
+    unique_id: Optional[int] = None,
+) -> int:
+    """Insert a bijstand record with its medewerkers and return the object ID."""
+    if unique_id is None:
+        unique_id = random.randint(1000, 9999)
+    _add_lookup_values(conn, type="Bijstand", dienst=dienst)
+    cursor = conn.execute(
+        INSERT_BIJSTAND_SQL,
+        (
+            sin,
+            "Bijstand",
+            "",
+            "",
+            "",
+            dienst,
+            datum_ingave or _now(),
+            unique_id,
+            soort_bijstand,
+            len(medewerkers),
+            start_bijstand,
+            einde_bijstand,
+        ),
+    )
+    object_id = cursor.lastrowid
+    conn.executemany(
+        INSERT_MEDEWERKER_SQL,
+        [
+            (object_id, medewerker, start_bijstand, einde_bijstand)
+            for medewerker in medewerkers
+        ],
+    )
+    return object_id
+
+
+def update_object(
+    conn: sqlite3.Connection,
+    object_id: int,
+    *,
+    sin: str,
+    object_type: str,
+    subcategorie: str,
+    merk: str,
+    os_value: str,
+    dienst: str,
+    soort_bijstand: str,
+    lccu_lid: str,
+    datum_in_behandeling: Optional[str],
+    start_bijstand: Optional[str],
+    einde_bijstand: Optional[str],
+    is_bijstand: bool = False,
+) -> None:
+    """Update a record from the Bewerken tab.
+
+    The medewerkers of a bijstand record keep their names and take over the
+    new start and end times.
+    """
+    object_id = int(object_id)
+    medewerkers: list[str] = []
+    if is_bijstand:
+        medewerkers = [
+            row[0] for row in conn.execute(SELECT_MEDEWERKERS_SQL, (object_id,))
+        ]
+
+    _add_lookup_values(
+        conn,
+        type=object_type,
+        subcategorie=subcategorie,
+        merk=merk,
+        os=os_value,
+        dienst=dienst,
+    )
+    conn.execute(
+        UPDATE_OBJECT_SQL,
+        (
+            sin,
+            object_type,
+            subcategorie,
+            merk,
+            os_value,
+            dienst,
+            soort_bijstand,
+            lccu_lid,
+            datum_in_behandeling,
+            start_bijstand,
+            einde_bijstand,
+            object_id,
+        ),
+    )
+
+    if is_bijstand:
+        conn.execute(DELETE_MEDEWERKERS_SQL, (object_id,))
+        conn.executemany(
+            INSERT_MEDEWERKER_SQL,
+            [
+                (object_id, medewerker, start_bijstand, einde_bijstand)
+                for medewerker in medewerkers
+            ],
+        )
+        conn.execute(UPDATE_AANTAL_MEDEWERKERS_SQL, (len(medewerkers), object_id))
+
+
+def get_soort_bijstand(conn: sqlite3.Connection, object_id: int) -> Optional[str]:
+    row = conn.execute(SELECT_SOORT_BIJSTAND_SQL, (int(object_id),)).fetchone()
+    return row[0] if row else None
+
+
+def get_result_row(conn: sqlite3.Connection, object_id: int) -> Optional[tuple]:
+    """Return record *object_id* as a search result row, ``None`` if it is gone."""
+    row = conn.execute(SELECT_RESULT_ROW_SQL, (int(object_id),)).fetchone()
+    return tuple(row) if row else None
+
+
+def search_objects(
+    conn: sqlite3.Connection,
+    *,
+    sin: str = "",
+    datum_vanaf: Optional[str] = None,
+    datum_tot: Optional[str] = None,
+    include_datum_ingave: bool = False,
+    include_archief: bool = False,
+    filters: Optional[dict[str, str]] = None,
+    sort: str = "id",
+    descending: bool = False,
+    after: Optional[search.Cursor] = None,
+    limit: int = search.DEFAULT_PAGE_SIZE,
+    archive_dir: Optional[str] = None,
+) -> tuple[list[tuple], Optional[search.Cursor]]:
+    """Return one sorted page of search results and the cursor for the next."""
+    epoch_range = None
+    if datum_vanaf and datum_tot:
+        epoch_range = search.day_range_to_epoch(datum_vanaf, datum_tot)
+    where, params = search.build_where(
+        sin=sin,
+        epoch_range=epoch_range,
+        include_datum_ingave=include_datum_ingave,
+        filters=filters,
+    )
+
+    def schema_groups():
+        yield ["main"]
+        if include_archief:
+            with archive.attached_archive_groups(
+                conn,
+                archive_dir or get_archive_directory(),
+                datum_vanaf if datum_tot else None,
+            ) as groups:
+                yield from groups
+
+    return search.search_page(
+        conn,
+        schema_groups(),
+        where,
+        params,
+        sort=sort,
+        descending=descending,
+        after=tuple(after) if after is not None else None,
+        limit=limit,
+    )
+
+
+def find_duplicate_objects(
+    conn: sqlite3.Connection, **device: str
+) -> list[tuple[int, Optional[str]]]:
+    return duplicates.find_duplicates(conn, **device)
+
+
+def find_overlapping_assignments(
+    conn: sqlite3.Connection,
+    *,
+    start_bijstand: Optional[str],
+    einde_bijstand: Optional[str],
+    medewerkers: Optional[Sequence[str]] = None,
+    object_id: Optional[int] = None,
+) -> list[tuple[int, str, str, str]]:
+    """Return assignments that overlap the given period for the medewerkers.
+
+    Without *medewerkers* the medewerkers of record *object_id* are checked.
+    The assignments of *object_id* itself never count as overlapping.
+    """
+    if medewerkers is None:
+        medewerkers = (
+            [row[0] for row in conn.execute(SELECT_MEDEWERKERS_SQL, (int(object_id),))]
+            if object_id is not None
+            else []
+        )
+    return overlaps.find_overlaps(
+        conn,
+        medewerkers=medewerkers,
+        start_bijstand=start_bijstand,
+        einde_bijstand=einde_bijstand,
+        exclude_object_id=object_id,
+    )
+
+
+class Operation(NamedTuple):
+    func: Callable[..., Any]
+    writes: bool
+
+
+OPERATIONS: dict[str, Operation] = {
+    "search_objects": Operation(search_objects, False),
+    "find_duplicate_objects": Operation(find_duplicate_objects, False),
+    "find_overlapping_assignments": Operation(find_overlapping_assignments, False),
+    "find_saved_objects": Operation(find_saved_objects, False),
+    "get_soort_bijstand": Operation(get_soort_bijstand, False),
+    "get_result_row": Operation(get_result_row, False),
+    "lookup_rows": Operation(read_lookup_rows, False),
+    "suggestion_rows": Operation(autocomplete.read_suggestion_rows, False),
+    "insert_object": Operation(insert_object, True),
+    "insert_objects": Operation(insert_objects, True),
+    "insert_bijstand_record": Operation(insert_bijstand_record, True),
+    "update_object": Operation(update_object, True),
+}
+
+
+__all__ = [
+    "OPERATIONS",
+    "Operation",
+    "find_duplicate_objects",
+    "find_overlapping_assignments",
+    "find_saved_objects",
+    "get_result_row",
+    "get_soort_bijstand",
+    "insert_bijstand_record",
+    "insert_object",
+    "insert_objects",
+    "search_objects",
+    "update_object",
+]
@@ -0,0 +1,572 @@
+"""Schema additions that are applied on top of the base tables.
+
+The base tables are created in ``LCCU Database.py``.  The helpers here take a
+connection and a schema name, so they can be applied to the live database as
+well as to attached archive databases.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+import string
+from collections import Counter
+
+# Text timestamp columns that get an integer epoch companion column.
+TIMESTAMP_COLUMNS: dict[str, tuple[str, ...]] = {
+    "objecten": (
+        "datum_ingave",
+        "datum_in_behandeling",
+        "start_bijstand",
+        "einde_bijstand",
+    ),
+    "medewerkers_bijstand": ("start_bijstand", "einde_bijstand"),
+}
+
+
+# Lookup tables for the dictionary-encoded columns of ``objecten``:
+# (lookup table, text column, foreign key column, scoped per type).
+LOOKUP_TABLES: tuple[tuple[str, str, str, bool], ...] = (
+    ("types", "type", "type_id", False),
+    ("subcategorieen", "subcategorie", "subcategorie_id", True),
+    ("merken", "merk", "merk_id", False),
+    ("besturingssystemen", "os", "os_id", True),
+    ("diensten", "dienst", "dienst_id", False),
+)
+
+# Initial contents of the lookup tables, in display order.  The second item
+# is the type a value is offered for; ``None`` means every type that has its
+# own values (used for "Andere").
+LOOKUP_SEEDS: dict[str, list[tuple[str, str | None]]] = {
+    "types": [("Mobile", None), ("Computer", None), ("Bijstand", None)],
+    "subcategorieen": [
+        ("GSM", "Mobile"),
+        ("Tablet", "Mobile"),
+        ("Sim", "Mobile"),
+        ("SD-kaart", "Mobile"),
+        ("USB-drive", "Mobile"),
+        ("Laptop", "Computer"),
+        ("Desktop", "Computer"),
+        ("Losse HD", "Computer"),
+        ("Andere", None),
+    ],
+    "merken": [],
+    "besturingssystemen": [
+        ("Android", "Mobile"),
+        ("GrapheneOS", "Mobile"),
+        ("iOS", "Mobile"),
+        ("Windows", "Computer"),
+        ("Linux", "Computer"),
+        ("MacOS", "Computer"),
+        ("Chromebook", "Computer"),
+        ("Andere", None),
+    ],
+    "diensten": [
+        (naam, None)
+        for naam in (
+            "DOT",
+            "FGP",
+            "GOK",
+            "GOUDI",
+            "INTEL",
+            "InternToezicht",
+            "ISRA",
+            "LR/DGV",
+            "LR/DGWLD",
+            "LR/DRUGS",
+            "LR/ECOFIN",
+            "LR/EIG",
+            "LR/GWLD",
+            "LR/IFG",
+            "LR/JCRIM",
+            "LR/JEUGD",
+            "LR/LM",
+            "LR/PERS",
+            "LR/PERS/DGV",
+            "LR/RESID",
+            "LR/RIF",
+            "LR/VERDW",
+            "LR/ZEDEN",
+            "ORIDA",
+            "PTA",
+            "VERKEER",
+            "WIJK Centrum",
+            "WIJK City",
+            "WIJK Noord",
+            "WIJK Oost",
+            "WIJK West",
+            "WIJK Zuid",
+            "WOT Centrum",
+            "WOT City",
+            "WOT Noord",
+            "WOT Oost",
+            "WOT West",
+            "WOT Zuid",
+        )
+    ],
+}
+
+
+def epoch_column(column: str) -> str:
+    """Return the name of the integer column that mirrors *column*."""
+    return f"{column}_epoch"
+
+
+def table_columns(
+    conn: sqlite3.Connection, table: str, schema: str = "main"
+) -> set[str]:
+    """Return all column names of *table*, including generated columns."""
+    return {
+        row[1] for row in conn.execute(f"PRAGMA {schema}.table_xinfo({table})")
+    }
+
+
+def unnormalized_timestamp_condition(column: str) -> str:
+    """Return the condition for values of *column* that still need rewriting.
+
+    Normalised values are 19 characters long and have an epoch value.
+    """
+    return (
+        f"{column} IS NOT NULL AND TRIM({column}) != '' "
+        f"AND ({epoch_column(column)} IS NULL OR length({column}) != 19)"
+    )
+
+
+def ensure_timestamp_columns(
+    conn: sqlite3.Connection, schema: str = "main"
+) -> None:
+    """Add indexed epoch-second columns next to the text timestamps.
+
+    The columns are generated from the ISO text (``YYYY-MM-DD HH:MM[:SS]``), so
+    every client keeps them current without extra code.  Values that are not in
+    ISO format yield ``NULL``; ``normalize_datetime_fields`` rewrites those.
+    The stored times are local times, and so are the epoch values: they count
+    the seconds since 1970-01-01 00:00 of the same wall clock.
+    """
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        existing = table_columns(conn, table, schema)
+        for column in columns:
+            target = epoch_column(column)
+            if target not in existing:
+                conn.execute(
+                    f"""
+                    ALTER TABLE {schema}.{table} ADD COLUMN {target} INTEGER
+                    GENERATED ALWAYS AS (CAST(strftime('%s', {column}) AS INTEGER)) VIRTUAL
+                    """
+                )
+            conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_{target}
+                ON {table} ({target})
+                """
+            )
+            # Partial index that only holds the rows still to be normalised,
+            # so the check at every start-up does not read the whole table.
+            conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_{column}_unnormalized
+                ON {table} (id) WHERE {unnormalized_timestamp_condition(column)}
+                """
+            )
+
+
+# Columns of ``objecten`` that the search results can be sorted on.  An index
+# on the column alone is enough: it ends in the rowid, which is the tie-breaker
+# of the sort, and SQLite walks it in either direction.
+SORT_INDEX_COLUMNS: tuple[str, ...] = (
+    "sin",
+    "type",
+    "subcategorie",
+    "merk",
+    "os",
+    "dienst",
+    "lccu_lid",
+)
+
+
+# Indexes for combined search filters.  The equality columns come first,
+# most selective first; a subcategorie already implies the type.
+FILTER_INDEXES: dict[str, tuple[str, ...]] = {
+    "idx_objecten_dienst_subcategorie_os": ("dienst", "subcategorie", "os"),
+    "idx_objecten_subcategorie_os_merk": ("subcategorie", "os", "merk"),
+    "idx_objecten_soort_bijstand": ("soort_bijstand",),
+    # ``LIKE 'ABCD%'`` ignores case, so only a NOCASE index can answer it.
+    "idx_objecten_sin_nocase": ("sin COLLATE NOCASE",),
+}
+
+
+def ensure_search_indexes(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Create the indexes that the search sorts and filters use."""
+    indexes = {f"idx_objecten_{column}": (column,) for column in SORT_INDEX_COLUMNS}
+    indexes.update(FILTER_INDEXES)
+    for name, columns in indexes.items():
+        conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {schema}.{name}
+            ON objecten ({", ".join(columns)})
+            """
+        )
+
+
+def ensure_overlap_index(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Create the index of the overlap check (see ``overlaps.find_overlaps``)."""
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS {schema}.idx_medewerkers_bijstand_medewerker_einde
+        ON medewerkers_bijstand (medewerker, {epoch_column("einde_bijstand")})
+        """
+    )
+
+
+# Columns that identify a device; see ``fingerprint_sql``.
+FINGERPRINT_COLUMNS: tuple[str, ...] = ("sin", "type", "subcategorie", "merk", "os")
+
+
+def fingerprint_sql(*args: str) -> str:
+    """Return the SQL expression that fingerprints a device.
+
+    *args* are SQL expressions for the ``FINGERPRINT_COLUMNS`` (column names
+    or ``?`` placeholders), so the generated column and the lookups share one
+    definition.  Bijstand records have no device and get ``NULL``.
+    """
+    sin, *others = args
+    parts = [f"upper(trim({sin}))"] + [
+        f"lower(trim(coalesce({expression}, '')))" for expression in others
+    ]
+    joined = " || '|' || ".join(parts)
+    return f"CASE WHEN upper(trim({sin})) = 'BIJSTAND' THEN NULL ELSE {joined} END"
+
+
+def ensure_fingerprint_column(conn: sqlite3.Connection, schema: str = "main") -> None:
+    """Add the indexed ``fingerprint`` column used for duplicate detection."""
+    if "fingerprint" not in table_columns(conn, "objecten", schema):
+        conn.execute(
+            f"""
+            ALTER TABLE {schema}.objecten ADD COLUMN fingerprint TEXT
+            GENERATED ALWAYS AS ({fingerprint_sql(*FINGERPRINT_COLUMNS)}) VIRTUAL
+            """
+        )
+    conn.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS {schema}.idx_objecten_fingerprint
+        ON objecten (fingerprint)
+        """
+    )
+
+
+# Lookup names have their runs of white space collapsed to one space and are
+# trimmed; ``lookup_name`` and ``lookup_name_sql`` must give the same result.
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]+")
+# ``COLLATE NOCASE`` only folds ASCII letters.
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def lookup_name(value: str) -> str:
+    """Return *value* as it is stored in a lookup table."""
+    return _WHITESPACE_RE.sub(" ", value).strip(" ")
+
+
+def lookup_name_sql(expression: str) -> str:
+    """Return the SQL for ``lookup_name(expression)``."""
+    spaced = expression
+    for code in (9, 10, 13):
+        spaced = f"replace({spaced}, char({code}), ' ')"
+    # Every space becomes char(1) char(2); removing each char(2) char(1)
+    # leaves one pair per run, which becomes a single space again.
+    collapsed = (
+        f"replace(replace(replace({spaced}, ' ', char(1) || char(2)), "
+        "char(2) || char(1), ''), char(1) || char(2), ' ')"
+    )
+    return f"trim({collapsed})"
+
+
+def lookup_value_sql(table: str, expression: str) -> tuple[str, str]:
+    """Return SQL for the canonical text and the id of *expression* in *table*.
+
+    The text is the spelling in the lookup table, or *expression* itself when
+    the table does not have it (yet); the id is then ``NULL``.
+    """
+    name = lookup_name_sql(expression)
+    return (
+        f"COALESCE((SELECT naam FROM {table} WHERE naam = {name}), {expression})",
+        f"(SELECT id FROM {table} WHERE naam = {name})",
+    )
+
+
+def _lookup_key(value: str) -> str:
+    return lookup_name(value).translate(_NOCASE)
+
+
+def _create_lookup_tables(conn: sqlite3.Connection) -> None:
+    for table, _column, _fk, scoped in LOOKUP_TABLES:
+        type_column = (
+            "type_id INTEGER REFERENCES types(id)," if scoped else ""
+        )
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                naam TEXT NOT NULL UNIQUE COLLATE NOCASE,
+                {type_column}
+                volgorde INTEGER NOT NULL DEFAULT 0,
+                actief INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+    for table, _column, _fk, scoped in LOOKUP_TABLES:
+        for volgorde, (naam, type_naam) in enumerate(LOOKUP_SEEDS[table]):
+            if scoped:
+                conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO {table} (naam, type_id, volgorde)
+                    VALUES (?, (SELECT id FROM types WHERE naam = ?), ?)
+                    """,
+                    (naam, type_naam, volgorde),
+                )
+            else:
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {table} (naam, volgorde) VALUES (?, ?)",
+                    (naam, volgorde),
+                )
+
+
+def _migrate_lookup_column(
+    conn: sqlite3.Connection, table: str, column: str, fk: str
+) -> None:
+    """Store ``objecten.<column>`` in one canonical spelling with its foreign key.
+
+    Values that only differ in case or white space are one value.  The
+    canonical spelling is the one already in the lookup table, otherwise the
+    most frequent variant.  The rows are rewritten by a single ``UPDATE``.
+    """
+    known = {
+        _lookup_key(row[0]): row[0]
+        for row in conn.execute(f"SELECT naam FROM {table}")
+    }
+    groups: dict[str, Counter] = {}
+    for value, count in conn.execute(
+        f"""
+        SELECT {column}, COUNT(*) FROM objecten
+        WHERE {column} IS NOT NULL AND TRIM({column}) != ''
+        GROUP BY {column}
+        """
+    ):
+        groups.setdefault(_lookup_key(value), Counter())[value] += count
+
+    spellings = []
+    for key, variants in groups.items():
+        canonical = known.get(key)
+        if canonical is None:
+            canonical = lookup_name(variants.most_common(1)[0][0])
+            conn.execute(
+                f"INSERT INTO {table} (naam, actief) VALUES (?, 0)", (canonical,)
+            )
+        spellings += [(variant, canonical) for variant in variants]
+
+    conn.execute(
+        "CREATE TEMP TABLE lookup_spellings (variant TEXT PRIMARY KEY, naam TEXT)"
+    )
+    try:
+        conn.executemany("INSERT INTO temp.lookup_spellings VALUES (?, ?)", spellings)
+        conn.execute(
+            f"""
+            UPDATE objecten SET {column} = s.naam, {fk} = t.id
+            FROM temp.lookup_spellings AS s JOIN {table} AS t ON t.naam = s.naam
+            WHERE objecten.{column} = s.variant
+            """
+        )
+    finally:
+        conn.execute("DROP TABLE temp.lookup_spellings")
+
+
+def add_lookup_value_sql(table: str, expression: str) -> str:
+    """Return SQL that adds *expression* to *table* as an inactive entry.
+
+    Empty values and values the table already has are left out.
+    """
+    return (
+        f"INSERT OR IGNORE INTO {table} (naam, actief) "
+        f"SELECT naam, 0 FROM (SELECT {lookup_name_sql(expression)} AS naam) "
+        "WHERE COALESCE(naam, '') != ''"
+    )
+
+
+def _lookup_triggers() -> dict[str, str]:
+    inserts = []
+    assignments = []
+    mismatches = []
+    for table, column, fk, _scoped in LOOKUP_TABLES:
+        text, key = lookup_value_sql(table, f"NEW.{column}")
+        inserts.append(add_lookup_value_sql(table, f"NEW.{column}") + ";")
+        assignments.append(f"{column} = {text}, {fk} = {key}")
+        mismatches.append(f"NEW.{column} IS NOT {text} OR NEW.{fk} IS NOT {key}")
+    add_values = " ".join(inserts)
+    fix_row = (
+        f"WHEN {' OR '.join(mismatches)} BEGIN "
+        f"UPDATE objecten SET {', '.join(assignments)} WHERE id = NEW.id; END"
+    )
+    text_columns = ", ".join(column for _table, column, _fk, _scoped in LOOKUP_TABLES)
+    return {
+        "trg_objecten_lookups_add_insert": (
+            "CREATE TRIGGER trg_objecten_lookups_add_insert BEFORE INSERT ON objecten "
+            f"BEGIN {add_values} END"
+        ),
+        "trg_objecten_lookups_add_update": (
+            "CREATE TRIGGER trg_objecten_lookups_add_update "
+            f"BEFORE UPDATE OF {text_columns} ON objecten BEGIN {add_values} END"
+        ),
+        "trg_objecten_lookups_insert": (
+            f"CREATE TRIGGER trg_objecten_lookups_insert AFTER INSERT ON objecten {fix_row}"
+        ),
+        "trg_objecten_lookups_update": (
+            "CREATE TRIGGER trg_objecten_lookups_update "
+            f"AFTER UPDATE OF {text_columns} ON objecten {fix_row}"
+        ),
+    }
+
+
+def _create_lookup_triggers(conn: sqlite3.Connection) -> None:
+    """Keep the foreign keys and spelling current for every client.
+
+    New values are added to the lookup table as inactive entries before the
+    row is written, so they do not appear in the dropdowns until someone
+    activates them.  A trigger cannot change the row it fires for before it
+    is written, so a row whose text or foreign key does not match the lookup
+    table is corrected afterwards.  This application adds the values first
+    (``add_lookup_value_sql``) and writes the keys itself, so its rows match
+    and are written once; only older clients need the correction.
+    """
+    existing = dict(
+        conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+    )
+    for name, sql in _lookup_triggers().items():
+        if existing.get(name) != sql:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            conn.execute(sql)
+
+
+def ensure_lookup_tables(conn: sqlite3.Connection) -> None:
+    """Create the lookup tables and migrate ``objecten`` onto them.
+
+    The first run deduplicates the existing text values and fills the integer
+    foreign keys.  The text columns stay in place for older clients that still
+    share the database; triggers keep both representations in step.
+    """
+    _create_lookup_tables(conn)
+    existing = table_columns(conn, "objecten")
+    if "dienst_id" not in existing:
+        for table, column, fk, _scoped in LOOKUP_TABLES:
+            conn.execute(
+                f"ALTER TABLE objecten ADD COLUMN {fk} INTEGER REFERENCES {table}(id)"
+            )
+            _migrate_lookup_column(conn, table, column, fk)
+    _create_lookup_triggers(conn)
+
+
+# Tables whose changes are recorded in ``changelog`` (see ``changelog.py``).
+CHANGELOG_TABLES: tuple[str, ...] = ("objecten", "medewerkers_bijstand")
+
+
+def changelog_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Return the columns of *table* whose changes are recorded.
+
+    Generated columns and the lookup foreign keys follow from other columns,
+    so they are left out.
+    """
+    derived = {fk for _table, _column, fk, _scoped in LOOKUP_TABLES}
+    return [
+        row[1]
+        for row in conn.execute(f"PRAGMA main.table_xinfo({table})")
+        # Column 6 ("hidden") is 2 or 3 for generated columns.
+        if row[6] == 0 and row[1] not in derived
+    ]
+
+
+def _changelog_triggers(table: str, columns: list[str]) -> dict[str, str]:
+    changed = " || ".join(
+        f"CASE WHEN OLD.{column} IS NOT NEW.{column} THEN '{column},' ELSE '' END"
+        for column in columns
+    )
+    any_changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+    insert = (
+        "INSERT INTO changelog (table_name, operation, row_id, changed_columns) "
+        "VALUES ('{table}', '{operation}', {row}.id, {columns});"
+    )
+    return {
+        f"trg_{table}_changelog_insert": (
+            f"CREATE TRIGGER trg_{table}_changelog_insert AFTER INSERT ON {table} "
+            "BEGIN "
+            + insert.format(
+                table=table, operation="INSERT", row="NEW", columns=f"'{','.join(columns)}'"
+            )
+            + " END"
+        ),
+        f"trg_{table}_changelog_update": (
+            f"CREATE TRIGGER trg_{table}_changelog_update AFTER UPDATE ON {table} "
+            f"WHEN {any_changed} BEGIN "
+            + insert.format(
+                table=table, operation="UPDATE", row="NEW", columns=f"rtrim({changed}, ',')"
+            )
+            + " END"
+        ),
+        f"trg_{table}_changelog_delete": (
+            f"CREATE TRIGGER trg_{table}_changelog_delete AFTER DELETE ON {table} "
+            "BEGIN "
+            + insert.format(table=table, operation="DELETE", row="OLD", columns="NULL")
+            + " END"
+        ),
+    }
+
+
+def ensure_changelog(conn: sqlite3.Connection) -> None:
+    """Create the ``changelog`` table and the triggers that fill it.
+
+    ``seq`` is an ``AUTOINCREMENT`` key, so it keeps increasing after old
+    entries are removed.  The triggers list the columns they compare; they
+    are recreated when a column has been added since.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS changelog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            row_id INTEGER,
+            changed_columns TEXT,
+            changed_at TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """
+    )
+    existing = dict(
+        conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+    )
+    for table in CHANGELOG_TABLES:
+        for name, sql in _changelog_triggers(table, changelog_columns(conn, table)).items():
+            if existing.get(name) != sql:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(sql)
+
+
+__all__ = [
+    "CHANGELOG_TABLES",
+    "FILTER_INDEXES",
+    "FINGERPRINT_COLUMNS",
+    "LOOKUP_SEEDS",
+    "LOOKUP_TABLES",
+    "SORT_INDEX_COLUMNS",
+    "TIMESTAMP_COLUMNS",
+    "add_lookup_value_sql",
+    "changelog_columns",
+    "ensure_changelog",
+    "ensure_fingerprint_column",
+    "ensure_lookup_tables",
+    "ensure_overlap_index",
+    "ensure_search_indexes",
+    "ensure_timestamp_columns",
+    "epoch_column",
+    "fingerprint_sql",
+    "lookup_name",
+    "lookup_name_sql",
+    "lookup_value_sql",
+    "table_columns",
+    "unnormalized_timestamp_condition",
+]
@@ -0,0 +1,294 @@
+"""Queries for the "Zoeken" tab.
+
+Results are sorted in SQL and read one page at a time with keyset pagination:
+a page continues after the sort value and id of the last row of the previous
+page instead of skipping an ``OFFSET``.  Every page therefore costs about the
+same, and with an index on the sort column SQLite walks the index instead of
+sorting the whole result.
+"""
+from __future__ import annotations
+
+import calendar
+import heapq
+import re
+import sqlite3
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from schema import TIMESTAMP_COLUMNS, epoch_column
+
+RESULT_COLUMNS: tuple[str, ...] = (
+    "id",
+    "sin",
+    "type",
+    "subcategorie",
+    "merk",
+    "os",
+    "dienst",
+    "lccu_lid",
+    "datum_in_behandeling",
+    "start_bijstand",
+    "einde_bijstand",
+)
+
+# Column that each result column is sorted on; timestamps sort on their
+# indexed epoch column.
+SORT_COLUMNS: dict[str, str] = {
+    column: epoch_column(column) if column in TIMESTAMP_COLUMNS["objecten"] else column
+    for column in RESULT_COLUMNS
+}
+
+DEFAULT_PAGE_SIZE = 500
+
+# (sort value, id) of the last row of a page.
+Cursor = tuple[Any, int]
+
+
+# Columns that can be filtered on an exact value.
+FILTER_COLUMNS: tuple[str, ...] = (
+    "type",
+    "subcategorie",
+    "merk",
+    "os",
+    "dienst",
+    "lccu_lid",
+    "soort_bijstand",
+)
+
+# The date filter matches a record when any of these falls in the range.
+DATE_FILTER_COLUMNS: tuple[str, ...] = (
+    "datum_in_behandeling",
+    "start_bijstand",
+    "einde_bijstand",
+)
+
+
+def iso_to_epoch(value: str) -> int:
+    """Return the epoch seconds of an ISO timestamp, as SQLite's ``strftime('%s')``."""
+    return calendar.timegm(datetime.fromisoformat(value).timetuple())
+
+
+def day_range_to_epoch(datum_vanaf: str, datum_tot: str) -> tuple[int, int]:
+    """Return the first and last second of an inclusive ISO date range."""
+    return iso_to_epoch(datum_vanaf), iso_to_epoch(datum_tot) + 24 * 60 * 60 - 1
+
+
+# Input that can only match the start of a valid SIN (four letters, then digits).
+_SIN_PREFIX = re.compile(r"[A-Z]{4}[0-9]*")
+
+
+class QueryBuilder:
+    """Collects the ``WHERE`` predicates of a search over ``objecten o``.
+
+    Every predicate compares a bare column with parameters -- equality, a
+    ``BETWEEN`` or a ``LIKE 'x%'`` prefix -- so SQLite can answer it from an
+    index instead of evaluating an expression for every row; only
+    :meth:`contains` needs a scan.  Empty values add no predicate.
+    """
+
+    def __init__(self) -> None:
+        self._conditions: list[str] = []
+        self.params: list[Any] = []
+
+    def equals(self, column: str, value: Any) -> "QueryBuilder":
+        if value not in (None, ""):
+            self._conditions.append(f"o.{column} = ?")
+            self.params.append(value)
+        return self
+
+    def prefix(self, column: str, prefix: str) -> "QueryBuilder":
+        """Match *column* starting with *prefix*, ignoring ASCII case.
+
+        SQLite only answers this from a ``COLLATE NOCASE`` index on *column*,
+        and only when *prefix* holds no ``%`` or ``_``.
+        """
+        if prefix:
+            self._conditions.append(f"o.{column} LIKE ?")
+            self.params.append(f"{prefix}%")
+        return self
+
+    def contains(self, column: str, text: str) -> "QueryBuilder":
+        """Match *text* anywhere in *column*; this scans, unlike :meth:`prefix`."""
+        if text:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            self._conditions.append(f"o.{column} LIKE ? ESCAPE '\\'")
+            self.params.append(f"%{escaped}%")
+        return self
+
+    def any_between(
+        self, columns: Sequence[str], low: Any, high: Any
+    ) -> "QueryBuilder":
+        """Match rows where at least one of *columns* lies in ``low..high``."""
+        conditions = []
+        for column in columns:
+            conditions.append(f"o.{column} BETWEEN ? AND ?")
+            self.params.extend([low, high])
+        self._conditions.append("(" + " OR ".join(conditions) + ")")
+        return self
+
+    def build(self) -> tuple[str, list[Any]]:
+        return " AND ".join(self._conditions) or "1=1", list(self.params)
+
+
+def build_where(
+    *,
+    sin: str = "",
+    epoch_range: Optional[tuple[int, int]] = None,
+    include_datum_ingave: bool = False,
+    filters: Optional[dict[str, str]] = None,
+) -> tuple[str, list[Any]]:
+    """Return the ``WHERE`` condition and parameters for the search filters.
+
+    *sin* matches SINs that contain it.  Four letters and any digits can only
+    match the start of a SIN, so that input is looked up as a prefix in the
+    ``idx_objecten_sin_nocase`` index instead of scanning every row.
+    *filters* maps columns from ``FILTER_COLUMNS`` to the exact value they
+    must have.
+    """
+    sin = sin.strip().upper()
+    builder = QueryBuilder()
+    if _SIN_PREFIX.fullmatch(sin):
+        builder.prefix("sin", sin)
+    else:
+        builder.contains("sin", sin)
+
+    for column, value in (filters or {}).items():
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Onbekende filterkolom: {column}")
+        builder.equals(column, value.strip())
+
+    if epoch_range is not None:
+        columns = list(DATE_FILTER_COLUMNS)
+        if include_datum_ingave:
+            columns.insert(0, "datum_ingave")
+        builder.any_between([epoch_column(column) for column in columns], *epoch_range)
+
+    return builder.build()
+
+
+def _keyset_ranges(
+    sort_column: str, descending: bool, after: Optional[Cursor]
+) -> list[tuple[str, list[Any]]]:
+    """Return the conditions for the rows that follow *after*, in sort order.
+
+    SQLite sorts ``NULL`` first in ascending and last in descending order, and
+    row values cannot compare ``NULL``.  Rows on the other side of the
+    ``NULL`` boundary therefore get their own condition, so that each one is
+    a single range of the index.
+    """
+    if after is None:
+        return [("", [])]
+    value, last_id = after
+    if sort_column == "id":
+        return [("o.id < ?" if descending else "o.id > ?", [last_id])]
+    column = f"o.{sort_column}"
+    if not descending:
+        if value is None:
+            return [
+                (f"{column} IS NULL AND o.id > ?", [last_id]),
+                (f"{column} IS NOT NULL", []),
+            ]
+        return [(f"({column}, o.id) > (?, ?)", [value, last_id])]
+    if value is None:
+        return [(f"{column} IS NULL AND o.id < ?", [last_id])]
+    return [
+        (f"({column}, o.id) < (?, ?)", [value, last_id]),
+        (f"{column} IS NULL", []),
+    ]
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    schemas: Sequence[str],
+    where: str,
+    params: Sequence[Any],
+    *,
+    sort: str = "id",
+    descending: bool = False,
+    after: Optional[Cursor] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> list[tuple]:
+    """Return one sorted page from the ``objecten`` tables in *schemas*.
+
+    Each row ends with its sort value, which the cursor is built from.
+    """
+    sort_column = SORT_COLUMNS[sort]
+    columns = ", ".join(f"o.{column}" for column in RESULT_COLUMNS)
+    direction = "DESC" if descending else "ASC"
+
+    rows: list[tuple] = []
+    for keyset, keyset_params in _keyset_ranges(sort_column, descending, after):
+        condition = f"{where} AND {keyset}" if keyset else where
+        selects = [
+            f"SELECT {columns}, o.{sort_column} AS sort_key "
+            f"FROM {schema}.objecten o WHERE {condition}"
+            for schema in schemas
+        ]
+        sql = (
+            " UNION ALL ".join(selects)
+            + f" ORDER BY sort_key {direction}, id {direction} LIMIT ?"
+        )
+        rows += conn.execute(
+            sql,
+            (list(params) + keyset_params) * len(schemas) + [limit - len(rows)],
+        ).fetchall()
+        if len(rows) >= limit:
+            break
+    return rows
+
+
+def _row_key(row: tuple) -> tuple:
+    value = row[-1]
+    return (value is not None, value, row[0])
+
+
+def search_page(
+    conn: sqlite3.Connection,
+    schema_groups: Iterable[Sequence[str]],
+    where: str,
+    params: Sequence[Any],
+    *,
+    sort: str = "id",
+    descending: bool = False,
+    after: Optional[Cursor] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[tuple], Optional[Cursor]]:
+    """Return a page over several groups of schemas and the cursor for the next.
+
+    Every group is queried for a full page and merged into the best *limit*
+    rows so far, so memory stays bounded by the page size.  The cursor is
+    ``None`` when there are no more rows.
+    """
+    rows: list[tuple] = []
+    for schemas in schema_groups:
+        page = fetch_page(
+            conn,
+            schemas,
+            where,
+            params,
+            sort=sort,
+            descending=descending,
+            after=after,
+            limit=limit,
+        )
+        rows = list(heapq.merge(rows, page, key=_row_key, reverse=descending))[
+            :limit
+        ]
+    cursor = (rows[-1][-1], rows[-1][0]) if len(rows) == limit else None
+    return [row[:-1] for row in rows], cursor
+
+
+__all__ = [
+    "Cursor",
+    "DATE_FILTER_COLUMNS",
+    "DEFAULT_PAGE_SIZE",
+    "FILTER_COLUMNS",
+    "QueryBuilder",
+    "RESULT_COLUMNS",
+    "SORT_COLUMNS",
+    "build_where",
+    "day_range_to_epoch",
+    "fetch_page",
+    "iso_to_epoch",
+    "search_page",
+]
@@ -0,0 +1,269 @@
+"""Small HTTP/JSON service that owns the database connection.
+
+Instead of every workstation opening ``objecten.db`` over the file share, one
+machine runs ``python "LCCU Database.py" serve`` and the desktop clients set
+``LCCU_SERVICE_URL``.  The service keeps a single connection, used by a single
+thread, so all clients share one warm page cache and there is exactly one
+writer:
+
+* writes run one at a time, each in its own transaction;
+* reads that queue up while the connection is busy are run together in one
+  hand-off to the database thread.
+
+Requests are ``POST /api/<operation>`` with the keyword arguments of the
+operation (see ``repository.OPERATIONS``) as a JSON object; the response is
+``{"result": ...}`` or ``{"error": ..., "type": ...}``.  ``GET /health``
+reports whether the service is up.  When ``LCCU_SERVICE_TOKEN`` is set, every
+request must carry it in the ``X-LCCU-Token`` header; the service only listens
+on other addresses than the loopback interface with a token.
+"""
+from __future__ import annotations
+
+import asyncio
+import collections
+import ipaddress
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from repository import OPERATIONS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Most reads that are handed to the database thread at once.
+MAX_READ_BATCH = 32
+
+# Largest request body that is accepted.
+MAX_BODY_BYTES = 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class DatabaseService:
+    """Serialises operations onto one connection; see the module docstring."""
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        token: Optional[str] = None,
+        max_read_batch: int = MAX_READ_BATCH,
+    ) -> None:
+        self.db_path = db_path
+        self._token = token
+        self._max_read_batch = max_read_batch
+        # One thread, so the connection is only ever used from that thread.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: collections.deque = collections.deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        # Number of hand-offs to the database thread and operations run.
+        self.batches = 0
+        self.operations = 0
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        if self._token is None and not _is_loopback(host):
+            raise ValueError(
+                f"De service luistert niet op {host or 'alle adressen'} zonder "
+                "token; stel LCCU_SERVICE_TOKEN in."
+            )
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._open)
+        self._wakeup = asyncio.Event()
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.db_path)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def call(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Queue operation *name* and return its result."""
+        if name not in OPERATIONS:
+            raise KeyError(name)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((name, arguments, future))
+        self._wakeup.set()
+        return await future
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                batch = [self._pending.popleft()]
+                if not OPERATIONS[batch[0][0]].writes:
+                    # Later reads join, up to the first queued write.
+                    while (
+                        self._pending
+                        and len(batch) < self._max_read_batch
+                        and not OPERATIONS[self._pending[0][0]].writes
+                    ):
+                        batch.append(self._pending.popleft())
+                calls = [(name, arguments) for name, arguments, _future in batch]
+                results = await loop.run_in_executor(
+                    self._executor, self._run_batch, calls
+                )
+                for (_name, _arguments, future), (ok, value) in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+
+    def _run_batch(self, calls: list[tuple[str, dict]]) -> list[tuple[bool, Any]]:
+        """Run *calls* on the database thread; one result per call."""
+        self.batches += 1
+        results = []
+        for name, arguments in calls:
+            operation = OPERATIONS[name]
+            try:
+                if operation.writes:
+                    with self._conn:
+                        value = operation.func(self._conn, **arguments)
+                else:
+                    value = operation.func(self._conn, **arguments)
+                results.append((True, value))
+            except Exception as exc:  # handed back to the waiting request
+                results.append((False, exc))
+            self.operations += 1
+        return results
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            status, payload = await self._respond(reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as exc:
+            status, payload = 400, {"error": str(exc), "type": "ValueError"}
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("ascii")
+            + body
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> tuple[int, dict]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        method, path, _version = request_line.split(" ", 2)
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            key, _sep, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        if self._token is not None and headers.get("x-lccu-token") != self._token:
+            return 401, {"error": "Ongeldig of ontbrekend token.", "type": "PermissionError"}
+
+        if method == "GET" and path == "/health":
+            return 200, {"result": {"status": "ok", "database": self.db_path}}
+
+        name = path[len("/api/"):] if path.startswith("/api/") else ""
+        if method != "POST" or name not in OPERATIONS:
+            return 404, {"error": f"Onbekende aanvraag: {method} {path}", "type": "KeyError"}
+
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY_BYTES:
+            return 413, {"error": "Aanvraag te groot.", "type": "ValueError"}
+        arguments = json.loads(await reader.readexactly(length) or b"{}")
+        if not isinstance(arguments, dict):
+            return 400, {"error": "Verwacht een JSON-object.", "type": "ValueError"}
+
+        try:
+            return 200, {"result": await self.call(name, arguments)}
+        except (TypeError, ValueError) as exc:
+            return 400, {"error": str(exc), "type": "ValueError"}
+        except sqlite3.Error as exc:
+            logger.warning("Databasefout in %s: %s", name, exc)
+            return 500, {"error": str(exc), "type": "DatabaseError"}
+        except Exception as exc:
+            logger.exception("Onverwachte fout in %s", name)
+            return 500, {"error": str(exc), "type": type(exc).__name__}
+
+
+async def _serve_forever(service: DatabaseService, host: str, port: int) -> None:
+    server = await service.start(host, port)
+    logger.info("Databaseservice voor %s luistert op %s:%d", service.db_path, host, service.port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def serve(
+    db_path: str,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    token: Optional[str] = None,
+) -> None:
+    """Run the service until interrupted."""
+    service = DatabaseService(db_path, token=token)
+    try:
+        asyncio.run(_serve_forever(service, host, port))
+    except KeyboardInterrupt:
+        logger.info("Databaseservice gestopt.")
+
+
+__all__ = [
+    "DEFAULT_HOST",
+    "DEFAULT_PORT",
+    "DatabaseService",
+    "MAX_READ_BATCH",
+    "serve",
+]
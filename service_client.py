@@ -0,0 +1,91 @@
+"""Client side of the database service (``service.py``).
+
+:class:`ServiceClient` turns a data-layer call into one HTTP request.  Errors
+come back as the exceptions the callers already handle: ``ValueError`` for
+rejected input and ``sqlite3`` errors for everything else, including an
+unreachable service.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Optional
+
+from connection_probe import ProbeResult
+
+DEFAULT_TIMEOUT = 10.0
+
+
+def _search_result(result: list) -> tuple[list[tuple], Optional[tuple]]:
+    rows, cursor = result
+    return [tuple(row) for row in rows], tuple(cursor) if cursor else None
+
+
+# JSON has no tuples; restore the shapes that the local functions return.
+_RESULT_DECODERS: dict[str, Callable[[Any], Any]] = {
+    "search_objects": _search_result,
+    "find_duplicate_objects": lambda result: [tuple(row) for row in result],
+    "find_overlapping_assignments": lambda result: [tuple(row) for row in result],
+    "get_result_row": lambda result: tuple(result) if result is not None else None,
+    "suggestion_rows": lambda result: {
+        field: [tuple(row) for row in rows] for field, rows in result.items()
+    },
+}
+
+
+class ServiceClient:
+    """Calls the operations of a database service over HTTP."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        token: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self._token = token
+        self._timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None) -> Any:
+        data = None if payload is None else json.dumps(payload).encode("utf-8")
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method
+        )
+        request.add_header("Content-Type", "application/json")
+        if self._token:
+            request.add_header("X-LCCU-Token", self._token)
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                return json.loads(response.read())["result"]
+        except urllib.error.HTTPError as exc:
+            try:
+                body = json.loads(exc.read())
+            except ValueError:
+                body = {"error": str(exc), "type": "DatabaseError"}
+            if body.get("type") == "ValueError":
+                raise ValueError(body["error"]) from None
+            raise sqlite3.DatabaseError(body["error"]) from None
+        except (urllib.error.URLError, OSError) as exc:
+            reason = getattr(exc, "reason", exc)
+            raise sqlite3.OperationalError(
+                f"Databaseservice {self.base_url} niet bereikbaar: {reason}"
+            ) from None
+
+    def call(self, name: str, **arguments: Any) -> Any:
+        result = self._request("POST", f"/api/{name}", arguments)
+        decode = _RESULT_DECODERS.get(name)
+        return decode(result) if decode else result
+
+    def probe(self) -> ProbeResult:
+        """Check that the service answers, in the shape of a file probe."""
+        try:
+            self._request("GET", "/health")
+        except sqlite3.Error as exc:
+            return ProbeResult(self.base_url, False, str(exc))
+        return ProbeResult(self.base_url, True, "")
+
+
+__all__ = ["DEFAULT_TIMEOUT", "ServiceClient"]
@@ -0,0 +1,99 @@
+"""Watchdog that reports when the Tk main loop stops responding.
+
+A heartbeat reschedules itself with ``after``; when it runs late, the loop was
+blocked for the difference.  The heartbeat cannot run during the stall
+itself, so a sampling thread watches the time of the last beat and, once the
+threshold has passed, captures the stack of the Tk thread with
+``sys._current_frames``.  When the loop comes back the stall is logged with
+its duration and the stacks that were captured while it lasted.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEARTBEAT_MS = 100
+DEFAULT_THRESHOLD_MS = 500
+
+# Different stacks kept per stall; a long stall in one place yields one.
+_MAX_STACKS = 5
+
+
+class StallMonitor:
+    """Heartbeat on the Tk thread plus a sampler thread; see the module doc."""
+
+    def __init__(
+        self,
+        root,
+        *,
+        heartbeat_ms: int = DEFAULT_HEARTBEAT_MS,
+        threshold_ms: int = DEFAULT_THRESHOLD_MS,
+    ) -> None:
+        self._root = root
+        self._heartbeat = heartbeat_ms / 1000
+        self._threshold = threshold_ms / 1000
+        self._main_thread_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stacks: list[str] = []
+        self._after_id: Optional[str] = None
+        self._stopped = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        # (duration in seconds, stacks) of every stall, newest last.
+        self.stalls: list[tuple[float, list[str]]] = []
+
+    def start(self) -> None:
+        self._last_beat = time.monotonic()
+        self._after_id = self._root.after(int(self._heartbeat * 1000), self._beat)
+        self._sampler = threading.Thread(
+            target=self._sample, name="stall-monitor", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            late = now - self._last_beat - self._heartbeat
+            stacks, self._stacks = self._stacks, []
+            self._last_beat = now
+        if late >= self._threshold:
+            self.stalls.append((late, stacks))
+            logger.warning(
+                "Tk-lus %.0f ms geblokkeerd.%s",
+                late * 1000,
+                "".join(f"\n{stack}" for stack in stacks)
+                or " Geen stack opgevangen.",
+            )
+        if not self._stopped.is_set():
+            self._after_id = self._root.after(int(self._heartbeat * 1000), self._beat)
+
+    def _sample(self) -> None:
+        interval = max(self._threshold / 2, 0.01)
+        while not self._stopped.wait(interval):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self._heartbeat
+                if overdue < self._threshold or len(self._stacks) >= _MAX_STACKS:
+                    continue
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            with self._lock:
+                if stack not in self._stacks:
+                    self._stacks.append(stack)
+
+
+__all__ = ["DEFAULT_HEARTBEAT_MS", "DEFAULT_THRESHOLD_MS", "StallMonitor"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import analytics
+from search import iso_to_epoch
+from test_bijstand_insert import load_module
+
+
+def _busy_seconds_loop(periods, edge):
+    return sum(min(max(edge - start, 0), einde - start) for start, einde in periods)
+
+
+def test_loaders_read_chunks_and_analyses_match_python(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    module.check_or_create_database()
+
+    rng = random.Random(7)
+    periods = []
+    for index in range(40):
+        day = 1 + index % 20
+        start = f"2024-03-{day:02d} {rng.randint(0, 20):02d}:00:00"
+        einde = f"2024-03-{day + rng.randint(0, 2):02d} 23:30:00"
+        periods.append((iso_to_epoch(start), iso_to_epoch(einde)))
+        module.insert_bijstand_record(
+            soort_bijstand="Wacht",
+            dienst=rng.choice(["DOT", "LRD", None]),
+            medewerkers=["Alice", "Bob"][: 1 + index % 2],
+            start_bijstand=start,
+            einde_bijstand=einde,
+            datum_ingave=start,
+        )
+    module.insert_object(
+        sin="ABCD1234",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Nokia",
+        os_value="Android",
+        dienst="DOT",
+        datum_ingave="2024-03-04 08:00:00",
+    )
+
+    with sqlite3.connect(tmp_path / "objecten.db") as conn:
+        objects = analytics.load_objects(conn, chunk_size=7)
+        assignments = analytics.load_assignments(conn, chunk_size=7)
+        expected_dienst = [row[0] for row in conn.execute("SELECT dienst FROM objecten ORDER BY id")]
+        dienst_ids = [row[0] for row in conn.execute("SELECT dienst_id FROM objecten ORDER BY id")]
+
+    assert objects.id.tolist() == list(range(1, 42))
+    assert [objects.dienst.labels[code] for code in objects.dienst.codes] == expected_dienst
+    # The codes are the lookup keys; 0 stands for a missing dienst.
+    assert objects.dienst.codes.tolist() == [value or 0 for value in dienst_ids]
+    assert objects.type.labels[objects.type.codes[-1]] == "Mobile"
+    assert np.isnan(objects.start_bijstand[-1])
+    assert assignments.object_id.size == 60
+
+    counts, _edges = analytics.duration_histogram(
+        objects.start_bijstand, objects.einde_bijstand, bins=10
+    )
+    assert counts.sum() == 40
+
+    period_starts, rates = analytics.intake_rates(objects.datum_ingave, objects.dienst)
+    assert period_starts[0] == iso_to_epoch("2024-02-26 00:00:00")
+    assert rates.sum() == 41
+    dot = objects.dienst.labels.index("DOT")
+    assert rates[dot].sum() == expected_dienst.count("DOT")
+
+    day_starts, hours = analytics.rolling_weekly_workload(
+        objects.start_bijstand, objects.einde_bijstand
+    )
+    for day_start, value in zip(day_starts.tolist(), hours.tolist()):
+        week_start = day_start - 6 * analytics.DAY
+        day_end = day_start + analytics.DAY
+        expected = (
+            _busy_seconds_loop(periods, day_end) - _busy_seconds_loop(periods, week_start)
+        ) / analytics.HOUR
+        assert value == pytest.approx(expected)
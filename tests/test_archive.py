@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sqlite3
+
+from test_bijstand_insert import load_module
+
+
+def _insert_bijstand(module, *, start, einde):
+    return module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice", "Bob"],
+        start_bijstand=start,
+        einde_bijstand=einde,
+        datum_ingave=start,
+        unique_id=1,
+    )
+
+
+def test_archive_moves_closed_records_with_children(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+
+    old_id = _insert_bijstand(
+        module, start="2021-03-01 10:00:00", einde="2021-03-01 12:00:00"
+    )
+    recent_id = _insert_bijstand(
+        module, start="2024-03-01 10:00:00", einde="2024-03-01 12:00:00"
+    )
+    open_id = _insert_bijstand(module, start="2020-03-01 10:00:00", einde=None)
+
+    moved = module.archive_closed_records("2023-01-01", batch_size=1)
+
+    assert moved == {2021: 1}
+    with module.connect_db() as conn:
+        remaining = {row[0] for row in conn.execute("SELECT id FROM objecten")}
+        children = conn.execute(
+            "SELECT COUNT(*) FROM medewerkers_bijstand WHERE object_id = ?",
+            (old_id,),
+        ).fetchone()[0]
+    assert remaining == {recent_id, open_id}
+    assert children == 0
+
+    archived = sqlite3.connect(tmp_path / "archief" / "objecten_2021.db")
+    try:
+        assert archived.execute("SELECT id FROM objecten").fetchall() == [(old_id,)]
+        assert (
+            archived.execute("SELECT COUNT(*) FROM medewerkers_bijstand").fetchone()[0]
+            == 2
+        )
+    finally:
+        archived.close()
+
+
+def test_archive_groups_skip_years_before_range(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+    _insert_bijstand(module, start="2020-05-01 10:00:00", einde="2020-05-01 11:00:00")
+    _insert_bijstand(module, start="2022-05-01 10:00:00", einde="2022-05-01 11:00:00")
+    module.archive_closed_records("2023-01-01")
+
+    conn = module.connect_db()
+    try:
+        with module.attached_archive_groups(conn, "2021-01-01") as groups:
+            schemas = [schema for group in groups for schema in group]
+        databases = [row[1] for row in conn.execute("PRAGMA database_list")]
+    finally:
+        conn.close()
+
+    assert schemas == ["archief_2022"]
+    assert databases == ["main"]
+
+
+def test_archive_search_reads_and_maintenance_upgrades(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+    archived_id = _insert_bijstand(
+        module, start="2021-03-01 10:00:00", einde="2021-03-01 12:00:00"
+    )
+    module.archive_closed_records("2023-01-01")
+
+    path = tmp_path / "archief" / "objecten_2021.db"
+
+    def archive_indexes():
+        with sqlite3.connect(path) as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+    assert "idx_objecten_sin_nocase" in archive_indexes()
+    # An archive written before that index existed.
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP INDEX idx_objecten_sin_nocase")
+
+    rows, _cursor = module.search_objects(sin="BIJSTAND", include_archief=True)
+    assert [row[0] for row in rows] == [archived_id]
+    assert "idx_objecten_sin_nocase" not in archive_indexes()
+
+    report = module.run_database_maintenance()
+    assert report["archives"] == [2021]
+    assert "idx_objecten_sin_nocase" in archive_indexes()
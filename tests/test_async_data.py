@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+
+from async_data import AsyncDatabase
+from test_bijstand_insert import load_module
+
+
+def test_async_facade_overlaps_operations_and_iterates_pages(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+
+    async def scenario():
+        async with AsyncDatabase(workers=3) as db:
+            ids = await asyncio.gather(
+                *(
+                    db.insert_object(
+                        sin=f"ABCD{index:04d}",
+                        object_type="Mobile",
+                        subcategorie="GSM",
+                        merk="Nokia",
+                        os_value="Android",
+                        dienst="DOT",
+                    )
+                    for index in range(25)
+                )
+            )
+            bijstand_id = await db.insert_bijstand_record(
+                soort_bijstand="Wacht",
+                dienst="DOT",
+                medewerkers=["Alice"],
+                start_bijstand="2024-01-01 10:00:00",
+                einde_bijstand="2024-01-01 12:00:00",
+            )
+            await db.update_object(
+                ids[0],
+                sin="ABCD0000",
+                object_type="Mobile",
+                subcategorie="GSM",
+                merk="Apple",
+                os_value="iOS",
+                dienst="DOT",
+                soort_bijstand="",
+                lccu_lid="",
+                datum_in_behandeling=None,
+                start_bijstand=None,
+                einde_bijstand=None,
+            )
+            rows = [row async for row in db.iter_search(page_size=4, sort="sin")]
+            connections = len(db._connections)
+        return ids, bijstand_id, rows, connections
+
+    ids, bijstand_id, rows, connections = asyncio.run(scenario())
+
+    assert sorted(row[0] for row in rows) == sorted(ids + [bijstand_id])
+    assert [row[1] for row in rows] == sorted(row[1] for row in rows)
+    assert next(row for row in rows if row[0] == ids[0])[4] == "Apple"
+    assert 1 <= connections <= 3
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import sqlite3
+
+from autocomplete import PrefixIndex, SuggestionCache, read_suggestion_rows
+from test_bijstand_insert import load_module
+
+
+def test_prefix_index_ranks_by_use_and_updates_incrementally():
+    index = PrefixIndex([("Samsung", 5), ("sony", 2), ("Apple", 9), ("Sony ", 2), ("", 3)])
+
+    assert index.suggest("s") == ["Samsung", "Sony", "sony"]
+    assert index.suggest("SO") == ["Sony", "sony"]
+    assert index.suggest("x") == []
+    assert index.suggest("", limit=2) == ["Apple", "Samsung"]
+
+    index.add("Sharp")
+    for _ in range(6):
+        index.add("sony")
+    assert index.suggest("s", limit=2) == ["sony", "Samsung"]
+    assert index.suggest("sh") == ["Sharp"]
+    assert len(index) == 5
+
+    index.merge(PrefixIndex([("Sharp", 20), ("Siemens", 1)]))
+    assert index.suggest("s", limit=3) == ["Sharp", "sony", "Samsung"]
+    assert len(index) == 6
+
+
+def test_suggestions_are_read_once_with_counts(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+    for merk in ("Nokia", "Nokia", "Nothing", None):
+        module.insert_object(
+            sin="ABCD1234",
+            object_type="Mobile",
+            subcategorie="GSM",
+            merk=merk,
+            os_value="Android",
+            dienst="DOT",
+        )
+    module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="FGP",
+        medewerkers=["Alice", "Bob"],
+        start_bijstand=None,
+        einde_bijstand=None,
+    )
+
+    with sqlite3.connect(db_path) as conn:
+        rows = read_suggestion_rows(conn)
+    assert rows["merk"] == [("Nokia", 2), ("Nothing", 1)]
+    assert sorted(rows["dienst"]) == [("DOT", 4), ("FGP", 1)]
+
+    cache = SuggestionCache()
+    cache.add("merk", "Nord")
+    cache.set_rows(module.load_suggestion_rows())
+    assert cache.suggest("merk", "no") == ["Nokia", "Nord", "Nothing"]
+    assert cache.suggest("medewerker", "b") == ["Bob"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import backup  # noqa: E402
+
+
+def test_backup_copies_data_and_rotates(tmp_path):
+    source = sqlite3.connect(tmp_path / "objecten.db")
+    source.execute("CREATE TABLE objecten (id INTEGER PRIMARY KEY, sin TEXT)")
+    with source:
+        source.executemany(
+            "INSERT INTO objecten (sin) VALUES (?)",
+            [(f"ABCD{i:04d}",) for i in range(1000)],
+        )
+    backup_dir = tmp_path / "backups"
+    for index in range(3):
+        backup_dir.mkdir(exist_ok=True)
+        (backup_dir / f"objecten_2020010{index + 1}_000000.db").write_bytes(b"")
+
+    try:
+        snapshot = backup.create_backup(
+            source, backup_dir, pages=4, step_sleep=0, keep=2
+        )
+    finally:
+        source.close()
+
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM objecten").fetchone()[0] == 1000
+    finally:
+        copy.close()
+    assert backup.list_backups(backup_dir) == [
+        backup_dir / "objecten_20200103_000000.db",
+        snapshot,
+    ]
+
+
+def test_backup_finishes_when_writers_keep_restarting_it(tmp_path, monkeypatch, caplog):
+    db_path = tmp_path / "objecten.db"
+    source = sqlite3.connect(db_path)
+    source.execute("CREATE TABLE objecten (id INTEGER PRIMARY KEY, sin TEXT)")
+    with source:
+        source.executemany(
+            "INSERT INTO objecten (sin) VALUES (?)",
+            [(f"ABCD{i:04d}" * 20,) for i in range(1000)],
+        )
+    other = sqlite3.connect(db_path)
+
+    def write_between_steps(_seconds):
+        # Another workstation saves a record while the copy pauses.
+        with other:
+            other.execute("INSERT INTO objecten (sin) VALUES ('EFGH0001')")
+
+    monkeypatch.setattr(backup.time, "sleep", write_between_steps)
+    try:
+        snapshot = backup.create_backup(
+            source, tmp_path / "backups", pages=4, max_restarts=2
+        )
+        expected = source.execute("SELECT COUNT(*) FROM objecten").fetchone()[0]
+    finally:
+        source.close()
+        other.close()
+
+    assert "3 keer herstart" in caplog.text
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM objecten").fetchone()[0] == expected
+    finally:
+        copy.close()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import sqlite3
+
+from test_bijstand_insert import load_module
+
+
+def _device(merk: str, **extra) -> dict:
+    return {
+        "sin": "ABCD1234",
+        "object_type": "Mobile",
+        "subcategorie": "GSM",
+        "merk": merk,
+        "os_value": "Android",
+        "dienst": "DOT",
+        **extra,
+    }
+
+
+def test_batch_is_inserted_in_order_with_its_ids(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "test.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    first = module.insert_object(**_device("Nokia"))
+    ids = module.insert_objects(
+        [
+            _device("Samsung"),
+            _device("Apple", datum_ingave="2024-01-01 09:00:00"),
+            _device("Xiaomi"),
+        ]
+    )
+
+    assert ids == [first + 1, first + 2, first + 3]
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT id, merk, datum_ingave FROM objecten WHERE id IN (?, ?, ?)"
+            " ORDER BY id",
+            ids,
+        ).fetchall()
+    assert [(row[0], row[1]) for row in rows] == list(
+        zip(ids, ["Samsung", "Apple", "Xiaomi"])
+    )
+    assert rows[1][2] == "2024-01-01 09:00:00"
+    assert rows[0][2] and rows[0][2] == rows[2][2]
+    assert module.insert_objects([]) == []
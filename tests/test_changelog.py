@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import changelog
+from test_bijstand_insert import load_module
+
+
+def test_triggers_record_changes_and_compaction_bounds_the_log(tmp_path, monkeypatch, capsys):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    object_id = module.insert_object(
+        sin="ABCD1234",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Nokia",
+        os_value="Android",
+        dienst="DOT",
+    )
+    bijstand_id = module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice"],
+        start_bijstand="2024-01-01 10:00:00",
+        einde_bijstand="2024-01-01 12:00:00",
+    )
+    with module.connect_db() as conn:
+        conn.execute("UPDATE objecten SET merk = 'Apple', os = os WHERE id = ?", (object_id,))
+        # Rewriting a value with itself is not a change.
+        conn.execute("UPDATE objecten SET dienst = dienst WHERE id = ?", (object_id,))
+        conn.execute("DELETE FROM medewerkers_bijstand WHERE object_id = ?", (bijstand_id,))
+
+    conn = sqlite3.connect(db_path)
+    changes = list(changelog.iter_changes(conn, 0, batch_size=2))
+    assert [(c["table"], c["operation"], c["row_id"]) for c in changes] == [
+        ("objecten", "INSERT", object_id),
+        ("objecten", "INSERT", bijstand_id),
+        ("medewerkers_bijstand", "INSERT", 1),
+        ("objecten", "UPDATE", object_id),
+        ("medewerkers_bijstand", "DELETE", 1),
+    ]
+    assert "type_id" not in changes[0]["columns"]
+    assert changes[3]["columns"] == ["merk"]
+    assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+    assert [c["seq"] for c in changelog.iter_changes(conn, changes[2]["seq"])] == [
+        changes[3]["seq"],
+        changes[4]["seq"],
+    ]
+
+    with conn:
+        assert changelog.compact(conn, max_entries=2) == 3
+    with pytest.raises(ValueError):
+        list(changelog.iter_changes(conn, 0))
+    assert len(list(changelog.iter_changes(conn, changes[2]["seq"]))) == 2
+
+    with conn:
+        later = datetime(2100, 1, 1)
+        assert changelog.compact(conn, retention_days=1, now=later) == 2
+    assert changelog.latest_seq(conn) == changes[-1]["seq"]
+    assert list(changelog.iter_changes(conn, changes[-1]["seq"])) == []
+    conn.close()
+
+    assert module.main(["changes", "--since", "0"]) == 1
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import connection_probe  # noqa: E402
+
+
+def test_probe_reports_reachable_directory(tmp_path):
+    result = connection_probe.probe_database_path(str(tmp_path / "objecten.db"))
+
+    assert result.reachable
+
+
+def test_probe_reports_missing_directory(tmp_path):
+    result = connection_probe.probe_database_path(
+        str(tmp_path / "ontbreekt" / "objecten.db")
+    )
+
+    assert not result.reachable
+    assert "ontbreekt" in result.reason
+
+
+def test_probe_gives_up_after_timeout(monkeypatch):
+    def hanging_stat(_path):
+        import time
+
+        time.sleep(5)
+
+    monkeypatch.setattr(connection_probe, "_stat_location", hanging_stat)
+
+    result = connection_probe.probe_database_path("ergens.db", timeout=0.1)
+
+    assert not result.reachable
+
+
+class _InlineWorker:
+    def submit(self, func, on_success=None, on_error=None):
+        try:
+            result = func()
+        except BaseException as exc:  # noqa: BLE001 - handed to on_error
+            on_error(exc)
+        else:
+            on_success(result)
+
+
+class _StatusBar:
+    def __init__(self):
+        self.messages = []
+
+    def set_message(self, text):
+        self.messages.append(text)
+
+    def show_retry(self, _command):
+        pass
+
+
+def test_failed_schema_setup_keeps_the_write_tabs_disabled(tmp_path, monkeypatch):
+    from test_bijstand_insert import load_module
+
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    db_path.write_bytes(b"dit is geen sqlite-database" * 200)
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    monkeypatch.delenv("LCCU_SERVICE_URL", raising=False)
+
+    def no_dialogs(*_args, **_kwargs):
+        raise AssertionError("geen dialoog vanop de werkthread")
+
+    monkeypatch.setattr(module.messagebox, "showerror", no_dialogs)
+
+    class Window:
+        read_only = False
+        database_ready = False
+
+        def __init__(self):
+            self.lookups = module.LookupCache()
+            self.status_bar = _StatusBar()
+            self.root = type("Root", (), {"after": lambda self, ms, func: "after#1"})()
+            self._probe_worker = _InlineWorker()
+            self.tabs_enabled = []
+
+        def _set_write_tabs_enabled(self, enabled):
+            self.tabs_enabled.append(enabled)
+
+        def check_connection(self):
+            pass
+
+    for name in (
+        "_on_probe_result",
+        "_prepare_database",
+        "_on_database_prepared",
+        "_on_prepare_failed",
+        "_on_database_unavailable",
+    ):
+        setattr(Window, name, getattr(module.MainWindow, name))
+
+    window = Window()
+    window._on_probe_result(module.ProbeResult(str(db_path), True, ""))
+
+    assert window.database_ready is False
+    assert window.tabs_enabled == [False]
+    assert "niet bereikbaar" in window.status_bar.messages[-1]
+    assert "Fout bij het aanmaken van de tabel" in window.status_bar.messages[-1]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+import datetime_codec
+
+
+def _reference_display(value):
+    if not value:
+        return ""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").strftime("%d-%m-%Y %H:%M")
+    except Exception:
+        return value or ""
+
+
+def _reference_normalize(value):
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    for fmt in datetime_codec.NORMALIZE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    return value
+
+
+def test_codec_matches_strptime_round_trips():
+    rng = random.Random(3)
+    samples = [
+        None,
+        "",
+        "   ",
+        "2024-02-29 10:00:00",
+        "2023-02-29 10:00:00",
+        "1900-02-29 10:00",
+        "2000-02-29 23:59",
+        "2024-04-31 10:00:00",
+        "2024-1-5 9:05:03",
+        "5-1-2024 09:05",
+        "2024-01-05 24:00:00",
+        "2024-01-05 10:60",
+        "2024-01-05 10:00:60",
+        "0000-01-05 10:00:00",
+        " 31-12-2023 23:59:59 ",
+        "2024-01-05T10:00:00",
+        "2024-01-05 10:00:00 ",
+        "onbekend",
+        "2024-01-05",
+    ]
+    for _ in range(2000):
+        year = rng.choice(["1999", "2000", "2023", "2024", "2100"])
+        month, day = rng.randint(0, 13), rng.randint(0, 32)
+        hour, minute, second = rng.randint(0, 25), rng.randint(0, 61), rng.randint(0, 61)
+        iso = f"{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}"
+        dutch = f"{day:02d}-{month:02d}-{year} {hour:02d}:{minute:02d}"
+        samples += [iso, f"{iso}:{second:02d}", dutch, f"{dutch}:{second:02d}"]
+
+    for value in samples:
+        assert datetime_codec.iso_to_dutch(value) == _reference_display(value), value
+        assert datetime_codec.normalize_to_iso(value) == _reference_normalize(value), value
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+
+import duplicates
+from test_bijstand_insert import load_module
+
+
+def test_fingerprint_finds_same_device_and_reports_groups(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    device = dict(object_type="Mobile", subcategorie="GSM", merk="Apple", os_value="iOS")
+    first = module.insert_object(sin="ABCD0001", dienst="DOT", **device)
+    second = module.insert_object(sin="abcd0001 ", dienst="FGP", **device)
+    module.insert_object(sin="ABCD0002", dienst="DOT", **device)
+    module.insert_object(
+        sin="BIJSTAND", object_type="Bijstand", subcategorie="", merk="", os_value="", dienst="DOT"
+    )
+    module.insert_object(
+        sin="BIJSTAND", object_type="Bijstand", subcategorie="", merk="", os_value="", dienst="DOT"
+    )
+
+    found = module.find_duplicate_objects(
+        sin="ABCD0001", object_type="mobile", subcategorie="gsm", merk="APPLE", os_value="ios"
+    )
+    assert [object_id for object_id, _datum in found] == [first, second]
+
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM objecten WHERE fingerprint = "
+                f"{duplicates._FINGERPRINT_PARAMS}",
+                ("ABCD0001", "Mobile", "GSM", "Apple", "iOS"),
+            )
+        )
+        groups = list(duplicates.duplicate_groups(conn))
+
+    assert "idx_objecten_fingerprint" in plan
+    assert groups == [
+        {"fingerprint": "ABCD0001|mobile|gsm|apple|ios", "count": 2, "ids": [first, second]}
+    ]
+
+
+def test_python_fingerprint_matches_the_generated_column(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    devices = [
+        dict(sin=" abcd0001", object_type="Mobile", subcategorie="GSM ", merk="Ëlan", os_value=""),
+        dict(sin="ABCD0002", object_type="Computer", subcategorie="", merk="HP", os_value="Linux"),
+        dict(sin="bijstand", object_type="Bijstand", subcategorie="", merk="", os_value=""),
+    ]
+    with sqlite3.connect(db_path) as conn:
+        for device in devices:
+            object_id = module.insert_object(dienst="DOT", **device)
+            (stored,) = conn.execute(
+                "SELECT fingerprint FROM objecten WHERE id = ?", (object_id,)
+            ).fetchone()
+            assert duplicates.fingerprint(**device) == stored
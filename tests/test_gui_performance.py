@@ -0,0 +1,235 @@
+"""Latency budgets for the search and edit tabs with large result sets.
+
+The tests drive the real views and need a display, for example a virtual
+one::
+
+    xvfb-run -a python -m pytest tests/test_gui_performance.py
+
+``LCCU_PERF_ROWS`` sets the number of synthetic rows (default 10000, use
+100000 for the large run).  Without a display those tests are skipped; the
+data path behind them (``search_objects`` paging, sorting, loading and saving
+a record) is checked against the same budgets without a display, so it always
+runs.
+"""
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+import time
+import tkinter as tk
+
+import pytest
+
+from test_bijstand_insert import load_module
+from views import bewerken
+
+ROWS = int(os.environ.get("LCCU_PERF_ROWS", "10000"))
+
+# Budget per interaction in seconds, including the redraw that follows.
+BUDGETS = {
+    "zoeken": 0.5,
+    "meer_laden": 0.5,
+    "kolombreedte": 1.5,
+    "sorteren": 0.5,
+    "laden_voor_bewerken": 0.1,
+    "opslaan": 1.0,
+}
+
+
+def _fill(db_path, rows: int) -> None:
+    rng = random.Random(40)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO objecten (
+                sin, type, subcategorie, merk, os, dienst,
+                datum_ingave, datum_in_behandeling
+            )
+            VALUES (?, 'Mobile', ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    f"ABCD{index % 10000:04d}",
+                    rng.choice(["GSM", "Tablet", "Sim"]),
+                    rng.choice(["Apple", "Samsung", "Nokia", "Xiaomi", "Google Pixel"]),
+                    rng.choice(["iOS", "Android", "GrapheneOS"]),
+                    rng.choice(["DOT", "LR/DRUGS", "WIJK Noord", "InternToezicht"]),
+                    f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 09:00:00",
+                    f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00",
+                )
+                for index in range(rows)
+            ),
+        )
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    module = load_module()
+    db_path = tmp_path_factory.mktemp("data") / "objecten.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+        module.check_or_create_database()
+        _fill(db_path, ROWS)
+        yield module
+
+
+def _measured(action):
+    started = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - started
+
+
+def test_search_pages_through_all_rows_within_budget(database):
+    module = database
+    (rows, cursor), first = _measured(module.search_objects)
+    ids = [row[0] for row in rows]
+    pages = []
+    while cursor is not None:
+        (rows, cursor), duration = _measured(
+            lambda: module.search_objects(after=cursor)
+        )
+        ids += [row[0] for row in rows]
+        pages.append(duration)
+
+    assert len(ids) == len(set(ids)) == ROWS
+    assert first <= BUDGETS["zoeken"]
+    assert max(pages, default=0.0) <= BUDGETS["meer_laden"]
+
+
+@pytest.mark.parametrize("column", ["merk", "datum_in_behandeling", "id"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_first_page_within_budget(database, column, descending):
+    (rows, _cursor), duration = _measured(
+        lambda: database.search_objects(sort=column, descending=descending)
+    )
+
+    assert rows
+    assert duration <= BUDGETS["sorteren"]
+
+
+def test_record_load_and_save_within_budget(database):
+    module = database
+    rows, _cursor = module.search_objects(limit=1)
+    object_id = rows[0][0]
+
+    _row, load = _measured(lambda: module.get_result_row(object_id))
+    _none, save = _measured(
+        lambda: module.update_object(
+            object_id,
+            sin="ABCD0000",
+            object_type="Mobile",
+            subcategorie="GSM",
+            merk="Fairphone",
+            os_value="Android",
+            dienst="DOT",
+            soort_bijstand="",
+            lccu_lid="",
+            datum_in_behandeling=None,
+            start_bijstand=None,
+            einde_bijstand=None,
+        )
+    )
+
+    assert load <= BUDGETS["laden_voor_bewerken"]
+    assert save <= BUDGETS["opslaan"]
+    assert module.get_result_row(object_id)[4] == "Fairphone"
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        pytest.skip(f"geen display beschikbaar: {exc}")
+
+    module = load_module()
+    db_path = tmp_path_factory.mktemp("gui") / "objecten.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+        for name in ("showinfo", "showwarning", "showerror"):
+            monkeypatch.setattr(bewerken.messagebox, name, lambda *args, **kwargs: None)
+        module.check_or_create_database()
+        _fill(db_path, ROWS)
+
+        window = module.MainWindow(module.GUIState(root))
+        window._on_probe_result(module.ProbeResult(str(db_path), True, ""))
+        deadline = time.monotonic() + 10
+        while not window.database_ready and time.monotonic() < deadline:
+            root.update()
+            time.sleep(0.01)
+        yield module, window
+        window.stall_monitor.stop()
+        root.destroy()
+
+
+def _timed(root: tk.Misc, action) -> float:
+    started = time.perf_counter()
+    action()
+    root.update()
+    return time.perf_counter() - started
+
+
+def _load_all(window) -> list[float]:
+    zoeken = window.zoeken_tab
+    durations = [_timed(window.root, zoeken.zoek_objecten)]
+    while zoeken._cursor is not None:
+        durations.append(_timed(window.root, zoeken.load_more))
+    return durations
+
+
+def test_search_and_paging_stay_within_budget(app):
+    _module, window = app
+    first, *pages = _load_all(window)
+
+    assert len(window.zoeken_tab.result_tree.get_children()) == ROWS
+    assert first <= BUDGETS["zoeken"]
+    assert max(pages, default=0.0) <= BUDGETS["meer_laden"]
+
+
+def test_column_resize_with_all_rows_loaded(app):
+    module, window = app
+    zoeken = window.zoeken_tab
+    if len(zoeken.result_tree.get_children()) < ROWS:
+        _load_all(window)
+
+    duration = _timed(
+        window.root,
+        lambda: module.auto_adjust_column_width(
+            zoeken.result_tree, zoeken.tree_frame, zoeken.tree_scroll_x
+        ),
+    )
+
+    assert duration <= BUDGETS["kolombreedte"]
+
+
+@pytest.mark.parametrize("column", ["merk", "datum_in_behandeling", "id"])
+def test_sorting_reloads_the_first_page_within_budget(app, column):
+    _module, window = app
+    zoeken = window.zoeken_tab
+    zoeken.zoek_objecten()
+
+    assert _timed(window.root, lambda: zoeken.sort_by(column)) <= BUDGETS["sorteren"]
+    assert _timed(window.root, lambda: zoeken.sort_by(column)) <= BUDGETS["sorteren"]
+
+
+def test_edit_load_and_save_within_budget(app):
+    _module, window = app
+    tree = window.zoeken_tab.result_tree
+    window.zoeken_tab.zoek_objecten()
+    item = tree.get_children()[0]
+    tree.selection_set(item)
+    tree.focus(item)
+
+    load = _timed(window.root, lambda: window.bewerken_tab.load_record_for_edit(None))
+    window.state.merk_edit_var.set("Fairphone")
+    save = _timed(window.root, window.bewerken_tab.update_record)
+
+    assert load <= BUDGETS["laden_voor_bewerken"]
+    assert save <= BUDGETS["opslaan"]
+    # The edited row is refreshed in place, the others are left alone.
+    assert tree.get_children()[0] == item
+    assert tree.set(item, "Merk") == "Fairphone"
+    assert tree.selection() == (item,)
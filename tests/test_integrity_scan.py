@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sqlite3
+
+from test_bijstand_insert import load_module
+
+
+def test_scan_reports_each_kind_of_problem(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    good_id = module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice"],
+        start_bijstand="2024-01-01 10:00:00",
+        einde_bijstand="2024-01-01 12:00:00",
+    )
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO objecten (sin, datum_ingave) VALUES ('AB12', '2024-01-02 10:00:00')"
+        )
+        conn.execute(
+            """
+            INSERT INTO objecten (sin, start_bijstand, einde_bijstand, aantal_medewerkers)
+            VALUES ('BIJSTAND', '2024-01-02 10:00:00', '2024-01-01 10:00:00', 2)
+            """
+        )
+        conn.execute(
+            "INSERT INTO objecten (sin, datum_ingave) VALUES ('ABCD0001', 'gisteren')"
+        )
+        conn.execute(
+            "INSERT INTO medewerkers_bijstand (object_id, medewerker) VALUES (9999, 'Bob')"
+        )
+    conn.close()
+
+    import integrity_scan
+
+    report = integrity_scan.run_integrity_scan(str(db_path), chunk_size=5000, workers=2)
+
+    assert report["rows_scanned"] == 4
+    assert report["counts"] == {
+        "invalid_sin": 1,
+        "einde_before_start": 1,
+        "medewerkers_count_mismatch": 1,
+        "orphan_child": 1,
+        "unparseable_date": 1,
+    }
+    assert all(issue["id"] != good_id for issue in report["issues"])
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import sqlite3
+
+import schema
+from test_bijstand_insert import load_module
+
+
+def test_migration_deduplicates_and_triggers_keep_ids(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.create_table()
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO objecten (sin, type, merk, dienst) VALUES (?, ?, ?, ?)",
+            [
+                ("ABCD0001", "Mobile", "Apple", "lr/drugs"),
+                ("ABCD0002", "Mobile", "apple ", "LR/DRUGS"),
+                ("ABCD0003", "Mobile", "Apple", "Wijk  Noord"),
+            ],
+        )
+    conn.close()
+
+    module.check_or_create_database()
+    new_id = module.insert_object(
+        sin="ABCD0004",
+        object_type="Mobile",
+        subcategorie="gsm",
+        merk="APPLE",
+        os_value="iOS",
+        dienst="dot",
+    )
+
+    with module.connect_db() as conn:
+        rows = conn.execute(
+            """
+            SELECT o.merk, o.dienst, d.naam
+            FROM objecten o JOIN diensten d ON d.id = o.dienst_id
+            ORDER BY o.id
+            """
+        ).fetchall()
+        subcategorie = conn.execute(
+            "SELECT subcategorie, subcategorie_id IS NOT NULL FROM objecten WHERE id = ?",
+            (new_id,),
+        ).fetchone()
+        merken = conn.execute("SELECT naam FROM merken").fetchall()
+
+    assert rows == [
+        ("Apple", "LR/DRUGS", "LR/DRUGS"),
+        ("Apple", "LR/DRUGS", "LR/DRUGS"),
+        ("Apple", "WIJK Noord", "WIJK Noord"),
+        ("Apple", "DOT", "DOT"),
+    ]
+    assert subcategorie == ("GSM", 1)
+    assert merken == [("Apple",)]
+
+
+def test_lookup_cache_offers_values_per_type(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    module.check_or_create_database()
+
+    from lookups import LookupCache
+
+    cache = LookupCache()
+    with module.connect_db() as conn:
+        cache.load(conn)
+
+    assert cache.values("subcategorieen", "Computer") == [
+        "Laptop",
+        "Desktop",
+        "Losse HD",
+        "Andere",
+    ]
+    assert cache.values("besturingssystemen", "Bijstand") == []
+    assert cache.values("diensten")[:2] == ["DOT", "FGP"]
+
+
+def test_sql_and_python_lookup_names_agree():
+    samples = ["LR  DRUGS", " Wijk \t Noord\n", "a\r\n b", "   ", "", "één  twee"]
+    conn = sqlite3.connect(":memory:")
+    for value in samples:
+        (in_sql,) = conn.execute(f"SELECT {schema.lookup_name_sql('?')}", (value,)).fetchone()
+        assert in_sql == schema.lookup_name(value)
+    conn.close()
+
+
+def test_inserts_are_written_once_and_share_the_normalisation(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO merken (naam) VALUES ('Apple')")
+
+    device = dict(object_type="Mobile", subcategorie="GSM", merk="apple ", os_value="iOS")
+    module.insert_object(sin="ABCD0001", dienst="Wijk  Noord", **device)
+    batch = module.insert_objects(
+        [
+            dict(sin="ABCD0002", dienst="LR/DRUGS", **device),
+            dict(sin="ABCD0003", dienst="Nieuwe   dienst", **device),
+            dict(sin="ABCD0004", dienst="nieuwe dienst", **device),
+        ]
+    )
+    with sqlite3.connect(db_path) as conn:
+        # An older client that leaves the foreign keys to the triggers.
+        older = conn.execute(
+            "INSERT INTO objecten (sin, type, merk, dienst) VALUES (?, ?, ?, ?)",
+            ("ABCD0005", "Mobile", "Apple", "LR  DRUGS"),
+        ).lastrowid
+        rows = conn.execute(
+            """
+            SELECT o.merk, o.dienst, d.naam, d.actief
+            FROM objecten o JOIN diensten d ON d.id = o.dienst_id
+            ORDER BY o.id
+            """
+        ).fetchall()
+        updates = conn.execute(
+            "SELECT row_id FROM changelog WHERE operation = 'UPDATE'"
+        ).fetchall()
+
+    assert rows == [
+        ("Apple", "WIJK Noord", "WIJK Noord", 1),
+        ("Apple", "LR/DRUGS", "LR/DRUGS", 1),
+        ("Apple", "Nieuwe dienst", "Nieuwe dienst", 0),
+        ("Apple", "Nieuwe dienst", "Nieuwe dienst", 0),
+        ("Apple", "LR DRUGS", "LR DRUGS", 0),
+    ]
+    # Only the row of the older client was corrected by the triggers.
+    assert [row_id for (row_id,) in updates] == [older]
+
+    module.update_object(
+        batch[0],
+        sin="ABCD0002",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="apple",
+        os_value="iOS",
+        dienst="Derde  dienst",
+        soort_bijstand="",
+        lccu_lid="",
+        datum_in_behandeling=None,
+        start_bijstand=None,
+        einde_bijstand=None,
+    )
+    with sqlite3.connect(db_path) as conn:
+        updated = conn.execute(
+            """
+            SELECT o.merk, o.dienst, d.naam
+            FROM objecten o JOIN diensten d ON d.id = o.dienst_id
+            WHERE o.id = ?
+            """,
+            (batch[0],),
+        ).fetchone()
+        updates = conn.execute(
+            "SELECT COUNT(*) FROM changelog WHERE operation = 'UPDATE' AND row_id = ?",
+            (batch[0],),
+        ).fetchone()
+    assert updated == ("Apple", "Derde dienst", "Derde dienst")
+    assert updates == (1,)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import maintenance  # noqa: E402
+
+
+def _fragmented_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (payload TEXT)")
+    with conn:
+        conn.executemany(
+            "INSERT INTO t VALUES (?)", [("x" * 500,) for _ in range(2000)]
+        )
+    with conn:
+        conn.execute("DELETE FROM t WHERE rowid % 2 = 0")
+    return conn
+
+
+def test_maintenance_converts_and_releases_free_pages(tmp_path):
+    conn = _fragmented_database(tmp_path / "db.sqlite")
+    try:
+        report = maintenance.run_maintenance(
+            conn, convert=True, analyze=True, check_integrity=True
+        )
+        assert report["converted"]
+        assert report["integrity"] == ["ok"]
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        with conn:
+            conn.execute("DELETE FROM t")
+        freed = maintenance.file_stats(conn)["freelist_count"]
+        report = maintenance.run_maintenance(conn, vacuum_pages=10)
+    finally:
+        conn.close()
+
+    assert freed > 10
+    assert report["after"]["freelist_count"] == freed - 10
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sqlite3
+
+import overlaps
+from test_bijstand_insert import load_module
+
+
+def test_overlapping_assignments_are_found_and_reported(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    def bijstand(medewerkers, start, einde):
+        return module.insert_bijstand_record(
+            soort_bijstand="Wacht",
+            dienst="DOT",
+            medewerkers=medewerkers,
+            start_bijstand=start,
+            einde_bijstand=einde,
+        )
+
+    first = bijstand(["Alice", "Bob"], "2024-01-01 10:00:00", "2024-01-01 12:00:00")
+    second = bijstand(["Alice"], "2024-01-01 11:00:00", "2024-01-01 13:00:00")
+    bijstand(["Alice"], "2024-01-01 13:00:00", "2024-01-01 14:00:00")
+    bijstand(["Carla"], "2024-01-01 12:00:00", None)
+
+    found = module.find_overlapping_assignments(
+        medewerkers=["Bob", "Dirk"],
+        start_bijstand="2024-01-01 11:30:00",
+        einde_bijstand="2024-01-01 15:00:00",
+    )
+    assert found == [(first, "Bob", "2024-01-01 10:00:00", "2024-01-01 12:00:00")]
+
+    # Editing a record does not conflict with its own assignments.
+    found = module.find_overlapping_assignments(
+        object_id=second,
+        start_bijstand="2024-01-01 11:00:00",
+        einde_bijstand="2024-01-01 13:00:00",
+    )
+    assert [(object_id, naam) for object_id, naam, _start, _einde in found] == [
+        (first, "Alice")
+    ]
+
+    with sqlite3.connect(db_path) as conn:
+        report = list(overlaps.overlap_report(conn))
+    assert report == [
+        {
+            "medewerker": "Alice",
+            "object_ids": [first, second],
+            "perioden": [
+                ["2024-01-01 10:00:00", "2024-01-01 12:00:00"],
+                ["2024-01-01 11:00:00", "2024-01-01 13:00:00"],
+            ],
+        }
+    ]
+
+
+def test_assignments_without_an_end_are_still_running(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    def bijstand(medewerkers, start, einde):
+        return module.insert_bijstand_record(
+            soort_bijstand="Wacht",
+            dienst="DOT",
+            medewerkers=medewerkers,
+            start_bijstand=start,
+            einde_bijstand=einde,
+        )
+
+    closed = bijstand(["Alice"], "2024-01-01 10:00:00", "2024-01-01 12:00:00")
+    running = bijstand(["Bob"], "2024-01-02 08:00:00", None)
+
+    # A new assignment without an end overlaps everything after its start.
+    found = module.find_overlapping_assignments(
+        medewerkers=["Alice"],
+        start_bijstand="2024-01-01 11:00:00",
+        einde_bijstand=None,
+    )
+    assert found == [(closed, "Alice", "2024-01-01 10:00:00", "2024-01-01 12:00:00")]
+    assert (
+        module.find_overlapping_assignments(
+            medewerkers=["Alice"], start_bijstand="2024-01-01 12:00:00", einde_bijstand=None
+        )
+        == []
+    )
+
+    # An existing assignment without an end overlaps every later period.
+    found = module.find_overlapping_assignments(
+        medewerkers=["Bob"],
+        start_bijstand="2024-03-01 09:00:00",
+        einde_bijstand="2024-03-01 10:00:00",
+    )
+    assert found == [(running, "Bob", "2024-01-02 08:00:00", None)]
+    assert (
+        module.find_overlapping_assignments(
+            medewerkers=["Bob"],
+            start_bijstand="2024-01-01 09:00:00",
+            einde_bijstand="2024-01-02 08:00:00",
+        )
+        == []
+    )
+
+    later = bijstand(["Bob"], "2024-03-01 09:00:00", None)
+    with sqlite3.connect(db_path) as conn:
+        report = list(overlaps.overlap_report(conn))
+    assert report == [
+        {
+            "medewerker": "Bob",
+            "object_ids": [running, later],
+            "perioden": [
+                ["2024-01-02 08:00:00", None],
+                ["2024-03-01 09:00:00", None],
+            ],
+        }
+    ]
@@ -0,0 +1,260 @@
+"""Guard the indexes behind the statements that the application issues.
+
+Every statement runs through ``EXPLAIN QUERY PLAN`` on a synthetic database
+with planner statistics; none of them may read ``objecten`` or
+``medewerkers_bijstand`` from start to end.  Batch commands (archive,
+duplicates report, integrity scan) read whole tables by design and are not
+covered here.
+"""
+from __future__ import annotations
+
+import random
+import re
+import sqlite3
+
+import pytest
+
+import autocomplete
+import duplicates
+import overlaps
+import repository
+import schema
+import search
+from test_bijstand_insert import load_module
+
+# A plan step that reads one of the big tables without an index.
+_FULL_SCAN_RE = re.compile(r"^SCAN (objecten|medewerkers_bijstand|o|m)$")
+
+
+class _PlanRecorder:
+    """Stands in for a connection and records the plan of every statement."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        self.plans: list[tuple[str, list[str]]] = []
+
+    def execute(self, sql, params=()):
+        plan = [row[3] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        self.plans.append((sql, plan))
+        return self._conn.execute(sql, params)
+
+
+def _assert_no_full_scan(sql: str, plan: list[str]) -> None:
+    scans = [step for step in plan if _FULL_SCAN_RE.match(step)]
+    assert not scans, f"full table scan in {sql.strip()!r}: {plan}"
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    module = load_module()
+    db_path = tmp_path_factory.mktemp("plans") / "objecten.db"
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+        module.check_or_create_database()
+
+        rng = random.Random(7)
+        diensten = [naam for naam, _type in schema.LOOKUP_SEEDS["diensten"]]
+        conn = module.connect_db()
+        with conn:
+            for index in range(3000):
+                day = f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                if index % 10 == 0:
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO objecten (
+                            sin, type, dienst, soort_bijstand, lccu_lid,
+                            aantal_medewerkers, start_bijstand, einde_bijstand
+                        )
+                        VALUES ('BIJSTAND', 'Bijstand', ?, ?, ?, 2, ?, ?)
+                        """,
+                        (
+                            rng.choice(diensten),
+                            rng.choice(["Camerabeelden", "Huiszoeking", "Wacht"]),
+                            rng.choice(["Alice", "Bob", "Carol", "Dave"]),
+                            f"{day} 08:00:00",
+                            f"{day} 12:00:00",
+                        ),
+                    )
+                    conn.executemany(
+                        repository.INSERT_MEDEWERKER_SQL,
+                        [
+                            (cursor.lastrowid, name, f"{day} 08:00:00", f"{day} 12:00:00")
+                            for name in ("Alice", "Bob")
+                        ],
+                    )
+                    continue
+                object_type = rng.choice(["Mobile", "Computer"])
+                conn.execute(
+                    """
+                    INSERT INTO objecten (
+                        sin, type, subcategorie, merk, os, dienst,
+                        datum_ingave, datum_in_behandeling
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        f"{rng.choice(['ABCD', 'EFGH', 'IJKL', 'MNOP'])}{index:04d}",
+                        object_type,
+                        rng.choice(
+                            ["GSM", "Tablet", "Sim"]
+                            if object_type == "Mobile"
+                            else ["Laptop", "Desktop"]
+                        ),
+                        rng.choice(["Apple", "Samsung", "Dell", "HP", "Nokia"]),
+                        rng.choice(
+                            ["iOS", "Android"]
+                            if object_type == "Mobile"
+                            else ["Windows", "Linux"]
+                        ),
+                        rng.choice(diensten),
+                        f"{day} 09:00:00",
+                        f"{day} 10:00:00" if rng.random() < 0.5 else None,
+                    ),
+                )
+        conn.execute("ANALYZE")
+        yield module, conn
+        conn.close()
+
+
+SEARCHES = [
+    {"sin": "ABCD00"},
+    {"filters": {"dienst": "LR/DRUGS", "subcategorie": "GSM", "os": "iOS"}},
+    {"filters": {"subcategorie": "Laptop", "os": "Linux", "merk": "Dell"}},
+    {"filters": {"merk": "Nokia", "dienst": "DOT"}},
+    {"filters": {"soort_bijstand": "Wacht"}},
+    {"filters": {"lccu_lid": "Carol"}},
+    {"epoch_range": (1_680_000_000, 1_681_000_000)},
+    {"epoch_range": (1_680_000_000, 1_681_000_000), "include_datum_ingave": True},
+]
+
+# Searches that read every row of ``objecten`` by design: a SIN fragment that
+# is not four letters can match anywhere in the SIN (``QueryBuilder.contains``).
+ACCEPTED_SCANS = [
+    {"sin": "CD12"},
+    {"sin": "0012"},
+    {"sin": "cd1"},
+]
+
+
+@pytest.mark.parametrize("criteria", SEARCHES)
+def test_search_filters_use_indexes(database, criteria):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    where, params = search.build_where(**criteria)
+    search.fetch_page(recorder, ["main"], where, params, limit=50)
+    for sql, plan in recorder.plans:
+        _assert_no_full_scan(sql, plan)
+        assert any(step.startswith(("SEARCH o", "MULTI-INDEX OR")) for step in plan), plan
+
+
+@pytest.mark.parametrize("criteria", ACCEPTED_SCANS)
+def test_sin_substring_search_scans_objecten_only(database, criteria):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    where, params = search.build_where(**criteria)
+    rows = search.fetch_page(recorder, ["main"], where, params, limit=50)
+    assert rows
+    for sql, plan in recorder.plans:
+        scans = [step for step in plan if step.startswith("SCAN")]
+        assert scans and all(step.startswith("SCAN o") for step in scans), plan
+
+
+@pytest.mark.parametrize("sort", search.RESULT_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_sorted_pages_walk_an_index(database, sort, descending):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    where, params = search.build_where()
+    rows = search.fetch_page(
+        recorder, ["main"], where, params, sort=sort, descending=descending, limit=50
+    )
+    cursor = (rows[-1][-1], rows[-1][0])
+    search.fetch_page(
+        recorder,
+        ["main"],
+        where,
+        params,
+        sort=sort,
+        descending=descending,
+        after=cursor,
+        limit=50,
+    )
+    for sql, plan in recorder.plans:
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+    # Pages after the first one start inside the index instead of scanning it.
+    for sql, plan in recorder.plans[1:]:
+        _assert_no_full_scan(sql, plan)
+        assert all(not step.startswith("SCAN") for step in plan), plan
+
+
+def test_edit_and_bijstand_statements_use_indexes(database):
+    module, conn = database
+    object_id = conn.execute(
+        "SELECT id FROM objecten WHERE sin = 'BIJSTAND' LIMIT 1"
+    ).fetchone()[0]
+    statements = [
+        (repository.SELECT_SOORT_BIJSTAND_SQL, (object_id,)),
+        (repository.SELECT_MEDEWERKERS_SQL, (object_id,)),
+        (repository.UPDATE_OBJECT_SQL, ("BIJSTAND",) + ("",) * 10 + (object_id,)),
+        (repository.DELETE_MEDEWERKERS_SQL, (object_id,)),
+        (repository.UPDATE_AANTAL_MEDEWERKERS_SQL, (0, object_id)),
+    ]
+    for table, columns in schema.TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            statements.append((module.normalize_select_sql(table, column), ()))
+
+    for sql, params in statements:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        _assert_no_full_scan(sql, plan)
+
+
+def test_duplicate_lookup_uses_fingerprint_index(database):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    duplicates.find_duplicates(
+        recorder,
+        sin="ABCD0001",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Apple",
+        os_value="iOS",
+    )
+    (sql, plan), = recorder.plans
+    _assert_no_full_scan(sql, plan)
+    assert any("idx_objecten_fingerprint" in step for step in plan), plan
+
+
+def test_overlap_check_seeks_the_medewerker_index(database):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    overlaps.find_overlaps(
+        recorder,
+        medewerkers=["Alice", "Bob"],
+        start_bijstand="2023-06-01 10:00:00",
+        einde_bijstand="2023-06-01 12:00:00",
+        exclude_object_id=1,
+    )
+    (sql, plan), = recorder.plans
+    _assert_no_full_scan(sql, plan)
+    assert any("idx_medewerkers_bijstand_medewerker_einde" in step for step in plan), plan
+    # Only the assignments that end after the start, or have no end, are read.
+    assert any("einde_bijstand_epoch>?" in step for step in plan), plan
+
+
+def test_saved_record_lookup_seeks_the_datum_ingave_index(database):
+    _module, conn = database
+    recorder = _PlanRecorder(conn)
+    repository.find_saved_objects(
+        recorder, records=[{"datum_ingave": "2023-06-01 09:00:00", "unique_id": 1234}]
+    )
+    (sql, plan), = recorder.plans
+    _assert_no_full_scan(sql, plan)
+    assert any("idx_objecten_datum_ingave_epoch" in step for step in plan), plan
+
+
+def test_suggestion_queries_read_indexes_only(database):
+    _module, conn = database
+    for sql in autocomplete.SUGGESTION_QUERIES.values():
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        _assert_no_full_scan(sql, plan)
+        assert any("COVERING INDEX" in step for step in plan), plan
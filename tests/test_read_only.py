@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from test_bijstand_insert import load_module
+
+
+def _insert(module, sin):
+    return module.insert_object(
+        sin=sin,
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Nokia",
+        os_value="Android",
+        dienst="DOT",
+    )
+
+
+def test_read_only_session_searches_but_never_writes(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    monkeypatch.setenv("LCCU_BACKUP_DIR", str(tmp_path / "backups"))
+    module.check_or_create_database()
+    first = _insert(module, "ABCD0001")
+
+    monkeypatch.setenv("LCCU_READ_ONLY", "1")
+    rows, _cursor = module.search_objects(include_archief=True)
+    assert [row[0] for row in rows] == [first]
+    with pytest.raises(sqlite3.OperationalError):
+        _insert(module, "ABCD0002")
+
+    # A missing database is reported instead of created.
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "ontbreekt.db"))
+    with pytest.raises(sqlite3.OperationalError):
+        module.search_objects()
+    assert not (tmp_path / "ontbreekt.db").exists()
+
+
+def test_snapshot_session_reads_newest_local_backup(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    monkeypatch.setenv("LCCU_BACKUP_DIR", str(tmp_path / "backups"))
+    module.check_or_create_database()
+    first = _insert(module, "ABCD0001")
+
+    monkeypatch.setenv("LCCU_READ_ONLY", "snapshot")
+    assert not module.probe_session_database().reachable
+    with pytest.raises(sqlite3.OperationalError, match="back-up"):
+        module.search_objects()
+
+    monkeypatch.delenv("LCCU_READ_ONLY")
+    module.create_database_backup()
+    _insert(module, "ABCD0002")
+
+    monkeypatch.setenv("LCCU_READ_ONLY", "snapshot")
+    assert module.probe_session_database().reachable
+    rows, _cursor = module.search_objects()
+    assert [row[0] for row in rows] == [first]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import sqlite3
+import tkinter as tk
+
+import pytest
+
+from test_bijstand_insert import load_module
+from views import save_queue
+
+
+class _InlineWorker:
+    def submit(self, func, on_success=None, on_error=None):
+        try:
+            result = func()
+        except BaseException as exc:  # noqa: BLE001 - handed to on_error
+            on_error(exc)
+        else:
+            on_success(result)
+
+
+class _StatusBar:
+    frame = None
+
+    def __init__(self):
+        self.messages = []
+
+    def set_message(self, text):
+        self.messages.append(text)
+
+
+class _Button:
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def pack(self, **_kwargs):
+        pass
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    # A Tcl interpreter holds the summary variable; no display is needed.
+    monkeypatch.setattr(save_queue.ttk, "Button", _Button)
+    return save_queue.SaveQueue(
+        root=tk.Tcl(), status_bar=_StatusBar(), worker=_InlineWorker()
+    )
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    module.check_or_create_database()
+    return module
+
+
+def _record(sin, merk="Apple", datum_ingave="2024-01-01 10:00:00", unique_id=1234):
+    return {
+        "sin": sin,
+        "object_type": "Mobile",
+        "subcategorie": "GSM",
+        "merk": merk,
+        "os_value": "iOS",
+        "dienst": "DOT",
+        "datum_ingave": datum_ingave,
+        "unique_id": unique_id,
+    }
+
+
+def _sins(module):
+    conn = module.connect_db()
+    try:
+        return [row[0] for row in conn.execute("SELECT sin FROM objecten ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_failed_save_is_retried_once(queue, module):
+    record = _record("ABCD0001")
+    attempts = []
+
+    def insert():
+        attempts.append(record["sin"])
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return module.insert_object(**record)
+
+    saved = []
+    queue.submit(
+        "ABCD0001",
+        insert,
+        on_success=saved.append,
+        find_saved=lambda: (module.find_saved_objects([record]) or [None])[0],
+    )
+    assert queue.pending == [] and len(queue.failed) == 1
+    assert queue.failed[0].error == "database is locked"
+    assert queue.summary_var.get() == "Wachtrij: 0 | Mislukt: 1"
+
+    queue.retry_failed()
+    assert queue.failed == [] and len(saved) == 1
+    assert len(attempts) == 2
+    assert _sins(module) == ["ABCD0001"]
+    assert queue.summary_var.get() == "Wachtrij: 0 | Mislukt: 0"
+
+
+def test_retry_does_not_store_a_committed_save_twice(queue, module):
+    records = [_record("ABCD0001"), _record("ABCD0002", unique_id=5678)]
+    first_ids = []
+
+    def insert():
+        if not first_ids:
+            # The batch commits, but the reply never arrives.
+            first_ids.extend(module.insert_objects(records))
+            raise ConnectionError("verbinding met de service verbroken")
+        return module.insert_objects(records)
+
+    saved = []
+    queue.submit(
+        "batch",
+        insert,
+        on_success=saved.append,
+        find_saved=lambda: module.find_saved_objects(records),
+    )
+    assert len(queue.failed) == 1
+
+    queue.retry_failed()
+    assert saved == [first_ids]
+    assert _sins(module) == ["ABCD0001", "ABCD0002"]
+
+
+def test_saved_records_are_matched_on_their_key(module):
+    same_second = [_record("ABCD0001"), _record("ABCD0001", merk="Samsung")]
+    assert module.find_saved_objects(same_second) is None
+
+    ids = module.insert_objects(same_second)
+    assert module.find_saved_objects(same_second) == ids
+    assert module.find_saved_objects([_record("ABCD0001", unique_id=4321)]) is None
+    assert module.find_saved_objects([{**_record("ABCD0001"), "unique_id": None}]) is None
+
+
+def test_discarded_save_hands_its_data_back(queue):
+    def insert():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    discarded = []
+    queue.submit("batch", insert, on_discard=lambda: discarded.append("batch"))
+    queue.discard_failed()
+    assert discarded == ["batch"]
+    assert queue.failed == []
+    assert queue.summary_var.get() == "Wachtrij: 0 | Mislukt: 0"
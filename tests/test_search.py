@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import search
+from test_bijstand_insert import load_module
+
+
+def _all_pages(module, **options):
+    rows, cursor = module.search_objects(limit=3, **options)
+    while cursor is not None:
+        page, cursor = module.search_objects(limit=3, after=cursor, **options)
+        rows.extend(page)
+    return rows
+
+
+def test_keyset_pages_follow_sql_sort_across_archives(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+
+    merken = ["Samsung", None, "Apple", "Nokia", "Apple", None, "Xiaomi", "Sony"]
+    for index, merk in enumerate(merken):
+        module.insert_object(
+            sin=f"ABCD{index:04d}",
+            object_type="Mobile",
+            subcategorie="GSM",
+            merk=merk,
+            os_value="Android",
+            dienst="DOT",
+        )
+    module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice"],
+        start_bijstand="2021-03-01 10:00:00",
+        einde_bijstand="2021-03-01 12:00:00",
+        datum_ingave="2021-03-01 10:00:00",
+        unique_id=1,
+    )
+    module.archive_closed_records("2023-01-01")
+
+    for descending in (False, True):
+        rows = _all_pages(
+            module, sort="merk", descending=descending, include_archief=True
+        )
+        keys = [(row[4] is not None, row[4], row[0]) for row in rows]
+        assert keys == sorted(keys, reverse=descending)
+        assert len(rows) == len(merken) + 1
+
+    ids = [row[0] for row in _all_pages(module, sort="id", descending=True)]
+    assert ids == sorted(ids, reverse=True) and len(ids) == len(merken)
+
+    with sqlite3.connect(db_path) as conn:
+        where, params = search.build_where()
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT id FROM objecten o "
+                f"WHERE {where} ORDER BY o.merk DESC, o.id DESC LIMIT 3",
+                params,
+            )
+        )
+    assert "idx_objecten_merk" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_structured_filters_use_prefix_and_composite_indexes(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    module.check_or_create_database()
+
+    devices = [
+        ("ABCD0001", "GSM", "iOS", "LR/DRUGS"),
+        ("ABCD0002", "GSM", "Android", "LR/DRUGS"),
+        ("ABCE0003", "GSM", "iOS", "LR/DRUGS"),
+        ("ABCD0004", "Tablet", "iOS", "LR/DRUGS"),
+        ("ABCD0005", "GSM", "iOS", "DOT"),
+    ]
+    for sin, subcategorie, os_value, dienst in devices:
+        module.insert_object(
+            sin=sin,
+            object_type="Mobile",
+            subcategorie=subcategorie,
+            merk="Apple",
+            os_value=os_value,
+            dienst=dienst,
+        )
+
+    rows, cursor = module.search_objects(
+        sin="abcd",
+        filters={"subcategorie": "GSM", "os": "iOS", "dienst": "LR/DRUGS", "merk": ""},
+    )
+    assert [row[1] for row in rows] == ["ABCD0001"]
+    assert cursor is None
+
+    rows, _cursor = module.search_objects(sin="0003")
+    assert [row[1] for row in rows] == ["ABCE0003"]
+    rows, _cursor = module.search_objects(sin=" 000")
+    assert len(rows) == len(devices)
+    rows, _cursor = module.search_objects(sin="%")
+    assert rows == []
+    rows, _cursor = module.search_objects(sin="CD000")
+    assert len(rows) == 4
+    rows, _cursor = module.search_objects(sin="BCE")
+    assert [row[1] for row in rows] == ["ABCE0003"]
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE objecten SET sin = 'abce0003' WHERE sin = 'ABCE0003'")
+    rows, _cursor = module.search_objects(sin="ABCE")
+    assert [row[1] for row in rows] == ["abce0003"]
+    rows, _cursor = module.search_objects(sin="bce000")
+    assert [row[1] for row in rows] == ["abce0003"]
+
+    where, params = search.build_where(
+        sin="ABCD", filters={"dienst": "LR/DRUGS", "subcategorie": "GSM", "os": "iOS"}
+    )
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM objecten o WHERE {where}", params
+            )
+        )
+    assert "USING INDEX" in plan and "SCAN" not in plan
+
+    with pytest.raises(ValueError):
+        search.build_where(filters={"unique_id": "1"})
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from service import DatabaseService
+from service_client import ServiceClient
+from test_bijstand_insert import load_module
+
+
+@pytest.fixture
+def running_service(tmp_path, monkeypatch):
+    module = load_module()
+    db_path = tmp_path / "objecten.db"
+    monkeypatch.setenv("LCCU_DB_PATH", str(db_path))
+    monkeypatch.setenv("LCCU_ARCHIVE_DIR", str(tmp_path / "archief"))
+    module.check_or_create_database()
+
+    service = DatabaseService(str(db_path), token="geheim")
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(service.start("127.0.0.1", 0), loop).result(5)
+    try:
+        yield module, service, f"http://127.0.0.1:{service.port}", loop
+    finally:
+        asyncio.run_coroutine_threadsafe(service.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_module_functions_go_through_the_service(running_service, monkeypatch):
+    module, service, url, _loop = running_service
+    monkeypatch.setenv("LCCU_SERVICE_URL", url)
+    monkeypatch.setenv("LCCU_SERVICE_TOKEN", "geheim")
+
+    object_id = module.insert_object(
+        sin="abcd1234",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Nokia",
+        os_value="Android",
+        dienst="DOT",
+    )
+    bijstand_id = module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice", "Bob"],
+        start_bijstand="2024-01-01 10:00:00",
+        einde_bijstand="2024-01-01 12:00:00",
+    )
+    module.update_object(
+        bijstand_id,
+        sin="BIJSTAND",
+        object_type="Bijstand",
+        subcategorie="",
+        merk="",
+        os_value="",
+        dienst="DOT",
+        soort_bijstand="Huiszoeking",
+        lccu_lid="",
+        datum_in_behandeling=None,
+        start_bijstand="2024-01-02 10:00:00",
+        einde_bijstand="2024-01-02 12:00:00",
+        is_bijstand=True,
+    )
+
+    rows, cursor = module.search_objects(sort="id")
+    assert cursor is None
+    assert [row[0] for row in rows] == [object_id, bijstand_id]
+    assert module.get_soort_bijstand(bijstand_id) == "Huiszoeking"
+    row = module.get_result_row(bijstand_id)
+    assert isinstance(row, tuple) and row[9] == "2024-01-02 10:00:00"
+    assert module.get_result_row(bijstand_id + 100) is None
+    duplicates = module.find_duplicate_objects(
+        sin="ABCD1234",
+        object_type="Mobile",
+        subcategorie="GSM",
+        merk="Nokia",
+        os_value="Android",
+    )
+    assert [row[0] for row in duplicates] == [object_id]
+    assert service.operations == 8
+
+    with sqlite3.connect(service.db_path) as conn:
+        medewerkers = conn.execute(
+            "SELECT medewerker, start_bijstand FROM medewerkers_bijstand"
+            " WHERE object_id = ? ORDER BY medewerker",
+            (bijstand_id,),
+        ).fetchall()
+    assert medewerkers == [
+        ("Alice", "2024-01-02 10:00:00"),
+        ("Bob", "2024-01-02 10:00:00"),
+    ]
+
+
+def test_service_rejects_bad_token_and_input(running_service):
+    _module, _service, url, _loop = running_service
+
+    with pytest.raises(sqlite3.DatabaseError, match="token"):
+        ServiceClient(url, token="fout").call("search_objects")
+    with pytest.raises(ValueError):
+        ServiceClient(url, token="geheim").call(
+            "search_objects", filters={"onbekend": "x"}
+        )
+    assert ServiceClient(url, token="geheim").probe().reachable
+    assert not ServiceClient("http://127.0.0.1:9", timeout=1).probe().reachable
+
+
+def test_service_needs_a_token_beyond_loopback(tmp_path):
+    for host in ("0.0.0.0", "", "server.lokaal"):
+        with pytest.raises(ValueError, match="LCCU_SERVICE_TOKEN"):
+            asyncio.run(DatabaseService(str(tmp_path / "objecten.db")).start(host, 0))
+
+    async def start_and_close(host):
+        service = DatabaseService(str(tmp_path / "objecten.db"))
+        await service.start(host, 0)
+        await service.close()
+
+    asyncio.run(start_and_close("127.0.0.1"))
+    asyncio.run(start_and_close("localhost"))
+
+
+def test_reads_are_batched_up_to_the_next_write(running_service):
+    _module, service, _url, loop = running_service
+    write = {
+        "sin": "ABCD0001",
+        "object_type": "Mobile",
+        "subcategorie": "GSM",
+        "merk": "Nokia",
+        "os_value": "Android",
+        "dienst": "DOT",
+        "datum_ingave": "2024-01-01 09:00:00",
+    }
+
+    async def queue_calls():
+        calls = [service.call("search_objects", {}) for _ in range(5)]
+        calls.append(service.call("insert_object", write))
+        calls += [service.call("search_objects", {}) for _ in range(5)]
+        return await asyncio.gather(*calls)
+
+    before = service.batches
+    results = asyncio.run_coroutine_threadsafe(queue_calls(), loop).result(5)
+
+    assert service.batches - before == 3
+    assert [len(rows) for rows, _cursor in results[:5]] == [0] * 5
+    assert [len(rows) for rows, _cursor in results[6:]] == [1] * 5
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stall_monitor import StallMonitor  # noqa: E402
+
+
+class _ManualRoot:
+    """Records ``after`` jobs instead of running a Tk loop."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, object] = {}
+
+    def after(self, _ms, func):
+        after_id = f"after#{len(self.jobs)}"
+        self.jobs[after_id] = func
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.jobs.pop(after_id, None)
+
+
+def _blocking_search():
+    time.sleep(0.3)
+
+
+def test_stall_is_logged_with_the_blocking_stack(caplog):
+    root = _ManualRoot()
+    monitor = StallMonitor(root, heartbeat_ms=10, threshold_ms=100)
+    monitor.start()
+    try:
+        _blocking_search()
+        with caplog.at_level(logging.WARNING, logger="stall_monitor"):
+            monitor._beat()
+        monitor._beat()
+    finally:
+        monitor.stop()
+
+    (duration, stacks), = monitor.stalls
+    assert duration >= 0.1
+    assert any("_blocking_search" in stack for stack in stacks)
+    assert "geblokkeerd" in caplog.text
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from test_bijstand_insert import load_module
+
+
+def test_epoch_columns_follow_normalized_text(tmp_path, monkeypatch):
+    module = load_module()
+    monkeypatch.setenv("LCCU_DB_PATH", str(tmp_path / "objecten.db"))
+    module.check_or_create_database()
+
+    object_id = module.insert_bijstand_record(
+        soort_bijstand="Wacht",
+        dienst="DOT",
+        medewerkers=["Alice"],
+        start_bijstand="01-02-2024 08:30",
+        einde_bijstand="2024-02-01 10:00:00",
+        datum_ingave="2024-02-01 07:00:00",
+    )
+    module.check_or_create_database()
+
+    with module.connect_db() as conn:
+        row = conn.execute(
+            "SELECT start_bijstand, start_bijstand_epoch, einde_bijstand_epoch "
+            "FROM objecten WHERE id = ?",
+            (object_id,),
+        ).fetchone()
+        child = conn.execute(
+            "SELECT start_bijstand FROM medewerkers_bijstand WHERE object_id = ?",
+            (object_id,),
+        ).fetchone()
+
+    assert row == (
+        "2024-02-01 08:30:00",
+        module.iso_to_epoch("2024-02-01 08:30:00"),
+        module.iso_to_epoch("2024-02-01 10:00:00"),
+    )
+    assert child == ("2024-02-01 08:30:00",)
+    assert module.day_range_to_epoch("2024-02-01", "2024-02-01") == (
+        module.iso_to_epoch("2024-02-01 00:00:00"),
+        module.iso_to_epoch("2024-02-01 23:59:59"),
+    )
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import sys
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tk_profiler import CallbackProfiler, callback_name  # noqa: E402
+
+
+def zoek_objecten():
+    return "resultaat"
+
+
+def test_wrapped_callbacks_are_counted_and_reported(tmp_path):
+    profiler = CallbackProfiler()
+    timed = profiler.wrap(zoek_objecten)
+
+    assert timed() == "resultaat"
+    assert timed() == "resultaat"
+
+    (name, (calls, total, slowest)), = profiler.stats.items()
+    assert name.startswith("zoek_objecten (test_tk_profiler.py:")
+    assert calls == 2 and slowest <= total
+
+    report = tmp_path / "profiel.txt"
+    profiler.write_report(str(report))
+    assert "zoek_objecten" in report.read_text(encoding="utf-8")
+
+
+def test_after_jobs_are_named_after_the_scheduled_function():
+    registered = []
+
+    class FakeTk:
+        def call(self, *args):
+            return "after#1"
+
+    class FakeWidget:
+        # Just enough of a widget for ``Misc.after`` without a display.
+        after = tk.Misc.after
+
+        def __init__(self):
+            self.tk = FakeTk()
+
+        def _register(self, func):
+            registered.append(func)
+            return "callit"
+
+    tk.Misc.after(FakeWidget(), 10, zoek_objecten)
+    tk.Misc.after_idle(FakeWidget(), zoek_objecten)
+
+    assert len(registered) == 2
+    for func in registered:
+        assert callback_name(func).startswith("zoek_objecten (test_tk_profiler.py:")
+
+
+def test_install_patches_and_restores_registration():
+    originals = (tk.Misc._register, tk.Variable._register)
+    profiler = CallbackProfiler()
+
+    profiler.install()
+    try:
+        assert (tk.Misc._register, tk.Variable._register) != originals
+    finally:
+        profiler.uninstall()
+
+    assert (tk.Misc._register, tk.Variable._register) == originals
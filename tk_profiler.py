@@ -0,0 +1,112 @@
+"""Opt-in timing of Tk callbacks.
+
+Every Tk callback -- widget commands, ``bind`` handlers, ``after`` jobs and
+variable traces -- reaches Python through ``Misc._register`` or
+``Variable._register``.  :class:`CallbackProfiler` wraps the callbacks passed
+to those two methods, so the views need no changes, and collects the number
+of calls, the total time and the slowest call per callback.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import time
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT = "lccu_profile.txt"
+
+_AFTER_WRAPPER = "after.<locals>.callit"
+
+
+def callback_name(func: Callable[..., Any]) -> str:
+    """Return a readable name with the source location of *func*."""
+    # ``Misc.after`` registers an inner ``callit`` that calls the real job;
+    # it copies the job's ``__name__``, so recognise it by its qualname.
+    if getattr(func, "__qualname__", "").endswith(_AFTER_WRAPPER) and getattr(
+        func, "__closure__", None
+    ):
+        cells = dict(zip(func.__code__.co_freevars, func.__closure__))
+        if "func" in cells:
+            return callback_name(cells["func"].cell_contents)
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return repr(func)
+    qualname = getattr(func, "__qualname__", code.co_name)
+    location = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return f"{qualname} ({location})"
+
+
+class CallbackProfiler:
+    """Collects call count, total time and worst case per Tk callback."""
+
+    def __init__(self) -> None:
+        # name -> [calls, total seconds, slowest call in seconds]
+        self.stats: dict[str, list[float]] = {}
+        self._originals: Optional[tuple[Callable, Callable]] = None
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        name = callback_name(func)
+
+        @functools.wraps(func)
+        def timed(*args: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                entry = self.stats.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+
+        return timed
+
+    def install(self) -> None:
+        """Wrap all callbacks that are registered from now on."""
+        if self._originals is not None:
+            return
+        misc_register = tk.Misc._register
+        variable_register = tk.Variable._register
+        profiler = self
+
+        def register(widget, func, subst=None, needcleanup=1):
+            return misc_register(widget, profiler.wrap(func), subst, needcleanup)
+
+        def register_trace(variable, callback):
+            return variable_register(variable, profiler.wrap(callback))
+
+        self._originals = (misc_register, variable_register)
+        tk.Misc._register = register
+        tk.Variable._register = register_trace
+
+    def uninstall(self) -> None:
+        if self._originals is None:
+            return
+        tk.Misc._register, tk.Variable._register = self._originals
+        self._originals = None
+
+    def report(self) -> str:
+        """Return the statistics as a table, slowest total time first."""
+        lines = [
+            f"{'aanroepen':>10} {'totaal (s)':>11} {'gem. (ms)':>10} "
+            f"{'max (ms)':>10}  callback"
+        ]
+        ranked = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, total, slowest) in ranked:
+            lines.append(
+                f"{int(calls):>10} {total:>11.3f} {total / calls * 1000:>10.2f} "
+                f"{slowest * 1000:>10.2f}  {name}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(self.report())
+        logger.info("Profiel van %d callbacks geschreven naar %s", len(self.stats), path)
+
+
+__all__ = ["CallbackProfiler", "DEFAULT_REPORT", "callback_name"]
@@ -0,0 +1,15 @@
+"""Validation rules shared by the GUI, the command line and worker processes."""
+from __future__ import annotations
+
+
+def validate_sin(value: str) -> str:
+    """Return the normalised SIN or raise ``ValueError``."""
+    sin = value.strip()
+    if sin.upper() == "BIJSTAND":
+        return "BIJSTAND"
+    if len(sin) != 8 or not (sin[:4].isalpha() and sin[4:].isdigit()):
+        raise ValueError("SIN moet exact 4 letters en 4 cijfers bevatten!")
+    return sin[:4].upper() + sin[4:]
+
+
+__all__ = ["validate_sin"]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from tkinter import ttk
+from typing import Callable
+
+
+def attach_autocomplete(
+    combobox: ttk.Combobox, suggest: Callable[[str], list[str]]
+) -> None:
+    """Complete *combobox* inline with the first of ``suggest(typed_text)``.
+
+    The completed part is selected, so typing on replaces it; the dropdown
+    list holds all suggestions for the typed text.
+    """
+
+    def on_key_release(event) -> None:
+        typed = combobox.get()[: combobox.index("insert")]
+        suggestions = suggest(typed)
+        combobox["values"] = suggestions
+        # Only complete after a typed character, not after a deletion.
+        if not (typed and suggestions and event.char and event.char.isprintable()):
+            return
+        best = suggestions[0]
+        if len(best) > len(typed):
+            combobox.delete(0, "end")
+            combobox.insert(0, typed + best[len(typed):])
+            combobox.icursor(len(typed))
+            combobox.selection_range(len(typed), "end")
+
+    combobox.bind("<KeyRelease>", on_key_release, add="+")
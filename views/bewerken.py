@@ -5,6 +5,9 @@ from datetime import datetime
 from tkinter import ttk, messagebox
 from typing import Callable
 
+from views.autocomplete import attach_autocomplete
+from views.bijstand_popup import confirm_no_overlaps
+
 
 class BewerkenTab:
     """View for the "Bewerken" tab."""
@@ -13,23 +16,34 @@ class BewerkenTab:
         self,
         *,
         state,
-        connect_db: Callable[[], sqlite3.Connection],
+        lookups,
+        suggestions,
+        update_object: Callable[..., None],
+        get_soort_bijstand: Callable[[str], str | None],
+        find_overlapping_assignments: Callable[..., list],
         validate_sin: Callable[[str], str],
         parse_dutch_datetime: Callable[[str], datetime],
         parse_dutch_to_iso: Callable[[str], str | None],
         datetime_to_iso: Callable[[datetime], str],
         format_datetime_for_display: Callable[[str | None], str],
-        search_callback: Callable[[], None],
+        refresh_row: Callable[[str], None],
         result_tree: ttk.Treeview,
+        check_worker,
     ) -> None:
         self.state = state
-        self._connect_db = connect_db
+        self._lookups = lookups
+        self._suggestions = suggestions
+        self._update_object = update_object
+        self._get_soort_bijstand = get_soort_bijstand
+        self._find_overlapping_assignments = find_overlapping_assignments
         self._validate_sin = validate_sin
         self._parse_dutch_datetime = parse_dutch_datetime
         self._parse_dutch_to_iso = parse_dutch_to_iso
         self._datetime_to_iso = datetime_to_iso
         self._format_datetime_for_display = format_datetime_for_display
-        self._search_callback = search_callback
+        self._refresh_row = refresh_row
+        self._check_worker = check_worker
+        self._checking = False
         self._current_record_id: str | None = None
 
         self.frame = ttk.Frame(self.state.notebook)
@@ -72,8 +86,10 @@ class BewerkenTab:
         ttk.Label(self.frame, text="Merk").grid(
             row=3, column=0, padx=10, pady=5, sticky="w"
         )
-        ttk.Entry(self.frame, textvariable=self.state.merk_edit_var).grid(
-            row=3, column=1, padx=10, pady=5, sticky="w"
+        merk_combobox = ttk.Combobox(self.frame, textvariable=self.state.merk_edit_var)
+        merk_combobox.grid(row=3, column=1, padx=10, pady=5, sticky="w")
+        attach_autocomplete(
+            merk_combobox, lambda typed: self._suggestions.suggest("merk", typed)
         )
 
         ttk.Label(self.frame, text="Besturingssysteem").grid(
@@ -87,9 +103,13 @@ class BewerkenTab:
         ttk.Label(self.frame, text="Dienst").grid(
             row=5, column=0, padx=10, pady=5, sticky="w"
         )
-        ttk.Entry(self.frame, textvariable=self.state.dienst_edit_var).grid(
-            row=5, column=1, padx=10, pady=5, sticky="w"
+        self.dienst_dropdown = ttk.Combobox(
+            self.frame,
+            textvariable=self.state.dienst_edit_var,
+            values=self._lookups.values("diensten"),
         )
+        self.dienst_dropdown.grid(row=5, column=1, padx=10, pady=5, sticky="w")
+        attach_autocomplete(self.dienst_dropdown, self._suggest_dienst)
 
         ttk.Label(self.frame, text="Soort bijstand").grid(
             row=6, column=0, padx=10, pady=5, sticky="w"
@@ -139,38 +159,31 @@ class BewerkenTab:
 
     def _update_dropdowns(self) -> None:
         tab_type = self.state.type_edit_var.get()
-        if tab_type == "Mobile":
-            self.subcategorie_dropdown["values"] = [
-                "GSM",
-                "Tablet",
-                "Sim",
-                "SD-kaart",
-                "USB-drive",
-                "Andere",
-            ]
-            self.os_dropdown["values"] = [
-                "Android",
-                "GrapheneOS",
-                "iOS",
-                "Andere",
-            ]
-        elif tab_type == "Computer":
-            self.subcategorie_dropdown["values"] = [
-                "Laptop",
-                "Desktop",
-                "Losse HD",
-                "Andere",
-            ]
-            self.os_dropdown["values"] = [
-                "Windows",
-                "Linux",
-                "MacOS",
-                "Chromebook",
-                "Andere",
-            ]
-        else:
-            self.subcategorie_dropdown["values"] = []
-            self.os_dropdown["values"] = []
+        self.subcategorie_dropdown["values"] = self._lookups.values(
+            "subcategorieen", tab_type
+        )
+        self.os_dropdown["values"] = self._lookups.values(
+            "besturingssystemen", tab_type
+        )
+
+    def refresh_lookups(self) -> None:
+        """Reload the dropdown values after the lookup cache was loaded."""
+        self.dienst_dropdown["values"] = self._lookups.values("diensten")
+        self._update_dropdowns()
+
+    def _suggest_dienst(self, typed: str) -> list[str]:
+        """Most used diensten first, then the other active ones."""
+        diensten = self._lookups.values("diensten")
+        if not typed:
+            return diensten
+        suggestions = self._suggestions.suggest("dienst", typed)
+        suggestions += [
+            dienst
+            for dienst in diensten
+            if dienst.casefold().startswith(typed.casefold())
+            and dienst not in suggestions
+        ]
+        return suggestions
 
     def _toggle_datum_in_behandeling(self) -> None:
         if self.state.datum_in_behandeling_checkbox_var.get():
@@ -181,6 +194,8 @@ class BewerkenTab:
             self.state.datum_in_behandeling_edit_var.set("")
 
     def update_record(self) -> None:
+        if self._checking:
+            return
         if not self._current_record_id:
             messagebox.showwarning("Fout", "Geen record geselecteerd.")
             return
@@ -256,76 +271,44 @@ class BewerkenTab:
             or normalized_sin == "BIJSTAND"
         )
 
-        try:
-            with self._connect_db() as conn:
-                cursor = conn.cursor()
-                medewerkers_for_bijstand: list[str] = []
-                if is_bijstand_record:
-                    cursor.execute(
-                        "SELECT medewerker FROM medewerkers_bijstand WHERE object_id = ?",
-                        (self._current_record_id,),
-                    )
-                    medewerkers_for_bijstand = [row[0] for row in cursor.fetchall()]
-
-                cursor.execute(
-                    """
-                    UPDATE objecten SET
-                        sin = ?,
-                        type = ?,
-                        subcategorie = ?,
-                        merk = ?,
-                        os = ?,
-                        dienst = ?,
-                        soort_bijstand = ?,
-                        lccu_lid = ?,
-                        datum_in_behandeling = ?,
-                        start_bijstand = ?,
-                        einde_bijstand = ?
-                    WHERE id = ?
-                    """,
-                    (
-                        normalized_sin,
-                        self.state.type_edit_var.get(),
-                        self.state.subcategorie_edit_var.get(),
-                        self.state.merk_edit_var.get(),
-                        self.state.os_edit_var.get(),
-                        self.state.dienst_edit_var.get(),
-                        self.state.soort_bijstand_edit_var.get(),
-                        self.state.lccu_lid_edit_var.get(),
-                        datum_in_behandeling_iso,
-                        start_bijstand_iso,
-                        einde_bijstand_iso,
-                        self._current_record_id,
-                    ),
-                )
+        object_id = self._current_record_id
+        fields = {
+            "sin": normalized_sin,
+            "object_type": self.state.type_edit_var.get(),
+            "subcategorie": self.state.subcategorie_edit_var.get(),
+            "merk": self.state.merk_edit_var.get(),
+            "os_value": self.state.os_edit_var.get(),
+            "dienst": self.state.dienst_edit_var.get(),
+            "soort_bijstand": self.state.soort_bijstand_edit_var.get(),
+            "lccu_lid": self.state.lccu_lid_edit_var.get(),
+            "datum_in_behandeling": datum_in_behandeling_iso,
+            "start_bijstand": start_bijstand_iso,
+            "einde_bijstand": einde_bijstand_iso,
+            "is_bijstand": is_bijstand_record,
+        }
+        if not is_bijstand_record:
+            self._write(object_id, fields)
+            return
+
+        self._checking = True
+
+        def on_answer(save: bool) -> None:
+            self._checking = False
+            if save:
+                self._write(object_id, fields)
+
+        confirm_no_overlaps(
+            self._check_worker,
+            self._find_overlapping_assignments,
+            on_answer,
+            object_id=object_id,
+            start_bijstand=start_bijstand_iso,
+            einde_bijstand=einde_bijstand_iso,
+        )
 
-                if is_bijstand_record:
-                    cursor.execute(
-                        "DELETE FROM medewerkers_bijstand WHERE object_id = ?",
-                        (self._current_record_id,),
-                    )
-                    for medewerker_name in medewerkers_for_bijstand:
-                        cursor.execute(
-                            """
-                            INSERT INTO medewerkers_bijstand (
-                                object_id,
-                                medewerker,
-                                start_bijstand,
-                                einde_bijstand
-                            )
-                            VALUES (?, ?, ?, ?)
-                            """,
-                            (
-                                self._current_record_id,
-                                medewerker_name,
-                                start_bijstand_iso,
-                                einde_bijstand_iso,
-                            ),
-                        )
-                    cursor.execute(
-                        "UPDATE objecten SET aantal_medewerkers = ? WHERE id = ?",
-                        (len(medewerkers_for_bijstand), self._current_record_id),
-                    )
+    def _write(self, object_id: str, fields: dict) -> None:
+        try:
+            self._update_object(object_id, **fields)
         except sqlite3.Error as exc:
             print(f"Databasefout bij bijwerken: {exc}")
             messagebox.showerror(
@@ -333,13 +316,15 @@ class BewerkenTab:
             )
             return
 
+        self._suggestions.add("merk", fields["merk"])
+        self._suggestions.add("dienst", fields["dienst"])
         success_message = "Record bijgewerkt!"
-        if is_bijstand_record:
+        if fields["is_bijstand"]:
             success_message += (
                 "\n\nTODO: Aanpassen van de medewerkerslijst is nog niet beschikbaar in dit scherm."
             )
         messagebox.showinfo("Succes", success_message)
-        self._search_callback()
+        self._refresh_row(object_id)
 
     def load_record_for_edit(self, _event) -> None:
         selected = self.result_tree.focus()
@@ -367,15 +352,9 @@ class BewerkenTab:
         if is_bijstand_record:
             soort_bijstand_value = ""
             try:
-                with self._connect_db() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        "SELECT soort_bijstand FROM objecten WHERE id = ?",
-                        (self._current_record_id,),
-                    )
-                    result = cursor.fetchone()
-                if result:
-                    soort_bijstand_value = result[0] or ""
+                soort_bijstand_value = (
+                    self._get_soort_bijstand(self._current_record_id) or ""
+                )
             except sqlite3.Error as exc:
                 print(f"Databasefout bij ophalen bijstand: {exc}")
                 soort_bijstand_value = ""
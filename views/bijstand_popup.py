@@ -1,11 +1,57 @@
 from __future__ import annotations
 
-import sqlite3
+import random
 import tkinter as tk
 from datetime import datetime
 from tkinter import ttk, messagebox
 from typing import Callable, Sequence
 
+from views.autocomplete import attach_autocomplete
+
+SOORTEN_BIJSTAND = ["Camerabeelden", "Huiszoeking", "Wacht", "Andere"]
+
+
+def confirm_no_overlaps(
+    worker,
+    find_overlapping_assignments: Callable[..., list],
+    on_answer: Callable[[bool], None],
+    **assignment,
+) -> None:
+    """Call ``on_answer(save)``; *save* is false if the user cancels for overlaps.
+
+    The assignments are looked up on *worker*, off the Tk thread; a failed
+    lookup does not block saving.
+    """
+
+    def on_error(exc: BaseException) -> None:
+        print(f"Databasefout bij controle op overlappende bijstand: {exc}")
+        on_answer(True)
+
+    def on_success(conflicts: list) -> None:
+        on_answer(_confirm_overlaps(conflicts))
+
+    worker.submit(
+        lambda: find_overlapping_assignments(**assignment),
+        on_success=on_success,
+        on_error=on_error,
+    )
+
+
+def _confirm_overlaps(conflicts: list) -> bool:
+    """Ask before saving medewerkers who are already on another bijstand."""
+    if not conflicts:
+        return True
+    regels = "\n".join(
+        f"- {medewerker}: bijstand {object_id} van {start} tot {einde or 'nu'}"
+        for object_id, medewerker, start, einde in conflicts
+    )
+    return messagebox.askyesno(
+        "Overlappende bijstand",
+        "Deze medewerkers zijn in die periode al ingepland:\n"
+        f"{regels}\n\nToch opslaan?",
+        icon="warning",
+    )
+
 
 class BijstandPopup:
     """Encapsulates the bijstand popup window."""
@@ -15,19 +61,30 @@ class BijstandPopup:
         *,
         state,
         medewerkers: Sequence[str],
-        diensten: Sequence[str],
+        lookups,
+        suggestions,
         parse_dutch_datetime: Callable[[str], datetime],
         datetime_to_iso: Callable[[datetime], str],
         current_timestamp: Callable[[], str],
         insert_bijstand_record: Callable[..., int],
+        find_overlapping_assignments: Callable[..., list],
+        find_saved_objects: Callable[[list[dict]], list[int] | None],
+        save_queue,
+        check_worker,
     ) -> None:
         self.state = state
         self._medewerkers = medewerkers
-        self._diensten = diensten
+        self._lookups = lookups
+        self._suggestions = suggestions
         self._parse_dutch_datetime = parse_dutch_datetime
         self._datetime_to_iso = datetime_to_iso
         self._current_timestamp = current_timestamp
         self._insert_bijstand_record = insert_bijstand_record
+        self._find_overlapping_assignments = find_overlapping_assignments
+        self._find_saved_objects = find_saved_objects
+        self._save_queue = save_queue
+        self._check_worker = check_worker
+        self._checking = False
 
     def open(self) -> None:
         if (
@@ -50,7 +107,7 @@ class BijstandPopup:
         ttk.Combobox(
             self.state.popup_window,
             textvariable=self.state.soort_bijstand_var,
-            values=["Camerabeelden", "Huiszoeking", "Wacht", "Andere"],
+            values=SOORTEN_BIJSTAND,
         ).pack(pady=5)
 
         tk.Label(
@@ -80,6 +137,7 @@ class BijstandPopup:
                     medewerkers_frame, values=self._medewerkers
                 )
                 medewerker_combobox.grid(row=index, column=1, padx=5, pady=2)
+                attach_autocomplete(medewerker_combobox, self._suggest_medewerker)
                 self.state.medewerker_widgets.append(medewerker_combobox)
 
         if self.state._medewerkers_trace_id is not None:
@@ -94,7 +152,7 @@ class BijstandPopup:
         ttk.Combobox(
             self.state.popup_window,
             textvariable=self.state.dienst_var,
-            values=self._diensten,
+            values=self._lookups.values("diensten"),
         ).pack(pady=5)
 
         tk.Label(
@@ -116,12 +174,31 @@ class BijstandPopup:
         ).pack(pady=10)
         self.state.popup_window.protocol("WM_DELETE_WINDOW", self.close)
 
+    def _suggest_medewerker(self, typed: str) -> list[str]:
+        """Most assigned medewerkers first, then the rest of the team."""
+        if not typed:
+            return list(self._medewerkers)
+        suggestions = self._suggestions.suggest("medewerker", typed)
+        suggestions += [
+            naam
+            for naam in self._medewerkers
+            if naam.casefold().startswith(typed.casefold()) and naam not in suggestions
+        ]
+        return suggestions
+
+    def _remember(self, record: dict) -> None:
+        for naam in record["medewerkers"]:
+            self._suggestions.add("medewerker", naam)
+        self._suggestions.add("dienst", record["dienst"])
+
     def close(self) -> None:
         if self.state.popup_window:
             self.state.popup_window.destroy()
             self.state.popup_window = None
 
     def save(self) -> None:
+        if self._checking:
+            return
         soort_bijstand = self.state.soort_bijstand_var.get()
         medewerkers_list = [w.get() for w in self.state.medewerker_widgets]
         start_input = self.state.start_bijstand_var.get()
@@ -157,23 +234,37 @@ class BijstandPopup:
             self._datetime_to_iso(einde_dt) if einde_dt is not None else None
         )
 
-        try:
-            datum_ingave = self._current_timestamp()
-            self._insert_bijstand_record(
-                soort_bijstand=soort_bijstand,
-                dienst=self.state.dienst_var.get(),
-                medewerkers=medewerkers_list,
-                start_bijstand=start_bijstand,
-                einde_bijstand=einde_bijstand,
-                datum_ingave=datum_ingave,
-            )
-        except sqlite3.Error as exc:
-            print(f"Databasefout bij opslaan bijstand: {exc}")
-            messagebox.showerror(
-                "Databasefout",
-                f"Fout bij het opslaan in de database: {exc}",
-            )
+        record = {
+            "soort_bijstand": soort_bijstand,
+            "dienst": self.state.dienst_var.get(),
+            "medewerkers": medewerkers_list,
+            "start_bijstand": start_bijstand,
+            "einde_bijstand": einde_bijstand,
+            "datum_ingave": self._current_timestamp(),
+            "unique_id": random.randint(1000, 9999),
+        }
+        self._checking = True
+        confirm_no_overlaps(
+            self._check_worker,
+            self._find_overlapping_assignments,
+            lambda save: self._submit(record, save),
+            medewerkers=medewerkers_list,
+            start_bijstand=start_bijstand,
+            einde_bijstand=einde_bijstand,
+        )
+
+    def _submit(self, record: dict, save: bool) -> None:
+        self._checking = False
+        if not save:
             return
+        def find_saved() -> int | None:
+            saved = self._find_saved_objects([record])
+            return saved[0] if saved else None
 
-        messagebox.showinfo("Succes", "Bijstand succesvol opgeslagen!")
+        self._save_queue.submit(
+            f"Bijstand {record['soort_bijstand']}".strip(),
+            lambda: self._insert_bijstand_record(**record),
+            on_success=lambda _object_id: self._remember(record),
+            find_saved=find_saved,
+        )
         self.close()
@@ -1,9 +1,29 @@
 from __future__ import annotations
 
-import sqlite3
+import random
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Sequence
+from typing import Callable
+
+from views.autocomplete import attach_autocomplete
+
+# Heading of each column of the batch grid and the record key it shows.
+BATCH_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("SIN", "sin"),
+    ("Type", "object_type"),
+    ("Subcategorie", "subcategorie"),
+    ("Merk", "merk"),
+    ("OS", "os_value"),
+    ("Dienst", "dienst"),
+)
+
+
+def _device(record: dict) -> dict:
+    """Return the fields of *record* that identify the device."""
+    return {
+        key: record[key]
+        for key in ("sin", "object_type", "subcategorie", "merk", "os_value")
+    }
 
 
 class IngaveTab:
@@ -13,18 +33,37 @@ class IngaveTab:
         self,
         *,
         state,
-        diensten: Sequence[str],
+        lookups,
+        suggestions,
         validate_sin: Callable[[str], str],
-        connect_db: Callable[[], sqlite3.Connection],
+        insert_object: Callable[..., int],
+        insert_objects: Callable[[list[dict]], list[int]],
+        find_saved_objects: Callable[[list[dict]], list[int] | None],
+        find_duplicate_objects: Callable[..., list[tuple[int, str | None]]],
+        fingerprint: Callable[..., str | None],
         current_timestamp: Callable[[], str],
         popup,
+        save_queue,
+        check_worker,
     ) -> None:
         self.state = state
-        self._diensten = diensten
+        self._lookups = lookups
+        self._suggestions = suggestions
         self._validate_sin = validate_sin
-        self._connect_db = connect_db
+        self._insert_object = insert_object
+        self._insert_objects = insert_objects
+        self._find_saved_objects = find_saved_objects
+        self._find_duplicate_objects = find_duplicate_objects
+        self._fingerprint = fingerprint
         self._current_timestamp = current_timestamp
         self._popup = popup
+        self._save_queue = save_queue
+        self._check_worker = check_worker
+        self._checking = False
+        # Staged records of the batch, by their item in the batch tree.
+        self._batch: dict[str, dict] = {}
+        # Items whose save is queued; they leave the batch once it succeeds.
+        self._saving: set[str] = set()
 
         self.frame = ttk.Frame(self.state.notebook)
         self.state.notebook.add(self.frame, text="Ingave")
@@ -66,8 +105,10 @@ class IngaveTab:
         tk.Label(self.frame, text="Merk").grid(
             row=3, column=0, padx=10, pady=5, sticky="w"
         )
-        tk.Entry(self.frame, textvariable=self.state.merk_var).grid(
-            row=3, column=1, padx=10, pady=5, sticky="w"
+        merk_combobox = ttk.Combobox(self.frame, textvariable=self.state.merk_var)
+        merk_combobox.grid(row=3, column=1, padx=10, pady=5, sticky="w")
+        attach_autocomplete(
+            merk_combobox, lambda typed: self._suggestions.suggest("merk", typed)
         )
 
         tk.Label(self.frame, text="Besturingssysteem").grid(
@@ -81,12 +122,13 @@ class IngaveTab:
         tk.Label(self.frame, text="Dienst").grid(
             row=5, column=0, padx=10, pady=5, sticky="w"
         )
-        ttk.Combobox(
+        self.dienst_dropdown = ttk.Combobox(
             self.frame,
             textvariable=self.state.dienst_var,
-            values=self._diensten,
+            values=self._lookups.values("diensten"),
             state="readonly",
-        ).grid(row=5, column=1, padx=10, pady=5, sticky="w")
+        )
+        self.dienst_dropdown.grid(row=5, column=1, padx=10, pady=5, sticky="w")
 
         tk.Button(self.frame, text="Opslaan", command=self._save).grid(
             row=6, column=1, pady=10, sticky="w"
@@ -94,6 +136,42 @@ class IngaveTab:
         tk.Button(self.frame, text="Reset", command=self._reset).grid(
             row=6, column=2, pady=10, sticky="w"
         )
+        tk.Button(
+            self.frame, text="Toevoegen aan batch", command=self._stage
+        ).grid(row=6, column=3, padx=10, pady=10, sticky="w")
+
+        batch_frame = ttk.LabelFrame(self.frame, text="Batch")
+        batch_frame.grid(
+            row=7, column=0, columnspan=4, padx=10, pady=5, sticky="nsew"
+        )
+        self.batch_tree = ttk.Treeview(
+            batch_frame,
+            columns=tuple(heading for heading, _key in BATCH_COLUMNS),
+            show="headings",
+            height=8,
+        )
+        for heading, _key in BATCH_COLUMNS:
+            self.batch_tree.heading(heading, text=heading)
+            self.batch_tree.column(heading, width=110)
+        self.batch_tree.tag_configure("opslaan", foreground="grey")
+        self.batch_tree.grid(row=0, column=0, columnspan=3, sticky="nsew")
+        batch_scroll = ttk.Scrollbar(
+            batch_frame, orient="vertical", command=self.batch_tree.yview
+        )
+        batch_scroll.grid(row=0, column=3, sticky="ns")
+        self.batch_tree.config(yscrollcommand=batch_scroll.set)
+        self.batch_label = tk.Label(batch_frame, text="")
+        self.batch_label.grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        tk.Button(
+            batch_frame, text="Verwijder uit batch", command=self._unstage
+        ).grid(row=1, column=1, padx=5, pady=5, sticky="w")
+        tk.Button(
+            batch_frame, text="Batch opslaan", command=self._save_batch
+        ).grid(row=1, column=2, padx=5, pady=5, sticky="w")
+        batch_frame.grid_columnconfigure(0, weight=1)
+        batch_frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_rowconfigure(7, weight=1)
+        self._refresh_batch_label()
 
         self._update_picklists()
 
@@ -106,43 +184,28 @@ class IngaveTab:
 
     def _update_picklists(self) -> None:
         tab_type = self.state.type_var.get()
-        if tab_type == "Mobile":
-            self.subcategorie_dropdown["values"] = [
-                "GSM",
-                "Tablet",
-                "Sim",
-                "SD-kaart",
-                "USB-drive",
-                "Andere",
-            ]
-            self.os_dropdown["values"] = [
-                "Android",
-                "GrapheneOS",
-                "iOS",
-                "Andere",
-            ]
-        elif tab_type == "Computer":
-            self.subcategorie_dropdown["values"] = [
-                "Laptop",
-                "Desktop",
-                "Losse HD",
-                "Andere",
-            ]
-            self.os_dropdown["values"] = [
-                "Windows",
-                "Linux",
-                "MacOS",
-                "Chromebook",
-                "Andere",
-            ]
-        elif tab_type == "Bijstand":
+        if tab_type == "Bijstand":
             self._popup.open()
         else:
-            self.subcategorie_dropdown["values"] = []
-            self.os_dropdown["values"] = []
+            self._set_type_values(tab_type)
         self.state.subcategorie_var.set("")
         self.state.os_var.set("")
 
+    def _set_type_values(self, tab_type: str) -> None:
+        self.subcategorie_dropdown["values"] = self._lookups.values(
+            "subcategorieen", tab_type
+        )
+        self.os_dropdown["values"] = self._lookups.values(
+            "besturingssystemen", tab_type
+        )
+
+    def refresh_lookups(self) -> None:
+        """Reload the dropdown values after the lookup cache was loaded."""
+        self.dienst_dropdown["values"] = self._lookups.values("diensten")
+        tab_type = self.state.type_var.get()
+        if tab_type != "Bijstand":
+            self._set_type_values(tab_type)
+
     def _reset(self) -> None:
         self.state.sin_var.set("")
         self.state.type_var.set("Mobile")
@@ -151,53 +214,192 @@ class IngaveTab:
         self.state.os_var.set("")
         self.state.dienst_var.set("")
 
-    def _save(self) -> None:
+    def _read_record(self) -> dict | None:
+        """Return the validated form as a record, ``None`` if it cannot be saved."""
         sin = self.state.sin_var.get().strip()
         tab_type = self.state.type_var.get()
         if tab_type == "Bijstand":
             messagebox.showinfo(
                 "Informatie", "Gebruik de popup voor bijstandgegevens."
             )
-            return
+            return None
 
         try:
             normalized_sin = self._validate_sin(sin)
         except ValueError as exc:
             messagebox.showerror("Fout", str(exc))
-            return
+            return None
 
-        subcategorie = self.state.subcategorie_var.get()
-        merk = self.state.merk_var.get()
-        os_value = self.state.os_var.get()
-        dienst = self.state.dienst_var.get()
-        datum_ingave = self._current_timestamp()
-        unique_id = None
+        record = {
+            "sin": normalized_sin,
+            "object_type": tab_type,
+            "subcategorie": self.state.subcategorie_var.get(),
+            "merk": self.state.merk_var.get(),
+            "os_value": self.state.os_var.get(),
+            "dienst": self.state.dienst_var.get(),
+            "datum_ingave": self._current_timestamp(),
+            "unique_id": random.randint(1000, 9999),
+        }
+        return record
 
-        try:
-            with self._connect_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO objecten (sin, type, subcategorie, merk, os, dienst, datum_ingave, unique_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        normalized_sin,
-                        tab_type,
-                        subcategorie,
-                        merk,
-                        os_value,
-                        dienst,
-                        datum_ingave,
-                        unique_id,
-                    ),
-                )
-        except sqlite3.Error as exc:
-            print(f"Databasefout bij opslaan: {exc}")
-            messagebox.showerror(
-                "Databasefout", f"Fout bij het opslaan: {exc}"
-            )
+    def _save(self) -> None:
+        record = self._read_record()
+        if record is not None:
+            self._check_duplicates(record, self._submit)
+
+    def _submit(self, record: dict) -> None:
+        description = " ".join(
+            value
+            for value in (record["sin"], record["subcategorie"], record["merk"])
+            if value
+        )
+        def find_saved() -> int | None:
+            saved = self._find_saved_objects([record])
+            return saved[0] if saved else None
+
+        self._save_queue.submit(
+            description,
+            lambda: self._insert_object(**record),
+            on_success=lambda _object_id: self._suggestions.add("merk", record["merk"]),
+            find_saved=find_saved,
+        )
+        self._reset()
+
+    def _stage(self) -> None:
+        """Add the form to the batch and clear the device fields.
+
+        SIN, type and dienst stay filled in, as the devices of one batch
+        usually belong to the same case.
+        """
+        record = self._read_record()
+        if record is not None and self._confirm_not_in_batch(record):
+            self._check_duplicates(record, self._add_to_batch)
+
+    def _add_to_batch(self, record: dict) -> None:
+        item = self.batch_tree.insert(
+            "", "end", values=[record[key] for _heading, key in BATCH_COLUMNS]
+        )
+        self._batch[item] = record
+        self.batch_tree.see(item)
+        self.state.subcategorie_var.set("")
+        self.state.merk_var.set("")
+        self.state.os_var.set("")
+        self._refresh_batch_label()
+
+    def _unstage(self) -> None:
+        for item in self.batch_tree.selection():
+            if item not in self._saving:
+                self.batch_tree.delete(item)
+                del self._batch[item]
+        self._refresh_batch_label()
+
+    def _save_batch(self) -> None:
+        """Save the whole batch in one transaction after one confirmation.
+
+        The devices stay in the batch, greyed out, until the save succeeds.
+        If the failed save is discarded they can be edited and saved again.
+        """
+        items = [
+            item for item in self.batch_tree.get_children() if item not in self._saving
+        ]
+        if not items:
+            messagebox.showinfo("Informatie", "De batch is leeg.")
             return
+        if not messagebox.askyesno(
+            "Batch opslaan", f"{len(items)} toestellen opslaan?"
+        ):
+            return
+        records = [self._batch[item] for item in items]
+        sins = sorted({record["sin"] for record in records})
+        description = f"batch van {len(records)} toestellen ({', '.join(sins)})"
+
+        def on_success(_object_ids: list[int]) -> None:
+            for record in records:
+                self._suggestions.add("merk", record["merk"])
+            self._saving.difference_update(items)
+            self.batch_tree.delete(*items)
+            for item in items:
+                del self._batch[item]
+            self._refresh_batch_label()
 
-        messagebox.showinfo("Succes", "Gegevens succesvol opgeslagen!")
+        def on_discard() -> None:
+            self._saving.difference_update(items)
+            for item in items:
+                self.batch_tree.item(item, tags=())
+            self._refresh_batch_label()
+
+        self._saving.update(items)
+        for item in items:
+            self.batch_tree.item(item, tags=("opslaan",))
+        self._save_queue.submit(
+            description,
+            lambda: self._insert_objects(records),
+            on_success=on_success,
+            find_saved=lambda: self._find_saved_objects(records),
+            on_discard=on_discard,
+        )
+        self._refresh_batch_label()
         self._reset()
+
+    def _refresh_batch_label(self) -> None:
+        text = f"{len(self._batch)} toestellen in de batch"
+        if self._saving:
+            text += f", {len(self._saving)} worden opgeslagen"
+        self.batch_label.config(text=text)
+
+    def _check_duplicates(
+        self, record: dict, on_confirmed: Callable[[dict], None]
+    ) -> None:
+        """Look up *record* off the Tk thread; continue once it is confirmed.
+
+        A failed lookup does not block saving.  Clicks while a lookup runs
+        are ignored.
+        """
+        if self._checking:
+            return
+        self._checking = True
+
+        def on_success(duplicates: list[tuple[int, str | None]]) -> None:
+            self._checking = False
+            if self._confirm_not_duplicate(duplicates):
+                on_confirmed(record)
+
+        def on_error(exc: BaseException) -> None:
+            self._checking = False
+            print(f"Databasefout bij controle op dubbels: {exc}")
+            on_confirmed(record)
+
+        self._check_worker.submit(
+            lambda: self._find_duplicate_objects(**_device(record)),
+            on_success=on_success,
+            on_error=on_error,
+        )
+
+    def _confirm_not_in_batch(self, record: dict) -> bool:
+        key = self._fingerprint(**_device(record))
+        if key is None or not any(
+            self._fingerprint(**_device(staged)) == key
+            for staged in self._batch.values()
+        ):
+            return True
+        return messagebox.askyesno(
+            "Mogelijk dubbel",
+            "Dit toestel staat al in de batch.\n\nToch toevoegen?",
+            icon="warning",
+        )
+
+    def _confirm_not_duplicate(
+        self, duplicates: list[tuple[int, str | None]]
+    ) -> bool:
+        if not duplicates:
+            return True
+        ingaves = "\n".join(
+            f"- record {object_id}, ingegeven op {datum_ingave or 'onbekend'}"
+            for object_id, datum_ingave in duplicates
+        )
+        return messagebox.askyesno(
+            "Mogelijk dubbel",
+            "Dit toestel werd al ingegeven onder hetzelfde SIN:\n"
+            f"{ingaves}\n\nToch opslaan?",
+            icon="warning",
+        )
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable
+
+
+class SaveJob:
+    """A single queued write and, once it failed, the reason why.
+
+    *find_saved* returns the result of an earlier attempt that did store the
+    data, or ``None``: a write can commit and still fail on the way back (a
+    dropped share or service connection), so a retry asks it first.
+    *on_discard* runs when the failed job is dropped instead of retried.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        func: Callable[[], Any],
+        on_success: Callable[[Any], None] | None = None,
+        find_saved: Callable[[], Any] | None = None,
+        on_discard: Callable[[], None] | None = None,
+    ) -> None:
+        self.description = description
+        self.func = func
+        self.on_success = on_success
+        self.find_saved = find_saved
+        self.on_discard = on_discard
+        self.attempts = 0
+        self.error: str | None = None
+
+    def run(self) -> Any:
+        """Write once, on the writer thread."""
+        self.attempts += 1
+        if self.attempts > 1 and self.find_saved is not None:
+            saved = self.find_saved()
+            if saved is not None:
+                return saved
+        return self.func()
+
+
+class SaveQueue:
+    """Runs database writes on a background writer thread.
+
+    The forms validate their input on the Tk thread and hand the write to this
+    queue, so they can be cleared for the next item immediately.  Progress and
+    failures are shown in the status bar; the details window lists pending and
+    failed saves and can retry the failed ones.
+    """
+
+    def __init__(self, *, root: tk.Misc, status_bar, worker) -> None:
+        self._root = root
+        self._status_bar = status_bar
+        self._worker = worker
+        self.pending: list[SaveJob] = []
+        self.failed: list[SaveJob] = []
+        self._details_window: tk.Toplevel | None = None
+        self._details_list: tk.Listbox | None = None
+
+        self.summary_var = tk.StringVar(master=root)
+        ttk.Button(
+            status_bar.frame,
+            textvariable=self.summary_var,
+            command=self.show_details,
+        ).pack(side="right", padx=(5, 0))
+        self._refresh()
+
+    def submit(
+        self,
+        description: str,
+        func: Callable[[], Any],
+        on_success: Callable[[Any], None] | None = None,
+        find_saved: Callable[[], Any] | None = None,
+        on_discard: Callable[[], None] | None = None,
+    ) -> None:
+        self._start(SaveJob(description, func, on_success, find_saved, on_discard))
+
+    def _start(self, job: SaveJob) -> None:
+        job.error = None
+        self.pending.append(job)
+        self._status_bar.set_message(f"Opslaan: {job.description}...")
+        self._worker.submit(
+            job.run,
+            on_success=lambda result: self._on_saved(job, result),
+            on_error=lambda exc: self._on_failed(job, exc),
+        )
+        self._refresh()
+
+    def _on_saved(self, job: SaveJob, result: Any) -> None:
+        self.pending.remove(job)
+        self._status_bar.set_message(f"Opgeslagen: {job.description}")
+        self._refresh()
+        if job.on_success is not None:
+            job.on_success(result)
+
+    def _on_failed(self, job: SaveJob, exc: BaseException) -> None:
+        print(f"Databasefout bij opslaan: {exc}")
+        self.pending.remove(job)
+        job.error = str(exc)
+        self.failed.append(job)
+        self._status_bar.set_message(f"Opslaan mislukt: {job.description}")
+        self._refresh()
+
+    def retry_failed(self) -> None:
+        jobs, self.failed = self.failed, []
+        for job in jobs:
+            self._start(job)
+
+    def discard_failed(self) -> None:
+        jobs, self.failed = self.failed, []
+        self._refresh()
+        for job in jobs:
+            if job.on_discard is not None:
+                job.on_discard()
+
+    def _refresh(self) -> None:
+        self.summary_var.set(
+            f"Wachtrij: {len(self.pending)} | Mislukt: {len(self.failed)}"
+        )
+        if self._details_list is None:
+            return
+        self._details_list.delete(0, "end")
+        for job in self.pending:
+            self._details_list.insert("end", f"Bezig: {job.description}")
+        for job in self.failed:
+            self._details_list.insert(
+                "end", f"Mislukt: {job.description} - {job.error}"
+            )
+            self._details_list.itemconfig("end", foreground="red")
+
+    def show_details(self) -> None:
+        if self._details_window is not None and self._details_window.winfo_exists():
+            self._details_window.lift()
+            return
+
+        self._details_window = tk.Toplevel(self._root)
+        self._details_window.title("Opslaan")
+        self._details_window.geometry("500x250")
+        self._details_list = tk.Listbox(self._details_window)
+        self._details_list.pack(expand=True, fill="both", padx=10, pady=(10, 5))
+
+        buttons = ttk.Frame(self._details_window)
+        buttons.pack(fill="x", padx=10, pady=(0, 10))
+        ttk.Button(
+            buttons, text="Mislukte opnieuw proberen", command=self.retry_failed
+        ).pack(side="left")
+        ttk.Button(
+            buttons, text="Mislukte verwijderen", command=self.discard_failed
+        ).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Sluiten", command=self._close_details).pack(
+            side="right"
+        )
+        self._details_window.protocol("WM_DELETE_WINDOW", self._close_details)
+        self._refresh()
+
+    def _close_details(self) -> None:
+        if self._details_window is not None:
+            self._details_window.destroy()
+        self._details_window = None
+        self._details_list = None
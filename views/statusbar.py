@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+
+class StatusBar:
+    """Non-modal status line at the bottom of the main window."""
+
+    def __init__(self, *, master: tk.Misc) -> None:
+        self.frame = ttk.Frame(master, relief="sunken", padding=(5, 2))
+        self.frame.pack(side="bottom", fill="x")
+
+        self.message_var = tk.StringVar(master=master)
+        self.message_label = ttk.Label(
+            self.frame, textvariable=self.message_var, anchor="w"
+        )
+        self.message_label.pack(side="left", fill="x", expand=True)
+
+        self._retry_command: Callable[[], None] | None = None
+        self.retry_button = ttk.Button(
+            self.frame, text="Opnieuw proberen", command=self._retry
+        )
+
+    def set_message(self, message: str) -> None:
+        self.message_var.set(message)
+
+    def show_retry(self, command: Callable[[], None]) -> None:
+        self._retry_command = command
+        if not self.retry_button.winfo_manager():
+            self.retry_button.pack(side="right")
+
+    def hide_retry(self) -> None:
+        self._retry_command = None
+        self.retry_button.pack_forget()
+
+    def _retry(self) -> None:
+        if self._retry_command is not None:
+            self._retry_command()
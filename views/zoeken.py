@@ -3,7 +3,36 @@ from __future__ import annotations
 import sqlite3
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable
+from typing import Any, Callable
+
+from views.bijstand_popup import SOORTEN_BIJSTAND
+
+# Heading of each result column and the column it sorts on.
+RESULT_HEADINGS: tuple[tuple[str, str], ...] = (
+    ("id", "id"),
+    ("SIN", "sin"),
+    ("Type", "type"),
+    ("Subcategorie", "subcategorie"),
+    ("Merk", "merk"),
+    ("OS", "os"),
+    ("Dienst", "dienst"),
+    ("LCCU Lid", "lccu_lid"),
+    ("Datum in behandeling", "datum_in_behandeling"),
+    ("Start bijstand", "start_bijstand"),
+    ("Einde bijstand", "einde_bijstand"),
+)
+
+# Filter fields: label, column and the lookup table with its values (``None``
+# for a free text field).
+FILTER_FIELDS: tuple[tuple[str, str, str | None], ...] = (
+    ("Type", "type", "types"),
+    ("Subcategorie", "subcategorie", "subcategorieen"),
+    ("Merk", "merk", "merken"),
+    ("OS", "os", "besturingssystemen"),
+    ("Dienst", "dienst", "diensten"),
+    ("LCCU Lid", "lccu_lid", None),
+    ("Soort bijstand", "soort_bijstand", None),
+)
 
 
 class ZoekenTab:
@@ -13,17 +42,29 @@ class ZoekenTab:
         self,
         *,
         state,
-        connect_db: Callable[[], sqlite3.Connection],
+        lookups,
+        search_objects: Callable[..., tuple[list[tuple], Any]],
+        get_result_row: Callable[[str], tuple | None],
         format_date: Callable[[str], str | None],
         format_datetime_for_display: Callable[[str | None], str],
         auto_adjust_column_width: Callable[[ttk.Treeview, tk.Frame, ttk.Scrollbar], None],
     ) -> None:
         self.state = state
-        self._connect_db = connect_db
+        self._lookups = lookups
+        self._search_objects = search_objects
+        self._get_result_row = get_result_row
         self._format_date = format_date
         self._format_datetime_for_display = format_datetime_for_display
         self._auto_adjust_column_width = auto_adjust_column_width
 
+        # Filters of the last search, the sort and the cursor of the next page.
+        self._filters: dict[str, Any] | None = None
+        self._sort = "id"
+        self._descending = False
+        self._cursor: Any = None
+        # Tree items per record id, to refresh an edited record in place.
+        self._items: dict[str, list[str]] = {}
+
         self.frame = ttk.Frame(self.state.notebook)
         self.state.notebook.add(self.frame, text="Zoeken")
 
@@ -61,9 +102,37 @@ class ZoekenTab:
             row=3, column=2, padx=10, pady=5, sticky="w"
         )
 
+        tk.Checkbutton(
+            self.frame,
+            text="Doorzoek archief",
+            variable=self.state.include_archief_var,
+        ).grid(row=4, column=0, padx=10, pady=5, sticky="w")
+
+        filter_frame = ttk.LabelFrame(self.frame, text="Filters")
+        filter_frame.grid(
+            row=0, column=3, rowspan=5, padx=10, pady=5, sticky="nw"
+        )
+        self.filter_widgets: dict[str, ttk.Combobox] = {}
+        for index, (label, column, _table) in enumerate(FILTER_FIELDS):
+            tk.Label(filter_frame, text=label).grid(
+                row=index // 2, column=(index % 2) * 2, padx=5, pady=2, sticky="w"
+            )
+            widget = ttk.Combobox(
+                filter_frame, textvariable=self.state.filter_vars[column], width=15
+            )
+            widget.grid(
+                row=index // 2, column=(index % 2) * 2 + 1, padx=5, pady=2, sticky="w"
+            )
+            self.filter_widgets[column] = widget
+        self.filter_widgets["soort_bijstand"]["values"] = SOORTEN_BIJSTAND
+        self.filter_widgets["type"].bind(
+            "<<ComboboxSelected>>", lambda _event: self.refresh_lookups()
+        )
+        self.refresh_lookups()
+
         self.tree_frame = tk.Frame(self.frame)
         self.tree_frame.grid(
-            row=4, column=0, columnspan=3, padx=10, pady=10, sticky="nsew"
+            row=5, column=0, columnspan=4, padx=10, pady=10, sticky="nsew"
         )
 
         self.tree_scroll_y = ttk.Scrollbar(self.tree_frame, orient="vertical")
@@ -71,19 +140,7 @@ class ZoekenTab:
         self.tree_scroll_x = ttk.Scrollbar(self.tree_frame, orient="horizontal")
         self.tree_scroll_x.grid(row=1, column=0, sticky="ew")
 
-        columns = (
-            "id",
-            "SIN",
-            "Type",
-            "Subcategorie",
-            "Merk",
-            "OS",
-            "Dienst",
-            "LCCU Lid",
-            "Datum in behandeling",
-            "Start bijstand",
-            "Einde bijstand",
-        )
+        columns = tuple(heading for heading, _column in RESULT_HEADINGS)
         self.result_tree = ttk.Treeview(
             self.tree_frame,
             columns=columns,
@@ -95,56 +152,108 @@ class ZoekenTab:
         self.result_tree.grid(row=0, column=0, sticky="nsew")
         self.tree_scroll_y.config(command=self.result_tree.yview)
         self.tree_scroll_x.config(command=self.result_tree.xview)
-        for col in columns:
-            self.result_tree.heading(col, text=col)
+        for heading, column in RESULT_HEADINGS:
+            self.result_tree.heading(
+                heading, command=lambda column=column: self.sort_by(column)
+            )
+        self._update_headings()
+
+        self.result_label = tk.Label(self.frame, text="")
+        self.result_label.grid(row=6, column=0, padx=10, pady=(0, 10), sticky="w")
+        self.more_button = tk.Button(
+            self.frame, text="Meer laden", command=self.load_more, state="disabled"
+        )
+        self.more_button.grid(row=6, column=1, padx=10, pady=(0, 10), sticky="w")
 
-        self.frame.grid_rowconfigure(4, weight=1)
+        self.frame.grid_rowconfigure(5, weight=1)
         self.frame.grid_columnconfigure(0, weight=1)
         self.tree_frame.grid_rowconfigure(0, weight=1)
         self.tree_frame.grid_columnconfigure(0, weight=1)
 
     def zoek_objecten(self) -> None:
-        sin = self.state.sin_zoek_var.get()
         datum_vanaf = self._format_date(self.state.datum_vanaf_var.get())
         datum_tot = self._format_date(self.state.datum_tot_var.get())
+        self._filters = {
+            "sin": self.state.sin_zoek_var.get(),
+            "datum_vanaf": datum_vanaf,
+            "datum_tot": datum_tot,
+            "include_datum_ingave": self.state.include_datum_ingave_var.get(),
+            "include_archief": self.state.include_archief_var.get(),
+            "filters": {
+                column: var.get() for column, var in self.state.filter_vars.items()
+            },
+        }
+        self._load_page(first=True)
 
-        query = """
-            SELECT
-                o.id,
-                o.sin,
-                o.type,
-                o.subcategorie,
-                o.merk,
-                o.os,
-                o.dienst,
-                o.lccu_lid,
-                o.datum_in_behandeling,
-                o.start_bijstand,
-                o.einde_bijstand
-            FROM objecten o
-            WHERE 1=1
+    def refresh_lookups(self) -> None:
+        """Reload the filter values; subcategorie and OS follow the type."""
+        object_type = self.state.filter_vars["type"].get() or None
+        for _label, column, table in FILTER_FIELDS:
+            if table is None:
+                continue
+            scoped = column in ("subcategorie", "os")
+            self.filter_widgets[column]["values"] = [""] + self._lookups.values(
+                table, object_type if scoped else None
+            )
+
+    def sort_by(self, column: str) -> None:
+        """Sort on *column*; a second click on the same column reverses it."""
+        if column == self._sort:
+            self._descending = not self._descending
+        else:
+            self._sort = column
+            self._descending = False
+        self._update_headings()
+        if self._filters is not None:
+            self._load_page(first=True)
+
+    def load_more(self) -> None:
+        if self._filters is not None and self._cursor is not None:
+            self._load_page(first=False)
+
+    def refresh_row(self, object_id: str) -> None:
+        """Show the stored values of record *object_id* in its result rows.
+
+        The rows keep their place, selection and scroll position; a changed
+        sort value takes effect at the next search.  A record that is no
+        longer in the table is refreshed with a new search.
         """
-        params: list[str] = []
-
-        if sin:
-            query += " AND o.sin LIKE ?"
-            params.append(f"%{sin}%")
-
-        if datum_vanaf and datum_tot:
-            date_conditions = []
-            if self.state.include_datum_ingave_var.get():
-                date_conditions.append("date(o.datum_ingave) BETWEEN ? AND ?")
-                params.extend([datum_vanaf, datum_tot])
-            for column in ("datum_in_behandeling", "start_bijstand", "einde_bijstand"):
-                date_conditions.append(f"date(o.{column}) BETWEEN ? AND ?")
-                params.extend([datum_vanaf, datum_tot])
-            query += " AND (" + " OR ".join(date_conditions) + ")"
+        try:
+            row = self._get_result_row(object_id)
+        except sqlite3.Error as exc:
+            print(f"Databasefout bij vernieuwen: {exc}")
+            messagebox.showerror(
+                "Databasefout", f"Fout bij het vernieuwen van de resultaten: {exc}"
+            )
+            return
+        if row is None:
+            if self._filters is not None:
+                self._load_page(first=True)
+            return
+        values = self._display_values(row)
+        for item in self._items.get(str(object_id), []):
+            self.result_tree.item(item, values=values)
+
+    def _display_values(self, row) -> list:
+        row = list(row)
+        for index in (8, 9, 10):
+            row[index] = self._format_datetime_for_display(row[index])
+        return row
+
+    def _update_headings(self) -> None:
+        arrow = " \u25bc" if self._descending else " \u25b2"
+        for heading, column in RESULT_HEADINGS:
+            text = heading + arrow if column == self._sort else heading
+            self.result_tree.heading(heading, text=text)
 
+    def _load_page(self, first: bool) -> None:
         try:
-            with self._connect_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, tuple(params))
-                results = cursor.fetchall()
+            results, cursor = self._search_objects(
+                **self._filters,
+                sort=self._sort,
+                descending=self._descending,
+                after=None if first else self._cursor,
+            )
         except sqlite3.Error as exc:
             print(f"Databasefout bij zoeken: {exc}")
             messagebox.showerror(
@@ -152,14 +261,21 @@ class ZoekenTab:
             )
             return
 
-        for row in self.result_tree.get_children():
-            self.result_tree.delete(row)
+        if first:
+            for row in self.result_tree.get_children():
+                self.result_tree.delete(row)
+            self.result_tree.yview_moveto(0)
+            self._items.clear()
 
         for row in results:
-            row = list(row)
-            for index in (8, 9, 10):
-                row[index] = self._format_datetime_for_display(row[index])
-            self.result_tree.insert("", "end", values=row)
+            item = self.result_tree.insert("", "end", values=self._display_values(row))
+            self._items.setdefault(str(row[0]), []).append(item)
+
+        self._cursor = cursor
+        self.more_button.config(state="normal" if cursor is not None else "disabled")
+        loaded = len(self.result_tree.get_children())
+        more = ", er zijn er meer" if cursor is not None else ""
+        self.result_label.config(text=f"{loaded} resultaten geladen{more}")
 
         self.state.root.after(
             100,
@@ -172,5 +288,13 @@ class ZoekenTab:
         self.state.sin_zoek_var.set("")
         self.state.datum_vanaf_var.set("")
         self.state.datum_tot_var.set("")
+        for var in self.state.filter_vars.values():
+            var.set("")
+        self.refresh_lookups()
         for row in self.result_tree.get_children():
             self.result_tree.delete(row)
+        self._items.clear()
+        self._filters = None
+        self._cursor = None
+        self.more_button.config(state="disabled")
+        self.result_label.config(text="")